@@ -8,17 +8,35 @@ Takes transcript segments + matched papers and outputs distilled claims that are
 - PUNCHY (captures the "wait, really?" moment)
 """
 
+import importlib.util
 import json
 import os
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import asdict, dataclass
 from typing import Optional, Dict, Any, List
 from pathlib import Path
 
+import httpx
+
 try:
     from google import genai  # type: ignore[import]
 except ImportError:
     genai = None
 
+try:
+    from scripts.lib.response_cache import ResponseCache, make_cache_key
+except ImportError:  # imported with scripts/ itself on sys.path
+    from lib.response_cache import ResponseCache, make_cache_key
+
+
+# Keep-alive connections held open to the Gemini API by each distiller
+GEMINI_KEEPALIVE_CONNECTIONS = 32
+
+# Distillations do not go stale; a cached one is reused until the prompt,
+# model or input changes (all of which are part of the key).
+DISTILL_CACHE_TTL_SECONDS = 365 * 24 * 3600
+
 
 # =============================================================================
 # Prompt Template
@@ -92,6 +110,30 @@ Maximum 15 words. Be ruthless."""
 # Distiller Class
 # =============================================================================
 
+class RateLimiter:
+    """Space calls at least 60/rpm seconds apart, shared across threads.
+
+    Pacing requests just under the per-minute quota up front avoids the 429s
+    (and retry back-off) that bursts of concurrent calls would trigger.
+    """
+    
+    def __init__(self, rpm: int):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+    
+    def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.interval
+        # Sleep outside the lock; each caller already owns its slot
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
 @dataclass
 class DistillationInput:
     """Input for claim distillation."""
@@ -118,8 +160,26 @@ class DistillationResult:
 class ClaimDistiller:
     """Generate distilled, scannable summaries of scientific claims."""
     
-    def __init__(self, api_key: Optional[str] = None, model_name: Optional[str] = None):
-        """Initialize the distiller with Gemini API."""
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model_name: Optional[str] = None,
+        rpm: Optional[int] = None,
+        use_cache: bool = True,
+        http_client: Optional[httpx.Client] = None,
+    ):
+        """Initialize the distiller with Gemini API.
+        
+        With use_cache, successful distillations are stored in the shared
+        on-disk response cache and reused for identical inputs on later runs.
+        
+        Requests go through one pooled, keep-alive httpx client (HTTP/2 when
+        h2 is installed) so a run pays for the TLS handshake once; pass
+        http_client to share a client across distillers.
+        
+        Args:
+            rpm: If set, cap Gemini requests per minute across all threads
+        """
         if genai is None:
             raise ImportError("google-genai package required. Install with: pip install google-genai")
         
@@ -128,18 +188,64 @@ class ClaimDistiller:
             raise ValueError("GEMINI_API_KEY environment variable required")
         
         self.model_name = model_name or os.getenv("GEMINI_MODEL", "gemini-3-pro-preview")
-        self.client = genai.Client(api_key=self.api_key)
-        
-    def distill(self, input_data: DistillationInput) -> DistillationResult:
+        if http_client is not None:
+            http_options = genai.types.HttpOptions(httpx_client=http_client)
+        else:
+            http_options = genai.types.HttpOptions(client_args={
+                "http2": importlib.util.find_spec("h2") is not None,
+                "limits": httpx.Limits(max_keepalive_connections=GEMINI_KEEPALIVE_CONNECTIONS),
+            })
+        self.client = genai.Client(api_key=self.api_key, http_options=http_options)
+        self.cache = ResponseCache(ttl_seconds=DISTILL_CACHE_TTL_SECONDS) if use_cache else None
+        self.limiter = RateLimiter(rpm) if rpm else None
+    
+    def _generate_content(self, contents: str, config: Any) -> Any:
+        """Call Gemini, waiting for a rate-limit slot first when rpm is set."""
+        if self.limiter is not None:
+            self.limiter.wait()
+        return self.client.models.generate_content(
+            model=self.model_name,
+            contents=contents,
+            config=config,
+        )
+    
+    def _cache_key(self, input_data: DistillationInput) -> str:
+        return make_cache_key("distill_claim", self.model_name, DISTILL_PROMPT, asdict(input_data))
+    
+    def distill(self, input_data: DistillationInput, refresh: bool = False) -> DistillationResult:
         """
         Distill a scientific claim into a short, punchy summary.
         
         Args:
             input_data: DistillationInput with transcript quote, paper info, etc.
+            refresh: Skip the cache lookup and call Gemini; a successful result
+                still replaces the cached entry
             
         Returns:
             DistillationResult with distilled claim and metadata
         """
+        if self.cache is None:
+            return self._generate(input_data)
+        
+        cache_key = self._cache_key(input_data)
+        cached = None if refresh else self.cache.get(cache_key)
+        if cached:
+            return DistillationResult(
+                distilled_claim=cached["distilled_claim"],
+                word_count=cached["word_count"],
+                success=True,
+            )
+        
+        result = self._generate(input_data)
+        if result.success:
+            self.cache.set(cache_key, {
+                "distilled_claim": result.distilled_claim,
+                "word_count": result.word_count,
+            })
+        return result
+    
+    def _generate(self, input_data: DistillationInput) -> DistillationResult:
+        """Call Gemini for a distillation (no caching)."""
         try:
             # Format the prompt
             prompt = DISTILL_PROMPT.format(
@@ -153,13 +259,12 @@ class ClaimDistiller:
             # Generate distilled claim
             # Note: gemini-3-pro-preview is a thinking model that uses 1000-2500 tokens
             # for internal reasoning before output. Token usage varies by claim complexity.
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-                config=genai.types.GenerateContentConfig(
+            response = self._generate_content(
+                prompt,
+                genai.types.GenerateContentConfig(
                     temperature=0.7,
                     max_output_tokens=3500,  # Very high budget for thinking model
-                )
+                ),
             )
             
             # Extract text from response
@@ -176,13 +281,12 @@ class ClaimDistiller:
             if word_count > 15:
                 # Try once more with stronger emphasis
                 retry_prompt = f"{prompt}\n\nYour previous attempt was {word_count} words. You MUST cut it to 15 words or less. Remove all unnecessary words."
-                response = self.client.models.generate_content(
-                    model=self.model_name,
-                    contents=retry_prompt,
-                    config=genai.types.GenerateContentConfig(
+                response = self._generate_content(
+                    retry_prompt,
+                    genai.types.GenerateContentConfig(
                         temperature=0.5,
                         max_output_tokens=3000,  # High for thinking model
-                    )
+                    ),
                 )
                 if response.text:
                     distilled = response.text.strip().strip('"').strip("'")
@@ -5,22 +5,47 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import contextlib
+import io
 import json
 import logging
 import os
 import re
+import socket
 import sys
 import types
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from textwrap import shorten
-from typing import Iterable, List, Optional, Tuple, Dict, Any, Mapping
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Dict,
+    Any,
+    Mapping,
+)
 
-try:
+if TYPE_CHECKING:  # pragma: no cover - google.genai is imported lazily at runtime
     from google import genai  # type: ignore[import]
-except ImportError:  # pragma: no cover - cleaned up via requirements
-    genai = None
+
+try:
+    import orjson  # type: ignore[import]
+except ImportError:  # pragma: no cover - stdlib json is the fallback codec
+    orjson = None
+
+try:
+    import tiktoken  # type: ignore[import]
+except ImportError:  # pragma: no cover - optional, only used for token estimates
+    tiktoken = None
 
 # The helper script runs in environments that may not have an `.env` file or
 # the `pypdf`/`arxiv` dependencies installed. We register minimal stubs before
@@ -81,14 +106,26 @@ def _setup_dependency_stubs() -> None:
 _setup_dependency_stubs()
 
 from src.bioelectricity_research.server import rag_search  # noqa: E402
+from src.bioelectricity_research.context_card_registry import (  # noqa: E402
+    load_registry_snapshot,
+    registry_journal_path,
+    replay_registry_journal,
+)
+from scripts.lib.response_cache import ResponseCache, make_cache_key  # noqa: E402
 
+LOG_FORMAT = "%(levelname)s: %(message)s"
 logging.basicConfig(
     level=logging.INFO,
-    format="%(levelname)s: %(message)s",
+    format=LOG_FORMAT,
 )
 
 REGISTRY_PATH = REPO_ROOT / "data" / "context_card_registry.json"
-SENTENCE_SPLIT_REGEX = re.compile(r"(?<=[.!?])\s+")
+# Appended segments since the last full rewrite of REGISTRY_PATH are folded
+# back into the snapshot once this many accumulate. Runs do not compact on
+# exit: readers replay the journal (context_card_registry.load_context_card_registry),
+# and a rewrite per short-lived process would cost what the journal saves.
+REGISTRY_COMPACT_EVERY = 200
+SENTENCE_BOUNDARY_REGEX = re.compile(r"[.!?]\s+")
 NUMERIC_PATTERN = re.compile(r"\b\d{1,3}(?:,\d{3})*(?:\.\d+)?\b")
 CLAIM_KEYWORDS = {
     "study",
@@ -116,13 +153,25 @@ CLAIM_KEYWORDS = {
     "support",
     "impact",
 }
+# One alternation scans each sentence once instead of once per keyword.
+CLAIM_KEYWORD_REGEX = re.compile(
+    "|".join(re.escape(keyword) for keyword in sorted(CLAIM_KEYWORDS, key=len, reverse=True))
+)
+# Numbers and keywords never share characters, so a single finditer pass sees
+# every match either pattern would find on its own.
+CLAIM_SCORE_REGEX = re.compile(
+    rf"(?P<num>{NUMERIC_PATTERN.pattern})|(?P<kw>{CLAIM_KEYWORD_REGEX.pattern})"
+)
 MAX_CLAIMS_PER_SEGMENT = 5
+RAG_CONCURRENCY_DEFAULT = 4
 MIN_SENTENCE_LENGTH = 40
 GEMINI_API_KEY_ENV = "GEMINI_API_KEY"
 GEMINI_MODEL_DEFAULT = os.environ.get("GEMINI_MODEL", "gemini-3-pro-preview")
 GEMINI_MAX_OUTPUT_TOKENS = 1024
+GEMINI_CONCURRENCY_ENV = "GEMINI_CONCURRENCY"
+GEMINI_CONCURRENCY_DEFAULT = 8
 _GEMINI_CONFIGURED = False
-GEMINI_PROMPT_TEMPLATE = """You are an expert scientific research analyst reviewing podcast transcripts.
+GEMINI_PROMPT_INSTRUCTIONS = """You are an expert scientific research analyst reviewing podcast transcripts.
 
 CRITICAL: Only extract claims the speaker is making as their OWN BELIEF. Skip claims where the speaker is:
 - Describing someone else's view ("some people say...", "others argue...", "the traditional view is...")
@@ -142,12 +191,32 @@ For each valid claim:
 
 Respond with a JSON array. Each element must have: `claim_text`, `speaker_stance`, `research_query`, `needs_backing_because`, `confidence_score`.
 Optional: `claim_type`, `context_tags`.
+"""
+GEMINI_PROMPT_TEMPLATE = (
+    GEMINI_PROMPT_INSTRUCTIONS
+    + """
+Transcript:
+{segment_text}
+
+User note: {user_note}
+"""
+)
+GEMINI_BATCH_PROMPT_SUFFIX = """
+You will receive several transcript segments, each introduced by its id.
+Apply the instructions above to every segment independently. Instead of a single
+array, respond with one JSON object whose keys are the segment ids and whose
+values are that segment's JSON array of claims (use [] when a segment has none).
 
+{segments}
+"""
+GEMINI_BATCH_SEGMENT_TEMPLATE = """Segment id: {segment_id}
 Transcript:
 {segment_text}
 
 User note: {user_note}
 """
+GEMINI_BATCH_MAX_SIZE = 8
+GEMINI_BATCH_MAX_WAIT_MS = 100
 
 DEFAULT_PROMPT_VERSION = "v2"
 CACHE_DIR = REPO_ROOT / "cache"
@@ -199,22 +268,31 @@ CLAIM_CLEANUP_PATTERNS = [
     # (r"\bIt seems\b", ""),     # KEEP - needed for speaker stance detection
 ]
 
-def clean_claim_text(text: str) -> str:
-    sanitized = text.replace("\n", " ").strip()
-    sanitized = re.sub(r"\s+", " ", sanitized)
-    sanitized = re.sub(r"\.{2,}", ".", sanitized)
-    sanitized = re.sub(
-        r"\b(\w+)(?:,\s*\1)+\b", r"\1", sanitized, flags=re.IGNORECASE
-    )
-    sanitized = re.sub(r"\b(\w+)\s+\1\b", r"\1", sanitized, flags=re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+_REPEATED_DOTS_RE = re.compile(r"\.{2,}")
+_REPEATED_COMMA_WORD_RE = re.compile(r"\b(\w+)(?:,\s*\1)+\b", re.IGNORECASE)
+_REPEATED_WORD_RE = re.compile(r"\b(\w+)\s+\1\b", re.IGNORECASE)
+# Filler prefixes (dropped) and cleanup phrases (rewritten) share one pass; each
+# alternative is a named group so the match can be mapped to its replacement.
+_CLAIM_REWRITES = [(prefix, "") for prefix in CLAIM_FILLER_PREFIXES] + list(
+    CLAIM_CLEANUP_PATTERNS
+)
+_CLAIM_REWRITE_RE = re.compile(
+    "|".join(f"(?P<r{idx}>{pattern})" for idx, (pattern, _) in enumerate(_CLAIM_REWRITES)),
+    re.IGNORECASE,
+)
+
 
-    for prefix in CLAIM_FILLER_PREFIXES:
-        stripped = re.sub(prefix, "", sanitized, flags=re.IGNORECASE).strip()
-        if stripped != sanitized:
-            sanitized = stripped
+def _apply_claim_rewrite(match: re.Match) -> str:
+    return _CLAIM_REWRITES[int(match.lastgroup[1:])][1]
 
-    for pattern, replacement in CLAIM_CLEANUP_PATTERNS:
-        sanitized = re.sub(pattern, replacement, sanitized, flags=re.IGNORECASE)
+
+def clean_claim_text(text: str) -> str:
+    sanitized = _WHITESPACE_RE.sub(" ", text.strip())
+    sanitized = _REPEATED_DOTS_RE.sub(".", sanitized)
+    sanitized = _REPEATED_COMMA_WORD_RE.sub(r"\1", sanitized)
+    sanitized = _REPEATED_WORD_RE.sub(r"\1", sanitized)
+    sanitized = _CLAIM_REWRITE_RE.sub(_apply_claim_rewrite, sanitized)
 
     sanitized = sanitized.strip(" ,.")
     if not sanitized:
@@ -224,18 +302,13 @@ def clean_claim_text(text: str) -> str:
     return sanitized
 
 def _normalize_context_tags(raw: Optional[Mapping[str, Any]]) -> Dict[str, str]:
-    if not raw or not isinstance(raw, Mapping):
+    if not isinstance(raw, Mapping):
         return {}
-    normalized: Dict[str, str] = {}
-    for key, value in raw.items():
-        key_str = str(key).strip()
-        if not key_str:
-            continue
-        value_str = str(value).strip()
-        if not value_str:
-            continue
-        normalized[key_str] = value_str
-    return normalized
+    return {
+        key_str: value_str
+        for key, value in raw.items()
+        if (key_str := str(key).strip()) and (value_str := str(value).strip())
+    }
 
 def _parse_context_tag_argument(arg: str) -> Tuple[str, str]:
     if "=" not in arg:
@@ -302,17 +375,31 @@ def build_rag_query(
     return claim.research_query or generated
 
 
+_BRACE_ESCAPE_TABLE = str.maketrans({"{": "{{", "}": "}}"})
+
+
 def _ensure_braces_escaped(value: str) -> str:
-    return value.replace("{", "{{").replace("}", "}}")
+    return value.translate(_BRACE_ESCAPE_TABLE)
 
 
 _GENAI_CLIENT: Optional[genai.Client] = None
 
 
+@lru_cache(maxsize=1)
+def _load_genai() -> Any:
+    """Import google.genai on first use; heuristic-only runs never pay for it."""
+    try:
+        from google import genai  # type: ignore[import]
+    except ImportError:  # pragma: no cover - cleaned up via requirements
+        return None
+    return genai
+
+
 def _ensure_gemini_client_ready() -> None:
     global _GENAI_CLIENT
     if _GENAI_CLIENT is not None:
         return
+    genai = _load_genai()
     if genai is None:
         raise RuntimeError("google.genai is not installed in this environment.")
     api_key = os.environ.get(GEMINI_API_KEY_ENV)
@@ -333,6 +420,56 @@ def _build_gemini_prompt(
     )
 
 
+_GEMINI_SEMAPHORE: Optional[asyncio.Semaphore] = None
+
+
+def configure_gemini_concurrency(limit: Optional[int] = None) -> None:
+    """Cap in-flight Gemini requests (default: $GEMINI_CONCURRENCY or 8)."""
+    global _GEMINI_SEMAPHORE
+    if limit is None:
+        limit = int(os.environ.get(GEMINI_CONCURRENCY_ENV, GEMINI_CONCURRENCY_DEFAULT))
+    _GEMINI_SEMAPHORE = asyncio.Semaphore(max(1, limit))
+
+
+async def _generate_content(model_name: str, contents: str) -> Any:
+    return await _GENAI_CLIENT.aio.models.generate_content(
+        model=model_name,
+        contents=contents,
+    )
+
+
+async def _stream_response(model_name: str, contents: str) -> Tuple[str, Any]:
+    """Stream a reply to the end.
+
+    Returns the joined text and the last chunk, which carries the usage
+    metadata for the whole reply.
+    """
+    stream = await _GENAI_CLIENT.aio.models.generate_content_stream(
+        model=model_name,
+        contents=contents,
+    )
+    parts: List[str] = []
+    last_chunk: Any = None
+    async for chunk in stream:
+        last_chunk = chunk
+        text = getattr(chunk, "text", None)
+        if text:
+            parts.append(text)
+    return "".join(parts), last_chunk
+
+
+async def _generate_gemini(
+    model_name: str,
+    prompt: str,
+    send: Callable[[str, str], Awaitable[Any]] = _generate_content,
+) -> Any:
+    """Send a prompt while holding a slot of the Gemini concurrency cap."""
+    if _GEMINI_SEMAPHORE is None:
+        configure_gemini_concurrency()
+    async with _GEMINI_SEMAPHORE:
+        return await send(model_name, prompt)
+
+
 TOKEN_FIELDS = (
     "token_count",
     "total_tokens",
@@ -371,6 +508,25 @@ def _extract_token_value(source: Any) -> Optional[int]:
     return None
 
 
+@lru_cache(maxsize=1)
+def _token_encoding() -> Any:
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        logging.warning("tiktoken encoding unavailable; skipping local token estimates.")
+        return None
+
+
+def _estimate_token_count(text: str) -> Optional[int]:
+    """Approximate prompt size locally so runs can be calibrated without an API call."""
+    encoding = _token_encoding()
+    if encoding is None:
+        return None
+    return len(encoding.encode(text, disallowed_special=()))
+
+
 def _extract_gemini_metadata(response: Any) -> Dict[str, Any]:
     token_count = _extract_token_value(response)
     if token_count is None:
@@ -396,15 +552,21 @@ def _extract_response_text(response: object) -> str:
     return "\n".join(fragments).strip()
 
 
+_JSON_DECODER = json.JSONDecoder()
+# An object must open with a key or close immediately, so prose braces such as
+# "{see below}" are skipped without a failed (and costly) decode attempt.
+_JSON_START_RE = re.compile(r'\{(?=[ \t\n\r]*["}])|\[')
+
+
 def _extract_json_payload(raw: str) -> str:
-    decoder = json.JSONDecoder()
     stripped = raw.strip()
-    for idx, char in enumerate(stripped):
-        if char not in "{[":
-            continue
+    # Jump between candidate openers and decode in place rather than slicing
+    # the tail of the response at every brace.
+    for match in _JSON_START_RE.finditer(stripped):
+        idx = match.start()
         try:
-            _, end = decoder.raw_decode(stripped[idx:])
-            return stripped[idx : idx + end]
+            _, end = _JSON_DECODER.raw_decode(stripped, idx)
+            return stripped[idx:end]
         except json.JSONDecodeError:
             continue
     raise ValueError("Gemini response did not contain JSON that can be decoded.")
@@ -455,7 +617,12 @@ def _parse_gemini_claims(
     raw_text: str, max_claims: int
 ) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
     payload = _extract_json_payload(raw_text)
-    data = json.loads(payload)
+    return _normalize_gemini_claims(json.loads(payload), max_claims)
+
+
+def _normalize_gemini_claims(
+    data: Any, max_claims: int
+) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
     context_tags: Dict[str, str] = {}
     if isinstance(data, dict):
         context_tags = _normalize_context_tags(data.get("context_tags"))
@@ -472,20 +639,81 @@ def _parse_gemini_claims(
     return normalized, context_tags
 
 
-def _call_gemini_claim_detector(
+_RESPONSE_CACHE: Optional[ResponseCache] = ResponseCache()
+
+
+def configure_response_cache(enabled: bool) -> None:
+    """Enable or bypass the on-disk Gemini response cache."""
+    global _RESPONSE_CACHE
+    if enabled:
+        if _RESPONSE_CACHE is None:
+            _RESPONSE_CACHE = ResponseCache()
+    else:
+        _RESPONSE_CACHE = None
+
+
+def _gemini_cache_key(
+    segment_text: str, user_note: Optional[str], max_claims: int, model_name: str
+) -> str:
+    return make_cache_key(
+        "gemini_claims",
+        model_name,
+        max_claims,
+        GEMINI_PROMPT_TEMPLATE,
+        segment_text.strip(),
+        user_note or "",
+    )
+
+
+# Request key -> task computing it, so concurrent identical requests (e.g. the
+# same RAG query from several segments) share one call.
+_INFLIGHT_REQUESTS: Dict[str, asyncio.Future] = {}
+
+
+async def _dedupe_inflight(key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+    task = _INFLIGHT_REQUESTS.get(key)
+    if task is None:
+        task = _INFLIGHT_REQUESTS[key] = asyncio.ensure_future(compute())
+        task.add_done_callback(lambda _: _INFLIGHT_REQUESTS.pop(key, None))
+    # A cancelled caller must not cancel the shared request for the others.
+    return await asyncio.shield(task)
+
+
+async def _call_gemini_claim_detector(
     segment_text: str, user_note: Optional[str], max_claims: int, model_name: str
 ) -> Tuple[List[Dict[str, Any]], Dict[str, str], Dict[str, Any]]:
+    cache_key = _gemini_cache_key(segment_text, user_note, max_claims, model_name)
+    return await _dedupe_inflight(
+        cache_key,
+        lambda: _fetch_gemini_claims(cache_key, segment_text, user_note, max_claims, model_name),
+    )
+
+
+async def _fetch_gemini_claims(
+    cache_key: str,
+    segment_text: str,
+    user_note: Optional[str],
+    max_claims: int,
+    model_name: str,
+) -> Tuple[List[Dict[str, Any]], Dict[str, str], Dict[str, Any]]:
+    cache = _RESPONSE_CACHE
+    if cache is not None:
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            logging.info("Using cached Gemini claims for this segment.")
+            claims, context_tags, metadata = cached
+            return claims, context_tags, metadata
+
     _ensure_gemini_client_ready()
     prompt = _build_gemini_prompt(segment_text, user_note, max_claims)
-    response = _GENAI_CLIENT.models.generate_content(
-        model=model_name,
-        contents=prompt,
-    )
-    metadata = _extract_gemini_metadata(response)
-    text = _extract_response_text(response)
+    text, last_chunk = await _generate_gemini(model_name, prompt, send=_stream_response)
+    metadata = _extract_gemini_metadata(last_chunk)
+    metadata["estimated_token_count"] = _estimate_token_count(prompt)
     if not text:
         raise ValueError("Empty response from Gemini.")
     claims, context_tags = _parse_gemini_claims(text, max_claims)
+    if cache is not None:
+        await cache.aset(cache_key, [claims, context_tags, metadata])
     return claims, context_tags, metadata
 
 
@@ -498,62 +726,251 @@ async def identify_claims_with_gemini(
     """
     Returns tuple containing the claims list, any inferred context tags, and metadata.
     """
-    return await asyncio.to_thread(
-        _call_gemini_claim_detector,
-        segment_text,
-        user_note,
-        max_claims,
-        model_name,
+    return await _call_gemini_claim_detector(segment_text, user_note, max_claims, model_name)
+
+
+def _build_gemini_batch_prompt(segments: List[Dict[str, Any]], segment_ids: List[str]) -> str:
+    rendered = [
+        GEMINI_BATCH_SEGMENT_TEMPLATE.format(
+            segment_id=segment_id,
+            segment_text=segment["text"].strip(),
+            user_note=(segment.get("note") or "").strip() or "None",
+        )
+        for segment_id, segment in zip(segment_ids, segments)
+    ]
+    return GEMINI_PROMPT_INSTRUCTIONS + GEMINI_BATCH_PROMPT_SUFFIX.format(
+        segments="\n".join(rendered)
     )
 
 
-def split_sentences(text: str) -> List[str]:
-    return [
-        sentence.replace("\n", " ").strip()
-        for sentence in SENTENCE_SPLIT_REGEX.split(text.strip())
-        if sentence.strip()
+async def _call_gemini_claim_detector_batch(
+    segments: List[Dict[str, Any]], max_claims: int, model_name: str
+) -> List[Tuple[List[Dict[str, Any]], Dict[str, str], Dict[str, Any]]]:
+    cache = _RESPONSE_CACHE
+    results: List[Optional[Tuple[List[Dict[str, Any]], Dict[str, str], Dict[str, Any]]]] = [
+        None
+    ] * len(segments)
+    cache_keys = [
+        _gemini_cache_key(segment["text"], segment.get("note"), max_claims, model_name)
+        for segment in segments
     ]
+    cached_values = (
+        await cache.aget_many(cache_keys) if cache is not None else [None] * len(cache_keys)
+    )
+    pending: List[int] = []
+    for idx, cached in enumerate(cached_values):
+        if cached is not None:
+            claims, context_tags, metadata = cached
+            results[idx] = (claims, context_tags, metadata)
+        else:
+            pending.append(idx)
+
+    if len(pending) == 1:
+        idx = pending[0]
+        results[idx] = await _call_gemini_claim_detector(
+            segments[idx]["text"], segments[idx].get("note"), max_claims, model_name
+        )
+    elif pending:
+        _ensure_gemini_client_ready()
+        segment_ids = [f"segment_{position}" for position in range(len(pending))]
+        prompt = _build_gemini_batch_prompt([segments[idx] for idx in pending], segment_ids)
+        response = await _generate_gemini(model_name, prompt)
+        metadata = _extract_gemini_metadata(response)
+        metadata["estimated_token_count"] = _estimate_token_count(prompt)
+        metadata["batch_size"] = len(pending)
+        data: Any = None
+        text = _extract_response_text(response)
+        try:
+            if not text:
+                raise ValueError("Empty response from Gemini.")
+            data = json.loads(_extract_json_payload(text))
+            if not isinstance(data, dict):
+                raise ValueError("Gemini batch response is not an object keyed by segment id.")
+        except ValueError as exc:
+            logging.warning("Unusable Gemini batch response (%s); retrying segments one by one.", exc)
+            data = {}
+        retry: List[int] = []
+        to_cache: List[Tuple[str, Any]] = []
+        for segment_id, idx in zip(segment_ids, pending):
+            entry = data.get(segment_id)
+            if entry is None:
+                logging.warning("Gemini batch response omitted %s.", segment_id)
+                retry.append(idx)
+                continue
+            try:
+                claims, context_tags = _normalize_gemini_claims(entry, max_claims)
+            except ValueError as exc:
+                logging.warning("Malformed Gemini batch entry %s (%s).", segment_id, exc)
+                retry.append(idx)
+                continue
+            results[idx] = (claims, context_tags, dict(metadata))
+            to_cache.append((cache_keys[idx], [claims, context_tags, dict(metadata)]))
+        if cache is not None:
+            await cache.aset_many(to_cache)
+        # Only the segments whose entries could not be used are sent again,
+        # each on its own; a failure there is confined to that segment.
+        retried = await asyncio.gather(
+            *(
+                _call_gemini_claim_detector(
+                    segments[idx]["text"], segments[idx].get("note"), max_claims, model_name
+                )
+                for idx in retry
+            ),
+            return_exceptions=True,
+        )
+        for idx, result in zip(retry, retried):
+            results[idx] = result
+
+    return [result for result in results if result is not None]
+
+
+async def identify_claims_with_gemini_batch(
+    segments: List[Dict[str, Any]],
+    max_claims: int = 5,
+    model_name: str = GEMINI_MODEL_DEFAULT,
+) -> List[Tuple[List[Dict[str, Any]], Dict[str, str], Dict[str, Any]]]:
+    """
+    Detect claims for several ``{"text", "note"}`` segments with one Gemini call.
+
+    Returns one ``(claims, context_tags, metadata)`` tuple per input segment.
+    Segments whose batch entry is missing or malformed are retried on their
+    own; if that retry fails too, the exception takes the tuple's place.
+    """
+    return await _call_gemini_claim_detector_batch(segments, max_claims, model_name)
+
+
+class BatchQueue:
+    """Coalesce concurrent submissions into batched handler calls.
+
+    A batch is dispatched when ``max_batch_size`` items are waiting or
+    ``max_wait_ms`` has elapsed since the first item arrived, whichever
+    comes first. A handler result that is an exception is raised to that
+    item's submitter only.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = GEMINI_BATCH_MAX_SIZE,
+        max_wait_ms: int = GEMINI_BATCH_MAX_WAIT_MS,
+    ):
+        self._handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        try:
+            results = await self._handler([item for item, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+def split_sentences(text: str) -> List[str]:
+    # Boundaries consume the whitespace after the punctuation, so each slice is
+    # already trimmed and no empty fragments are produced.
+    text = text.strip().replace("\n", " ")
+    if not text:
+        return []
+    sentences: List[str] = []
+    start = 0
+    for boundary in SENTENCE_BOUNDARY_REGEX.finditer(text):
+        sentences.append(text[start : boundary.start() + 1])
+        start = boundary.end()
+    sentences.append(text[start:])
+    return sentences
 
 
 def _build_note_terms(note: Optional[str]) -> set[str]:
     if not note:
         return set()
-    return {token for token in re.split(r"\s+", note.lower()) if token}
+    return set(note.lower().split())
+
+
+def _score_sentence(
+    lower: str, tokens: List[str], note_regex: Optional[re.Pattern]
+) -> int:
+    has_number = has_keyword = False
+    for match in CLAIM_SCORE_REGEX.finditer(lower):
+        if match.lastgroup == "num":
+            has_number = True
+        else:
+            has_keyword = True
+        if has_number and has_keyword:
+            break
+
+    score = 2 * has_number + has_keyword
+    if "is" in tokens[:2] or lower.startswith(("we ", "i ", "this ")):
+        score += 1
+    if note_regex is not None and note_regex.search(lower):
+        score += 1
+    return score
 
 
 def detect_claims(
     segment_text: str, user_note: Optional[str], assume_all_claims: bool = False
 ) -> List[ClaimCandidate]:
     note_terms = _build_note_terms(user_note)
-    seen: set[str] = set()
+    note_regex = (
+        re.compile(
+            "|".join(re.escape(term) for term in sorted(note_terms, key=len, reverse=True))
+        )
+        if note_terms
+        else None
+    )
+    # 64-bit fingerprints are plenty to dedupe one transcript's sentences and
+    # avoid keeping every sentence string alive in the set.
+    seen: set[int] = set()
     candidates: List[ClaimCandidate] = []
 
     for sentence in split_sentences(segment_text):
-        if sentence in seen or len(sentence) < MIN_SENTENCE_LENGTH:
+        if len(sentence) < MIN_SENTENCE_LENGTH:
             continue
-        seen.add(sentence)
+        fingerprint = hash(sentence)
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
         lower = sentence.lower()
-        score = 0
-
-        if NUMERIC_PATTERN.search(lower):
-            score += 2
-
-        if any(keyword in lower for keyword in CLAIM_KEYWORDS):
-            score += 1
-
-        if "is" in lower.split()[:2] or lower.startswith(("we ", "i ", "this ")):
-            score += 1
-
-        if note_terms and any(term in lower for term in note_terms):
-            score += 1
-
-        consider_claim = assume_all_claims or score >= 2
+        tokens = lower.split()
+        consider_claim = assume_all_claims or _score_sentence(lower, tokens, note_regex) >= 2
         if consider_claim:
             cleaned_text = clean_claim_text(sentence)
             candidates.append(
                 ClaimCandidate(
                     text=cleaned_text,
-                    note_matched=bool(note_terms & set(re.split(r"\s+", lower))),
+                    note_matched=not note_terms.isdisjoint(tokens),
                     research_query=cleaned_text,
                     claim_type=None,
                     context_tags=None,
@@ -564,15 +981,7 @@ def detect_claims(
     return candidates[:MAX_CLAIMS_PER_SEGMENT]
 
 
-def _default_registry() -> Dict[str, Any]:
-    return {
-        "podcast_id": "",
-        "episode_title": "",
-        "processed_date": "",
-        "segments": {},
-    }
-
-
+@lru_cache(maxsize=4096)
 def _sanitize_timestamp(value: Optional[str]) -> str:
     if not value:
         return "unknown_timestamp"
@@ -585,6 +994,7 @@ def _sanitize_timestamp(value: Optional[str]) -> str:
     return cleaned
 
 
+@lru_cache(maxsize=4096)
 def _sanitize_window_id(value: Optional[str]) -> str:
     if not value:
         return "unknown_window"
@@ -600,6 +1010,16 @@ def _sanitize_window_id(value: Optional[str]) -> str:
 
 
 def _first_nonempty_str(*values: Optional[str], default: str = "") -> str:
+    # Non-string values (e.g. nested metadata objects) are never selected, so
+    # drop them before hitting the cache to keep the key hashable.
+    return _first_nonempty_str_cached(
+        tuple(value if isinstance(value, str) else None for value in values),
+        default,
+    )
+
+
+@lru_cache(maxsize=4096)
+def _first_nonempty_str_cached(values: Tuple[Optional[str], ...], default: str) -> str:
     for value in values:
         if isinstance(value, str):
             normalized = value.strip()
@@ -608,37 +1028,69 @@ def _first_nonempty_str(*values: Optional[str], default: str = "") -> str:
     return default
 
 
-def load_registry(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        return _default_registry()
-    try:
-        raw = json.loads(path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        logging.warning("Registry file corrupted. Recreating a clean one.")
-        return _default_registry()
+def _dumps_json(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
 
-    if not isinstance(raw, dict):
-        logging.warning("Registry data invalid; resetting to empty registry.")
-        return _default_registry()
 
-    normalized = _default_registry()
-    for key in ("podcast_id", "episode_title", "processed_date"):
-        value = raw.get(key)
-        if isinstance(value, str):
-            normalized[key] = value
+def _dumps_json_line(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data) + b"\n"
+    return json.dumps(data, ensure_ascii=False).encode("utf-8") + b"\n"
 
-    segments = raw.get("segments")
-    if isinstance(segments, dict):
-        normalized["segments"] = segments
-    else:
-        normalized["segments"] = {}
 
-    return normalized
+def _loads_json(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
-def save_registry(path: Path, data: Dict[str, dict]) -> None:
+def _write_json_atomic(path: Path, data: Any) -> None:
+    """Write via a temp file + rename so an interrupted run never truncates ``path``."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(_dumps_json(data))
+    os.replace(tmp_path, path)
+
+
+# Registry path -> number of journal lines not yet folded into the snapshot.
+_REGISTRY_JOURNAL_ENTRIES: Dict[Path, int] = {}
+
+
+def load_registry(path: Path) -> Dict[str, Any]:
+    registry = load_registry_snapshot(path)
+    _REGISTRY_JOURNAL_ENTRIES[path] = replay_registry_journal(path, registry)
+    return registry
+
+
+def save_registry(path: Path, data: Dict[str, dict]) -> None:
+    """Rewrite the full snapshot and drop the journal it now contains."""
+    _write_json_atomic(path, data)
+    registry_journal_path(path).unlink(missing_ok=True)
+    _REGISTRY_JOURNAL_ENTRIES[path] = 0
+
+
+def append_registry_segment(
+    path: Path, registry: Dict[str, Any], segment_key: str, segment_entry: Dict[str, Any]
+) -> None:
+    """Record one segment in O(segment) bytes, compacting every few hundred."""
+    pending = _REGISTRY_JOURNAL_ENTRIES.get(path, 0) + 1
+    if pending >= REGISTRY_COMPACT_EVERY:
+        save_registry(path, registry)
+        return
+    entry = {
+        "podcast_id": registry["podcast_id"],
+        "episode_title": registry["episode_title"],
+        "processed_date": registry["processed_date"],
+        "segment_key": segment_key,
+        "segment": segment_entry,
+    }
+    journal_path = registry_journal_path(path)
+    journal_path.parent.mkdir(parents=True, exist_ok=True)
+    with journal_path.open("ab") as handle:
+        handle.write(_dumps_json_line(entry))
+    _REGISTRY_JOURNAL_ENTRIES[path] = pending
 
 
 def _podcast_cache_path(podcast_id: str) -> Path:
@@ -650,14 +1102,13 @@ def _load_cache(path: Path) -> Dict[str, Any]:
     if not path.exists():
         return {}
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
+        return _loads_json(path.read_bytes())
+    except ValueError:
         return {}
 
 
 def _write_cache(path: Path, data: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    _write_json_atomic(path, data)
 
 
 def _update_podcast_cache(
@@ -711,11 +1162,33 @@ def parse_rag_output(raw: str) -> Tuple[Optional[List[dict]], Optional[str]]:
     return parsed.get("results", []), None
 
 
+_RAG_SEMAPHORE: Optional[asyncio.Semaphore] = None
+
+
+def configure_rag_concurrency(limit: int) -> None:
+    """Cap concurrent rag_search calls across every segment in the run."""
+    global _RAG_SEMAPHORE
+    _RAG_SEMAPHORE = asyncio.Semaphore(limit)
+
+
 async def query_rag_for_claim(query_text: str) -> Tuple[Optional[List[dict]], Optional[str]]:
+    n_results = 3
+    # Hits are shared between concurrent identical queries but never stored:
+    # the vector store can be re-indexed under us, and --redo must see that.
+    request_key = make_cache_key("rag_search", " ".join(query_text.split()), n_results)
+    return await _dedupe_inflight(request_key, lambda: _fetch_rag_hits(query_text, n_results))
+
+
+async def _fetch_rag_hits(
+    query_text: str, n_results: int
+) -> Tuple[Optional[List[dict]], Optional[str]]:
+    if _RAG_SEMAPHORE is None:
+        configure_rag_concurrency(RAG_CONCURRENCY_DEFAULT)
     rag_fn = getattr(rag_search, "fn", rag_search)
     try:
         logging.info("RAG search query: %s", query_text)
-        raw = await rag_fn(query_text, n_results=3, response_format="json")
+        async with _RAG_SEMAPHORE:
+            raw = await rag_fn(query_text, n_results=n_results, response_format="json")
     except Exception as exc:
         return None, f"rag_search raised an exception: {exc}"
 
@@ -737,7 +1210,8 @@ def build_context_card(
 ) -> ContextCard:
     paper_title = result.get("paper_title") or "Untitled paper"
     section = result.get("section") or result.get("section_heading") or "Unknown section"
-    snippet = shorten(result.get("text", "").replace("\n", " "), width=220, placeholder="…")
+    # shorten() already collapses newlines and other whitespace runs.
+    snippet = shorten(result.get("text", ""), width=220, placeholder="…")
     rationale = f"Matches the paper section by quoting: {snippet or 'No snippet available.'}"
     source_link = format_source_link(result.get("paper_id"))
 
@@ -773,6 +1247,91 @@ def _serialize_context_card(card: ContextCard) -> dict:
     }
 
 
+@dataclass
+class ClaimEnrichment:
+    """Outcome of backing a single claim with RAG hits."""
+
+    claim: ClaimCandidate
+    query: str
+    card: Optional[ContextCard] = None
+    miss_reason: Optional[str] = None
+
+
+async def iter_enriched_claims(
+    timestamp: str,
+    heading: str,
+    claims: Iterable[ClaimCandidate],
+    context_tags: Optional[Dict[str, str]] = None,
+) -> AsyncIterator[ClaimEnrichment]:
+    """Yield one enrichment per claim, in claim order, as soon as it is ready.
+
+    Every distinct RAG query is started up front so lookups overlap; claims
+    that generate the same query share one lookup, and the shared semaphore
+    in :func:`query_rag_for_claim` bounds how many hit the store.
+    """
+    pairs = [(claim, build_rag_query(claim, context_tags)) for claim in claims]
+    tasks: Dict[str, asyncio.Future] = {}
+    for _, query in pairs:
+        if query not in tasks:
+            tasks[query] = asyncio.ensure_future(query_rag_for_claim(query))
+    try:
+        for claim, generated_query in pairs:
+            hits, error = await tasks[generated_query]
+            _print_claim_lookup(claim, generated_query, context_tags)
+            yield _claim_enrichment(
+                timestamp, heading, claim, generated_query, hits, error, context_tags
+            )
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+
+def _print_claim_lookup(
+    claim: ClaimCandidate, generated_query: str, context_tags: Optional[Dict[str, str]]
+) -> None:
+    raw_query = claim.research_query or ""
+    print("\n" + "=" * 60)
+    print(f"CLAIM: {claim.text[:80]}...")
+    print(f"TAGS: {claim.context_tags or context_tags}")
+    if raw_query:
+        print(f"RAW GEMINI QUERY: '{raw_query}'")
+    print(f"GENERATED QUERY: '{generated_query}'")
+    print("=" * 60)
+
+
+def _claim_enrichment(
+    timestamp: str,
+    heading: str,
+    claim: ClaimCandidate,
+    generated_query: str,
+    hits: Optional[List[dict]],
+    error: Optional[str],
+    context_tags: Optional[Dict[str, str]],
+) -> ClaimEnrichment:
+    if hits:
+        first = hits[0]
+        print(f"✅ Retrieved: {first.get('paper_title')}")
+        snippet = first.get("text", "")
+        print(f"   Snippet: {snippet[:100]}...")
+        return ClaimEnrichment(
+            claim=claim,
+            query=generated_query,
+            card=build_context_card(
+                timestamp,
+                heading,
+                claim,
+                first,
+                context_tags=context_tags,
+            ),
+        )
+    print("❌ No results")
+    return ClaimEnrichment(
+        claim=claim,
+        query=generated_query,
+        miss_reason=error or "No matching literature found.",
+    )
+
+
 async def enrich_claims(
     timestamp: str,
     heading: str,
@@ -781,42 +1340,13 @@ async def enrich_claims(
 ) -> Tuple[List[ContextCard], List[Tuple[str, str]], List[str]]:
     cards: List[ContextCard] = []
     misses: List[Tuple[str, str]] = []
-
     queries: List[str] = []
-    for claim in claims:
-        raw_query = claim.research_query or ""
-        generated_query = build_rag_query(claim, context_tags)
-        queries.append(generated_query)
-        print("\n" + "=" * 60)
-        print(f"CLAIM: {claim.text[:80]}...")
-        print(f"TAGS: {claim.context_tags or context_tags}")
-        if raw_query:
-            print(f"RAW GEMINI QUERY: '{raw_query}'")
-        print(f"GENERATED QUERY: '{generated_query}'")
-        print("=" * 60)
-
-        hits, error = await query_rag_for_claim(generated_query)
-
-        if hits:
-            first = hits[0]
-            print(f"✅ Retrieved: {first.get('paper_title')}")
-            snippet = first.get("text", "")
-            print(f"   Snippet: {snippet[:100]}...")
-        else:
-            print("❌ No results")
-        if hits:
-            cards.append(
-                build_context_card(
-                    timestamp,
-                    heading,
-                    claim,
-                    hits[0],
-                    context_tags=context_tags,
-                )
-            )
+    async for result in iter_enriched_claims(timestamp, heading, claims, context_tags):
+        queries.append(result.query)
+        if result.card is not None:
+            cards.append(result.card)
         else:
-            misses.append((claim.text, error or "No matching literature found."))
-
+            misses.append((result.claim.text, result.miss_reason or ""))
     return cards, misses, queries
 
 
@@ -866,178 +1396,150 @@ def print_misses(misses: List[Tuple[str, str]]) -> None:
         print(f"  {reason}")
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(
-        description="Turn transcript claims into MCP context cards."
+@dataclass
+class SegmentJob:
+    """One transcript window with its registry identity resolved from args/payload.
+
+    ``podcast_id`` and ``episode_title`` stay empty when neither the CLI nor the
+    payload provides them; those fall back to the registry header at run time.
+    """
+
+    segment: Dict[str, Any]
+    note: str
+    context_tags: Dict[str, str]
+    podcast_id: str
+    episode_title: str
+    timestamp: str
+    window_id: str
+    speaker: str
+
+    def segment_key(self, fallback_podcast_id: str = "") -> str:
+        return build_segment_key(
+            self.podcast_id or fallback_podcast_id or "unknown_podcast",
+            self.timestamp,
+            self.window_id,
+        )
+
+
+def _load_segment_payloads(path: Path) -> List[Dict[str, Any]]:
+    """Read `--segment-json`; a JSON array turns the run into batch mode."""
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(raw, list):
+        return [entry for entry in raw if isinstance(entry, dict)]
+    if isinstance(raw, dict):
+        return [raw]
+    raise ValueError("Segment JSON must contain an object or an array of objects.")
+
+
+def _build_segment_job(
+    payload: Optional[Dict[str, Any]],
+    args: argparse.Namespace,
+    cli_context_tags: Dict[str, str],
+) -> SegmentJob:
+    context_tags: Dict[str, str] = {}
+    payload_metadata: Dict[str, Any] = {}
+    if payload is None:
+        payload = {}
+        segment = {"timestamp": args.timestamp, "heading": args.heading, "text": args.text}
+        note = args.note
+    else:
+        metadata_candidate = payload.get("metadata")
+        if isinstance(metadata_candidate, dict):
+            payload_metadata = metadata_candidate
+        # Metadata tags override top-level payload tags. Normalize each source
+        # before merging so a blank metadata value cannot hide a payload one.
+        context_tags = _normalize_context_tags(payload.get("context_tags"))
+        context_tags.update(_normalize_context_tags(payload_metadata.get("context_tags")))
+        segment = {
+            "timestamp": payload.get("timestamp", args.timestamp),
+            "heading": payload.get("heading", args.heading),
+            "text": payload.get("text", ""),
+        }
+        note = args.note or payload.get("note", "")
+    if cli_context_tags:
+        context_tags.update(cli_context_tags)
+
+    # Everything needed for the segment key comes from the CLI and payload; the
+    # registry is only consulted later for a missing podcast id/title.
+    podcast_id = _first_nonempty_str(
+        args.podcast_id,
+        payload.get("podcast_id", ""),
+        payload_metadata.get("podcast_id"),
     )
-    input_group = parser.add_mutually_exclusive_group(required=True)
-    input_group.add_argument(
-        "--text",
-        metavar="TEXT",
-        help="Transcript excerpt (text). Surround with quotes if needed.",
+    episode_title = _first_nonempty_str(
+        args.episode_title,
+        payload.get("episode_title", ""),
+        payload_metadata.get("episode_title"),
     )
-    input_group.add_argument(
-        "--segment-json",
-        type=Path,
-        help="Path to JSON file with {timestamp, heading, text, note}.",
+    window_id = _first_nonempty_str(
+        payload.get("window_id", "") or payload.get("heading", ""),
+        payload_metadata.get("window_id"),
+        args.window_id,
+        segment.get("heading"),
+        default="general",
     )
-    parser.add_argument(
-        "--timestamp",
-        default="",
-        help="Timestamp for the segment (e.g., 00:32:15).",
+    speaker = _first_nonempty_str(
+        payload.get("speaker", ""),
+        payload_metadata.get("speaker"),
+        args.speaker,
     )
-    parser.add_argument("--heading", default="", help="Segment heading if available.")
-    parser.add_argument(
-        "--note",
-        default="",
-        help="Optional user note describing where to focus.",
+    return SegmentJob(
+        segment=segment,
+        note=note,
+        context_tags=context_tags,
+        podcast_id=podcast_id,
+        episode_title=episode_title,
+        timestamp=_sanitize_timestamp(str(segment.get("timestamp", ""))),
+        window_id=_sanitize_window_id(window_id),
+        speaker=speaker,
     )
-    parser.add_argument(
-        "--context-tag",
-        action="append",
-        help="Attach a context tag in KEY=VALUE format (repeatable).",
-    )
-    parser.add_argument(
-        "--context-tags-json",
-        type=Path,
-        help="Path to a JSON file containing a `context_tags` object.",
-    )
-    parser.add_argument(
-        "--assume-all-claims",
-        action="store_true",
-        help="Treat every sentence in the segment as a claim regardless of heuristics.",
-    )
-    parser.add_argument(
-        "--redo",
-        action="store_true",
-        help="Re-run even when a card already exists for the same timestamp/heading.",
-    )
-    parser.add_argument(
-        "--use-gemini",
-        action="store_true",
-        help="Use Gemini-powered claim identification instead of the heuristic detector.",
-    )
-    parser.add_argument(
-        "--podcast-id",
-        default="",
-        help="Optional identifier for the podcast/episode to tag in the registry.",
-    )
-    parser.add_argument(
-        "--episode-title",
-        default="",
-        help="Optional human-readable episode title for registry metadata.",
-    )
-    parser.add_argument(
-        "--window-id",
-        default="",
-        help="Override the window identifier used in the registry key.",
-    )
-    parser.add_argument(
-        "--speaker",
-        default="",
-        help="Speaker name associated with this transcript window.",
-    )
-    parser.add_argument(
-        "--gemini-model",
-        default="",
-        help="Override the Gemini model name for this run.",
-    )
-    parser.add_argument(
-        "--gemini-prompt-version",
-        default=DEFAULT_PROMPT_VERSION,
-        help="Label for the Gemini prompt version or template.",
-    )
-
-    args = parser.parse_args()
-
-    context_tags: Dict[str, str] = {}
-    payload: Dict[str, Any] = {}
-    payload_metadata: Dict[str, Any] = {}
-    payload_podcast_id = ""
-    payload_episode_title = ""
-    payload_window_id = ""
-    payload_speaker = ""
-
-    if args.segment_json:
-        payload = json.loads(args.segment_json.read_text(encoding="utf-8"))
-        segment = {
-            "timestamp": payload.get("timestamp", args.timestamp),
-            "heading": payload.get("heading", args.heading),
-            "text": payload.get("text", ""),
-        }
-        note = args.note or payload.get("note", "")
-        context_tags.update(_normalize_context_tags(payload.get("context_tags")))
-        metadata_candidate = payload.get("metadata")
-        if isinstance(metadata_candidate, dict):
-            payload_metadata = metadata_candidate
-            context_tags.update(_normalize_context_tags(payload_metadata.get("context_tags")))
-        payload_podcast_id = payload.get("podcast_id", "")
-        payload_episode_title = payload.get("episode_title", "")
-        payload_window_id = payload.get("window_id", "") or payload.get("heading", "")
-        payload_speaker = payload.get("speaker", "")
-    else:
-        segment = {"timestamp": args.timestamp, "heading": args.heading, "text": args.text}
-        note = args.note
 
-    if args.context_tags_json:
-        if not args.context_tags_json.exists():
-            parser.error(f"{args.context_tags_json} does not exist.")
-        try:
-            raw_tags = json.loads(args.context_tags_json.read_text(encoding="utf-8"))
-        except json.JSONDecodeError as exc:
-            parser.error(f"Invalid context-tags JSON: {exc}")
-        if not isinstance(raw_tags, dict):
-            parser.error("Context tags JSON must contain an object.")
-        context_tags.update(_normalize_context_tags(raw_tags))
 
-    if args.context_tag:
-        for raw_tag in args.context_tag:
-            try:
-                key, value = _parse_context_tag_argument(raw_tag)
-            except ValueError as exc:
-                parser.error(f"--context-tag {exc}")
-            context_tags[key] = value
-
-    if not segment["text"]:
-        parser.error("Transcript text is required via --text or --segment-json.")
+async def _record_segment(
+    registry: Dict[str, Any],
+    registry_lock: asyncio.Lock,
+    podcast_id: str,
+    episode_title: str,
+    segment_key: str,
+    segment_entry: Dict[str, Any],
+) -> None:
+    # Segments finish out of order in batch mode; serialize the file writes so
+    # the registry and podcast cache are never rewritten concurrently.
+    async with registry_lock:
+        registry["podcast_id"] = podcast_id
+        registry["episode_title"] = episode_title
+        registry["processed_date"] = segment_entry["last_processed"]
+        registry["segments"][segment_key] = segment_entry
+        await asyncio.to_thread(
+            _update_podcast_cache, podcast_id, episode_title, segment_key, segment_entry
+        )
+        await asyncio.to_thread(
+            append_registry_segment, REGISTRY_PATH, registry, segment_key, segment_entry
+        )
 
-    registry = load_registry(REGISTRY_PATH)
-    existing_podcast_id = registry.get("podcast_id", "")
-    existing_episode_title = registry.get("episode_title", "")
 
-    podcast_id = _first_nonempty_str(
-        args.podcast_id,
-        payload_podcast_id,
-        payload_metadata.get("podcast_id"),
-        existing_podcast_id,
-        default="unknown_podcast",
-    )
-    episode_title = _first_nonempty_str(
-        args.episode_title,
-        payload_episode_title,
-        payload_metadata.get("episode_title"),
-        existing_episode_title,
-    )
-    window_id = _first_nonempty_str(
-        payload_window_id,
-        payload_metadata.get("window_id"),
-        args.window_id,
-        segment.get("heading"),
-        default="general",
-    )
-    speaker = _first_nonempty_str(
-        payload_speaker,
-        payload_metadata.get("speaker"),
-        args.speaker,
+async def _process_one(
+    job: SegmentJob,
+    args: argparse.Namespace,
+    registry: Dict[str, Any],
+    registry_lock: asyncio.Lock,
+    processed_at: str,
+    gemini_queue: Optional[BatchQueue] = None,
+) -> None:
+    segment = job.segment
+    note = job.note
+    context_tags = job.context_tags
+    speaker = job.speaker
+    normalized_timestamp = job.timestamp
+    normalized_window_id = job.window_id
+
+    podcast_id = job.podcast_id or _first_nonempty_str(
+        registry.get("podcast_id", ""), default="unknown_podcast"
     )
-    normalized_timestamp = _sanitize_timestamp(str(segment.get("timestamp", "")))
-    normalized_window_id = _sanitize_window_id(window_id)
-
-    segment_key = build_segment_key(
-        podcast_id,
-        normalized_timestamp,
-        normalized_window_id,
+    episode_title = job.episode_title or _first_nonempty_str(
+        registry.get("episode_title", "")
     )
+    segment_key = job.segment_key(podcast_id)
 
     if segment_key in registry["segments"] and not args.redo:
         once = registry["segments"][segment_key]
@@ -1048,7 +1550,6 @@ def main() -> None:
         )
         return
 
-    note_terms = _build_note_terms(note)
     claims: List[ClaimCandidate] = []
     active_gemini_model = args.gemini_model or GEMINI_MODEL_DEFAULT
     gemini_prompt_version = args.gemini_prompt_version or DEFAULT_PROMPT_VERSION
@@ -1059,24 +1560,34 @@ def main() -> None:
             "model": active_gemini_model,
             "prompt_version": gemini_prompt_version,
             "token_count": None,
+            "estimated_token_count": None,
         }
         logging.info("Identifying claims via Gemini model %s.", active_gemini_model)
         try:
-            gemini_results, gemini_tags, gemini_usage = asyncio.run(
-                identify_claims_with_gemini(
+            if gemini_queue is not None:
+                gemini_results, gemini_tags, gemini_usage = await gemini_queue.submit(
+                    {"text": segment["text"], "note": note or None}
+                )
+            else:
+                gemini_results, gemini_tags, gemini_usage = await identify_claims_with_gemini(
                     segment["text"],
                     note or None,
                     max_claims=MAX_CLAIMS_PER_SEGMENT,
                     model_name=active_gemini_model,
                 )
-            )
         except Exception:
             logging.exception("Gemini claim detection failed; falling back to heuristics.")
         else:
             gemini_metadata["token_count"] = gemini_usage.get("token_count")
+            gemini_metadata["estimated_token_count"] = gemini_usage.get(
+                "estimated_token_count"
+            )
+            if gemini_usage.get("batch_size"):
+                gemini_metadata["batch_size"] = gemini_usage["batch_size"]
             if gemini_tags:
                 context_tags.update(gemini_tags)
             if gemini_results:
+                note_terms = _build_note_terms(note)
                 claims = []
                 for entry in gemini_results:
                     cleaned_text = clean_claim_text(entry["claim_text"])
@@ -1106,10 +1617,6 @@ def main() -> None:
         )
     if not claims:
         print("No under-contextualized claims detected in this segment.")
-        processed_at = datetime.utcnow().isoformat()
-        registry["podcast_id"] = podcast_id
-        registry["episode_title"] = episode_title
-        registry["processed_date"] = processed_at
         segment_entry = {
             "timestamp": normalized_timestamp,
             "window_id": normalized_window_id,
@@ -1124,29 +1631,31 @@ def main() -> None:
             "gemini_metadata": gemini_metadata,
             "last_processed": processed_at,
         }
-        registry["segments"][segment_key] = segment_entry
-        _update_podcast_cache(podcast_id, episode_title, segment_key, segment_entry)
-        save_registry(REGISTRY_PATH, registry)
+        await _record_segment(
+            registry, registry_lock, podcast_id, episode_title, segment_key, segment_entry
+        )
         return
 
-    cards, misses, research_queries = asyncio.run(
-        enrich_claims(
-            timestamp=str(segment["timestamp"]),
-            heading=str(segment["heading"]),
-            claims=claims,
-            context_tags=context_tags,
-        )
-    )
+    cards: List[ContextCard] = []
+    misses: List[Tuple[str, str]] = []
+    research_queries: List[str] = []
+    rag_results: List[dict] = []
+    async for result in iter_enriched_claims(
+        timestamp=str(segment["timestamp"]),
+        heading=str(segment["heading"]),
+        claims=claims,
+        context_tags=context_tags,
+    ):
+        research_queries.append(result.query)
+        if result.card is not None:
+            cards.append(result.card)
+            rag_results.append(_serialize_context_card(result.card))
+        else:
+            misses.append((result.claim.text, result.miss_reason or ""))
 
     print_cards(cards, note, context_tags)
     print_misses(misses)
 
-    processed_at = datetime.utcnow().isoformat()
-    rag_results = [_serialize_context_card(card) for card in cards]
-
-    registry["podcast_id"] = podcast_id
-    registry["episode_title"] = episode_title
-    registry["processed_date"] = processed_at
     # Serialize claims with full metadata (speaker_stance, claim_type, etc.)
     serialized_claims = []
     for claim in claims:
@@ -1175,11 +1684,482 @@ def main() -> None:
         "gemini_metadata": gemini_metadata,
         "last_processed": processed_at,
     }
-    registry["segments"][segment_key] = segment_entry
-    _update_podcast_cache(podcast_id, episode_title, segment_key, segment_entry)
-    save_registry(REGISTRY_PATH, registry)
+    await _record_segment(
+        registry, registry_lock, podcast_id, episode_title, segment_key, segment_entry
+    )
+
+
+def _utc_timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class SegmentRunner:
+    """Shared state for processing segments against one loaded registry.
+
+    ``processed_at`` stamps every segment the runner handles, keeping a batch
+    consistent; without it each job is stamped when it starts, which is what a
+    long-lived ``--stdin-jsonl`` stream needs.
+    """
+
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        registry: Dict[str, Any],
+        max_concurrency: int,
+        batch_gemini: bool = True,
+        processed_at: Optional[str] = None,
+    ):
+        self.args = args
+        self.registry = registry
+        self.processed_at = processed_at
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.registry_lock = asyncio.Lock()
+        self.gemini_queue: Optional[BatchQueue] = None
+        if args.use_gemini and batch_gemini:
+            model_name = args.gemini_model or GEMINI_MODEL_DEFAULT
+            # At most `max_concurrency` segments can be waiting on Gemini at once,
+            # so flush as soon as that many have queued up.
+            self.gemini_queue = BatchQueue(
+                lambda segments: identify_claims_with_gemini_batch(
+                    segments, max_claims=MAX_CLAIMS_PER_SEGMENT, model_name=model_name
+                ),
+                max_batch_size=min(GEMINI_BATCH_MAX_SIZE, max_concurrency),
+            )
+
+    async def run(self, job: SegmentJob, reraise: bool = False) -> None:
+        async with self.semaphore:
+            try:
+                await _process_one(
+                    job,
+                    self.args,
+                    self.registry,
+                    self.registry_lock,
+                    self.processed_at or _utc_timestamp(),
+                    self.gemini_queue,
+                )
+            except Exception:
+                if reraise:
+                    raise
+                logging.exception(
+                    "Failed to process segment at %s.", job.segment.get("timestamp")
+                )
+
+
+async def _gather_bounded(
+    jobs: List[SegmentJob],
+    args: argparse.Namespace,
+    registry: Dict[str, Any],
+    max_concurrency: int,
+) -> None:
+    single = len(jobs) == 1
+    runner = SegmentRunner(
+        args,
+        registry,
+        max_concurrency,
+        batch_gemini=not single,
+        # One timestamp per run keeps every segment of a batch consistent.
+        processed_at=_utc_timestamp(),
+    )
+    await asyncio.gather(*(runner.run(job, reraise=single) for job in jobs))
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Turn transcript claims into MCP context cards."
+    )
+    input_group = parser.add_mutually_exclusive_group()
+    input_group.add_argument(
+        "--text",
+        metavar="TEXT",
+        help="Transcript excerpt (text). Surround with quotes if needed.",
+    )
+    input_group.add_argument(
+        "--segment-json",
+        type=Path,
+        help=(
+            "Path to JSON file with {timestamp, heading, text, note}, or an array of "
+            "such objects to process a batch of segments."
+        ),
+    )
+    input_group.add_argument(
+        "--stdin-jsonl",
+        action="store_true",
+        help=(
+            "Read one segment JSON object per line from stdin and process each as it "
+            "arrives, keeping the Gemini client and RAG stack loaded."
+        ),
+    )
+    parser.add_argument(
+        "--timestamp",
+        default="",
+        help="Timestamp for the segment (e.g., 00:32:15).",
+    )
+    parser.add_argument("--heading", default="", help="Segment heading if available.")
+    parser.add_argument(
+        "--note",
+        default="",
+        help="Optional user note describing where to focus.",
+    )
+    parser.add_argument(
+        "--context-tag",
+        action="append",
+        help="Attach a context tag in KEY=VALUE format (repeatable).",
+    )
+    parser.add_argument(
+        "--context-tags-json",
+        type=Path,
+        help="Path to a JSON file containing a `context_tags` object.",
+    )
+    parser.add_argument(
+        "--assume-all-claims",
+        action="store_true",
+        help="Treat every sentence in the segment as a claim regardless of heuristics.",
+    )
+    parser.add_argument(
+        "--redo",
+        action="store_true",
+        help="Re-run even when a card already exists for the same timestamp/heading.",
+    )
+    parser.add_argument(
+        "--use-gemini",
+        action="store_true",
+        help="Use Gemini-powered claim identification instead of the heuristic detector.",
+    )
+    parser.add_argument(
+        "--podcast-id",
+        default="",
+        help="Optional identifier for the podcast/episode to tag in the registry.",
+    )
+    parser.add_argument(
+        "--episode-title",
+        default="",
+        help="Optional human-readable episode title for registry metadata.",
+    )
+    parser.add_argument(
+        "--window-id",
+        default="",
+        help="Override the window identifier used in the registry key.",
+    )
+    parser.add_argument(
+        "--speaker",
+        default="",
+        help="Speaker name associated with this transcript window.",
+    )
+    parser.add_argument(
+        "--gemini-model",
+        default="",
+        help="Override the Gemini model name for this run.",
+    )
+    parser.add_argument(
+        "--gemini-prompt-version",
+        default=DEFAULT_PROMPT_VERSION,
+        help="Label for the Gemini prompt version or template.",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of segments processed at once in batch mode (default: 4).",
+    )
+    parser.add_argument(
+        "--rag-concurrency",
+        type=int,
+        default=RAG_CONCURRENCY_DEFAULT,
+        help=(
+            "Maximum number of rag_search calls in flight across all segments "
+            f"(default: {RAG_CONCURRENCY_DEFAULT})."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk Gemini response cache (data/.llm_cache.db).",
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        help=(
+            "Unix socket of a running --daemon. Requests are forwarded to it when it "
+            "is listening; otherwise the segment is processed in this process."
+        ),
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help=(
+            "Serve requests on --socket, keeping the Gemini client and RAG stack "
+            "loaded between invocations."
+        ),
+    )
+    return parser
+
+
+def _validate_args(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    if args.text is None and args.segment_json is None and not args.stdin_jsonl:
+        parser.error("one of the arguments --text --segment-json --stdin-jsonl is required")
+    if args.max_concurrency < 1:
+        parser.error("--max-concurrency must be at least 1.")
+    if args.rag_concurrency < 1:
+        parser.error("--rag-concurrency must be at least 1.")
+
+
+def _collect_cli_context_tags(
+    args: argparse.Namespace, parser: argparse.ArgumentParser
+) -> Dict[str, str]:
+    cli_context_tags: Dict[str, str] = {}
+    if args.context_tags_json:
+        if not args.context_tags_json.exists():
+            parser.error(f"{args.context_tags_json} does not exist.")
+        try:
+            raw_tags = json.loads(args.context_tags_json.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as exc:
+            parser.error(f"Invalid context-tags JSON: {exc}")
+        if not isinstance(raw_tags, dict):
+            parser.error("Context tags JSON must contain an object.")
+        cli_context_tags.update(_normalize_context_tags(raw_tags))
+
+    if args.context_tag:
+        for raw_tag in args.context_tag:
+            try:
+                key, value = _parse_context_tag_argument(raw_tag)
+            except ValueError as exc:
+                parser.error(f"--context-tag {exc}")
+            cli_context_tags[key] = value
+    return cli_context_tags
+
+
+def _warn_empty_segment(job: SegmentJob) -> None:
+    logging.warning(
+        "Skipping segment at %s with no transcript text.",
+        job.segment.get("timestamp") or "unknown timestamp",
+    )
+
+
+def _prepare_jobs(
+    args: argparse.Namespace, parser: argparse.ArgumentParser
+) -> List[SegmentJob]:
+    _validate_args(args, parser)
+    cli_context_tags = _collect_cli_context_tags(args, parser)
+
+    payloads: List[Optional[Dict[str, Any]]]
+    if args.segment_json:
+        try:
+            payloads = list(_load_segment_payloads(args.segment_json))
+        except ValueError as exc:
+            parser.error(str(exc))
+    else:
+        payloads = [None]
+
+    jobs = [_build_segment_job(payload, args, cli_context_tags) for payload in payloads]
+    if len(jobs) == 1 and not jobs[0].segment["text"]:
+        parser.error("Transcript text is required via --text or --segment-json.")
+    for job in jobs:
+        if not job.segment["text"]:
+            _warn_empty_segment(job)
+    return [job for job in jobs if job.segment["text"]]
+
+
+async def _load_run_registry(args: argparse.Namespace) -> Dict[str, Any]:
+    configure_rag_concurrency(args.rag_concurrency)
+    configure_gemini_concurrency()
+    configure_response_cache(not args.no_cache)
+    return await asyncio.to_thread(load_registry, REGISTRY_PATH)
+
+
+async def _run_jobs(jobs: List[SegmentJob], args: argparse.Namespace) -> None:
+    if not jobs:
+        return
+    registry = await _load_run_registry(args)
+    await _gather_bounded(jobs, args, registry, args.max_concurrency)
+
+
+async def process_segments(
+    segments: Iterable[Mapping[str, Any]],
+    args: Optional[argparse.Namespace] = None,
+) -> None:
+    """Process segment payloads in-process, for drivers that import this module.
+
+    ``args`` defaults to the CLI defaults; build it with ``_build_parser()`` to
+    pass flags such as ``--use-gemini`` or ``--podcast-id``.
+    """
+    if args is None:
+        args = _build_parser().parse_args(["--stdin-jsonl"])
+    jobs: List[SegmentJob] = []
+    for payload in segments:
+        job = _build_segment_job(dict(payload), args, {})
+        if job.segment["text"]:
+            jobs.append(job)
+        else:
+            _warn_empty_segment(job)
+    await _run_jobs(jobs, args)
+
+
+async def _read_stdin_line() -> str:
+    return await asyncio.to_thread(sys.stdin.readline)
+
+
+async def _run_stdin_jsonl(
+    args: argparse.Namespace, cli_context_tags: Dict[str, str]
+) -> None:
+    registry = await _load_run_registry(args)
+    runner = SegmentRunner(args, registry, args.max_concurrency)
+    pending: set[asyncio.Future] = set()
+    line_number = 0
+    while True:
+        line = await _read_stdin_line()
+        if not line:
+            break
+        line_number += 1
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as exc:
+            logging.error("Skipping stdin line %d: invalid JSON (%s).", line_number, exc)
+            continue
+        if not isinstance(payload, dict):
+            logging.error("Skipping stdin line %d: expected a JSON object.", line_number)
+            continue
+        job = _build_segment_job(payload, args, cli_context_tags)
+        if not job.segment["text"]:
+            _warn_empty_segment(job)
+            continue
+        task = asyncio.ensure_future(runner.run(job))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.gather(*pending)
+
+
+def _absolutize_paths(args: argparse.Namespace, cwd: Path) -> None:
+    for attr in ("segment_json", "context_tags_json"):
+        value = getattr(args, attr)
+        if value is not None and not value.is_absolute():
+            setattr(args, attr, cwd / value)
+
+
+@contextlib.contextmanager
+def _log_to(stream: io.StringIO) -> Iterator[None]:
+    """Copy root log records to stream; the basicConfig handler keeps the real stderr."""
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    try:
+        yield
+    finally:
+        root.removeHandler(handler)
+
+
+async def _handle_daemon_request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    request_lock: asyncio.Lock,
+) -> None:
+    output = io.StringIO()
+    status = 0
+    try:
+        request = json.loads(await reader.readline())
+        argv = [str(item) for item in request.get("argv", [])]
+        cwd = Path(request.get("cwd") or os.getcwd())
+        # Requests run one at a time: stdout/stderr and logging are redirected
+        # per request, and each request already fans out over its own segments.
+        async with request_lock:
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output), \
+                    _log_to(output):
+                try:
+                    parser = _build_parser()
+                    args = parser.parse_args(argv)
+                    if args.daemon or args.stdin_jsonl:
+                        parser.error(
+                            "--daemon/--stdin-jsonl cannot be forwarded to a running daemon."
+                        )
+                    _absolutize_paths(args, cwd)
+                    await _run_jobs(_prepare_jobs(args, parser), args)
+                except SystemExit as exc:
+                    status = exc.code if isinstance(exc.code, int) else 1
+                except Exception:
+                    logging.exception("Daemon request failed.")
+                    status = 1
+    except (json.JSONDecodeError, AttributeError) as exc:
+        output.write(f"Invalid daemon request: {exc}\n")
+        status = 2
+    response = {"status": status, "output": output.getvalue()}
+    writer.write(json.dumps(response).encode("utf-8") + b"\n")
+    await writer.drain()
+    writer.close()
+    await writer.wait_closed()
+
+
+async def serve_daemon(socket_path: Path) -> None:
+    """Process forwarded CLI invocations with one long-lived interpreter."""
+    if socket_path.exists():
+        socket_path.unlink()
+    request_lock = asyncio.Lock()
+    server = await asyncio.start_unix_server(
+        lambda reader, writer: _handle_daemon_request(reader, writer, request_lock),
+        path=str(socket_path),
+    )
+    logging.info("Context card daemon listening on %s.", socket_path)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        socket_path.unlink(missing_ok=True)
+
+
+def _forward_to_daemon(socket_path: Path, argv: List[str]) -> Optional[int]:
+    """Send argv to a running daemon; returns None when no daemon is listening."""
+    request = {"argv": argv, "cwd": os.getcwd()}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(socket_path))
+            client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with client.makefile("rb") as stream:
+                line = stream.readline()
+    except OSError:
+        return None
+    try:
+        response = json.loads(line)
+    except ValueError:
+        # Empty or garbled reply (e.g. the daemon died mid-request).
+        return None
+    if not isinstance(response, dict):
+        return None
+    sys.stdout.write(response.get("output", ""))
+    return int(response.get("status", 1))
+
+
+async def amain(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    """Run every mode inside one event loop so setup is paid once per process."""
+    if args.daemon:
+        await serve_daemon(args.socket)
+    elif args.stdin_jsonl:
+        _validate_args(args, parser)
+        await _run_stdin_jsonl(args, _collect_cli_context_tags(args, parser))
+    else:
+        await _run_jobs(_prepare_jobs(args, parser), args)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    if args.daemon and args.socket is None:
+        parser.error("--daemon requires --socket PATH.")
+
+    if args.socket is not None and not args.daemon:
+        status = _forward_to_daemon(args.socket, argv)
+        if status is not None:
+            if status:
+                sys.exit(status)
+            return
+        logging.info("No daemon listening on %s; running in-process.", args.socket)
+
+    asyncio.run(amain(args, parser))
 
 
 if __name__ == "__main__":
     main()
-
@@ -6,21 +6,119 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 
+import numpy as np
 
-def ms_to_timestamp(ms: int) -> str:
-    """Convert milliseconds to HH:MM:SS.mmm format."""
-    seconds = ms // 1000
-    millis = ms % 1000
-    hours = seconds // 3600
-    minutes = (seconds % 3600) // 60
-    secs = seconds % 60
-    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millis:03d}"
+try:
+    import ijson  # type: ignore[import]
+except ImportError:  # pragma: no cover - falls back to loading the whole file
+    ijson = None
+
+try:
+    import orjson  # type: ignore[import]
+except ImportError:  # pragma: no cover - stdlib json is the fallback codec
+    orjson = None
+
+try:
+    import msgspec  # type: ignore[import]
+except ImportError:  # pragma: no cover - ijson/json loaders are the fallback
+    msgspec = None
+
+
+if msgspec is not None:
+
+    class Utterance(msgspec.Struct):
+        """The utterance fields the converter reads; everything else is skipped."""
+
+        start: int = 0
+        end: int = 0
+        text: str = ""
+        speaker: Optional[str] = ""
+
+    class _Transcript(msgspec.Struct):
+        utterances: List[Utterance] = []
+
+
+class UtteranceColumns(NamedTuple):
+    """Utterances as parallel columns in start order (structure of arrays).
+
+    ``raw_starts``/``raw_ends`` keep the input values for output records;
+    ``starts``/``ends`` are their int64 arrays for window arithmetic.
+    """
+
+    raw_starts: List[Any]
+    raw_ends: List[Any]
+    speakers: List[Any]
+    texts: List[Any]
+    starts: np.ndarray
+    ends: np.ndarray
+
+
+def load_utterances(path: Path) -> List[Any]:
+    """Read only the ``utterances`` array from a raw AssemblyAI transcript.
+
+    With msgspec installed the utterances decode straight into typed
+    :class:`Utterance` structs and every other field is skipped without being
+    materialized. Otherwise, with ijson installed, the word-level arrays and
+    other top-level fields are parsed and discarded incrementally. Both
+    fallbacks return plain dicts.
+    """
+    if msgspec is not None:
+        try:
+            return msgspec.json.decode(path.read_bytes(), type=_Transcript).utterances
+        except msgspec.ValidationError:
+            pass  # Unexpected field types; the dict loaders keep values as-is.
+    if ijson is not None:
+        with path.open("rb") as handle:
+            return list(ijson.items(handle, "utterances.item", use_float=True))
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    return raw.get("utterances", [])
+
+
+def utterance_columns(utterances: List[Any]) -> UtteranceColumns:
+    """Split utterances (dicts or :class:`Utterance` structs) into start-ordered
+    columns; the sort is stable, like sorting the records themselves."""
+    if msgspec is not None and utterances and isinstance(utterances[0], Utterance):
+        columns = (
+            [u.start for u in utterances],
+            [u.end for u in utterances],
+            [u.speaker for u in utterances],
+            [u.text for u in utterances],
+        )
+    else:
+        columns = (
+            [u.get("start", 0) for u in utterances],
+            [u.get("end", 0) for u in utterances],
+            [u.get("speaker", "") for u in utterances],
+            [u.get("text", "") for u in utterances],
+        )
+    order = sorted(range(len(utterances)), key=columns[0].__getitem__)
+    raw_starts, raw_ends, speakers, texts = ([column[i] for i in order] for column in columns)
+    return UtteranceColumns(
+        raw_starts,
+        raw_ends,
+        speakers,
+        texts,
+        np.fromiter(raw_starts, dtype=np.int64, count=len(raw_starts)),
+        np.fromiter(raw_ends, dtype=np.int64, count=len(raw_ends)),
+    )
+
+
+def ms_to_timestamps(ms: np.ndarray) -> List[str]:
+    """Convert an integer array of milliseconds to HH:MM:SS.mmm strings."""
+    hours = (ms // 3_600_000).tolist()
+    minutes = (ms // 60_000 % 60).tolist()
+    secs = (ms // 1000 % 60).tolist()
+    millis = (ms % 1000).tolist()
+    return [
+        f"{h:02d}:{m:02d}:{s:02d}.{ml:03d}"
+        for h, m, s, ml in zip(hours, minutes, secs, millis)
+    ]
 
 
 def build_windows(
-    utterances: List[Dict[str, Any]],
+    utterances: Union[List[Any], UtteranceColumns],
     window_duration_ms: int = 180_000,  # 3 minutes
     overlap_ms: int = 60_000,  # 1 minute overlap
 ) -> List[Dict[str, Any]]:
@@ -29,62 +127,181 @@ def build_windows(
 
     Each window covers window_duration_ms and overlaps with the next by overlap_ms.
     """
-    if not utterances:
-        return []
+    return list(iter_windows(utterances, window_duration_ms, overlap_ms))
 
-    # Find the total duration
-    max_end_ms = max(u.get("end", 0) for u in utterances)
 
-    windows = []
-    window_id = 1
-    window_start_ms = 0
-    step_ms = window_duration_ms - overlap_ms  # How much to advance each window
+def iter_windows(
+    utterances: Union[List[Any], UtteranceColumns],
+    window_duration_ms: int = 180_000,
+    overlap_ms: int = 60_000,
+    compact: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """Yield the windows of :func:`build_windows` one at a time.
 
-    while window_start_ms < max_end_ms:
-        window_end_ms = window_start_ms + window_duration_ms
-
-        # Collect utterances that overlap with this window
-        window_utterances = []
-        for u in utterances:
-            u_start = u.get("start", 0)
-            u_end = u.get("end", 0)
-            # Include if utterance overlaps with window
-            if u_start < window_end_ms and u_end > window_start_ms:
-                window_utterances.append({
-                    "speaker": u.get("speaker", ""),
-                    "start_ms": u_start,
-                    "end_ms": u_end,
-                    "text": u.get("text", ""),
-                })
-
-        if window_utterances:
-            # Combine text from all utterances in this window
-            combined_text = " ".join(u["text"] for u in window_utterances)
+    With ``compact`` each window carries ``utterance_ids`` (indices into the
+    utterances sorted by start, see :func:`utterance_records`) instead of its
+    own copies of the utterance records. Pass :func:`utterance_columns` output
+    to reuse one columnar view across calls.
+    """
+    # Structure-of-arrays view, sorted by start. Window membership is then two
+    # searchsorted calls per window grid instead of a scan over utterances.
+    if not isinstance(utterances, UtteranceColumns):
+        utterances = utterance_columns(utterances)
+    raw_starts, raw_ends, speakers, texts, starts, ends = utterances
+    if not raw_starts:
+        return
 
-            # Actual start/end based on utterances in window
-            actual_start = min(u["start_ms"] for u in window_utterances)
-            actual_end = max(u["end_ms"] for u in window_utterances)
+    # Find the total duration
+    max_end_ms = int(ends.max())
 
-            windows.append({
+    step_ms = window_duration_ms - overlap_ms  # How much to advance each window
+    window_starts = np.arange(0, max_end_ms, step_ms, dtype=np.int64)
+    window_ends = window_starts + window_duration_ms
+    # Ends are not sorted, but their running maximum is: everything before
+    # `lo` finished at or before the window start.
+    los = np.searchsorted(np.maximum.accumulate(ends), window_starts, side="right")
+    his = np.searchsorted(starts, window_ends, side="left")
+    # Drop windows that cannot hold an utterance (gaps, silence at the edges)
+    # before entering Python, so the loop only visits populated candidates.
+    populated = los < his
+    window_starts, los, his = window_starts[populated], los[populated], his[populated]
+
+    # Membership first, so every window's boundaries are known up front and can
+    # be formatted in one vectorized pass.
+    window_members: List[List[int]] = []
+    for window_start_ms, lo, hi in zip(window_starts.tolist(), los.tolist(), his.tolist()):
+        # Sorted by start only, so a later-ending utterance may precede ones
+        # that already finished before this window.
+        members = (lo + np.flatnonzero(ends[lo:hi] > window_start_ms)).tolist()
+        if members:
+            window_members.append(members)
+    if not window_members:
+        return
+
+    # Actual start/end based on utterances in window
+    actual_starts = starts[[members[0] for members in window_members]]
+    actual_ends = np.fromiter(
+        (ends[members].max() for members in window_members),
+        dtype=np.int64,
+        count=len(window_members),
+    )
+    start_timestamps = ms_to_timestamps(actual_starts)
+    end_timestamps = ms_to_timestamps(actual_ends)
+
+    for window_id, (members, actual_start, actual_end, start_ts, end_ts) in enumerate(
+        zip(
+            window_members,
+            actual_starts.tolist(),
+            actual_ends.tolist(),
+            start_timestamps,
+            end_timestamps,
+        ),
+        start=1,
+    ):
+        if compact:
+            yield {
                 "window_id": window_id,
-                "start_timestamp": ms_to_timestamp(actual_start),
-                "end_timestamp": ms_to_timestamp(actual_end),
+                "start_timestamp": start_ts,
+                "end_timestamp": end_ts,
                 "start_ms": actual_start,
                 "end_ms": actual_end,
-                "text": combined_text,
-                "utterances": window_utterances,
-            })
-            window_id += 1
-
-        window_start_ms += step_ms
+                "text": " ".join([texts[idx] for idx in members]),
+                "utterance_ids": members,
+            }
+            continue
+
+        window_utterances = [
+            {
+                "speaker": speakers[idx],
+                "start_ms": raw_starts[idx],
+                "end_ms": raw_ends[idx],
+                "text": texts[idx],
+            }
+            for idx in members
+        ]
+
+        yield {
+            "window_id": window_id,
+            "start_timestamp": start_ts,
+            "end_timestamp": end_ts,
+            "start_ms": actual_start,
+            "end_ms": actual_end,
+            # Combine text from all utterances in this window
+            "text": " ".join([texts[idx] for idx in members]),
+            "utterances": window_utterances,
+        }
 
-        # Safety: if we've gone past the end with no new utterances, stop
-        if window_start_ms >= max_end_ms:
-            break
 
+def utterance_records(
+    utterances: Union[List[Any], UtteranceColumns],
+) -> List[Dict[str, Any]]:
+    """The utterance records that compact windows' ``utterance_ids`` index into."""
+    if not isinstance(utterances, UtteranceColumns):
+        utterances = utterance_columns(utterances)
+    return [
+        {"speaker": speaker, "start_ms": start, "end_ms": end, "text": text}
+        for start, end, speaker, text in zip(
+            utterances.raw_starts, utterances.raw_ends, utterances.speakers, utterances.texts
+        )
+    ]
+
+
+def expand_windows(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Turn a ``--compact`` payload back into the regular window list."""
+    records = payload["utterances"]
+    windows = []
+    for window in payload["windows"]:
+        expanded = {key: value for key, value in window.items() if key != "utterance_ids"}
+        expanded["utterances"] = [records[idx] for idx in window["utterance_ids"]]
+        windows.append(expanded)
     return windows
 
 
+def _dumps_window(window: Any, depth: int = 1) -> bytes:
+    if orjson is not None:
+        encoded = orjson.dumps(window, option=orjson.OPT_INDENT_2)
+    else:
+        encoded = json.dumps(window, ensure_ascii=False, indent=2).encode("utf-8")
+    # Nest `depth` levels deeper so the file matches json.dumps(..., indent=2).
+    return encoded.replace(b"\n", b"\n" + b"  " * depth)
+
+
+def write_windows(
+    path: Path,
+    windows: Iterable[Dict[str, Any]],
+    utterances: Optional[List[Dict[str, Any]]] = None,
+) -> Tuple[int, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Stream windows to ``path`` as an indented JSON array.
+
+    Passing ``utterances`` writes the compact layout instead: an object with
+    the shared ``utterances`` records and the ``windows`` that index them.
+
+    Returns the window count plus the first and last windows for the summary,
+    without holding the whole list (or its encoded form) in memory.
+    """
+    count = 0
+    first = last = None
+    depth = 1 if utterances is None else 2
+    separator = b"\n" + b"  " * depth
+    with path.open("wb") as handle:
+        if utterances is not None:
+            handle.write(b'{\n  "utterances": ')
+            handle.write(_dumps_window(utterances))
+            handle.write(b',\n  "windows": ')
+        handle.write(b"[")
+        for window in windows:
+            handle.write(b"," + separator if count else separator)
+            handle.write(_dumps_window(window, depth))
+            if first is None:
+                first = window
+            last = window
+            count += 1
+        handle.write(separator[:-2] + b"]" if count else b"]")
+        if utterances is not None:
+            handle.write(b"\n}")
+    return count, first, last
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Convert AssemblyAI raw JSON to window_segments format."
@@ -111,15 +328,21 @@ def main() -> None:
         default=60,
         help="Overlap between windows in seconds (default: 60 = 1 minute).",
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help=(
+            "Write utterances once at the top level and reference them from each "
+            "window by index (utterance_ids) instead of copying them per window."
+        ),
+    )
     args = parser.parse_args()
 
     if not args.input_file.exists():
         raise FileNotFoundError(f"{args.input_file} not found.")
 
     print(f"Loading {args.input_file}...")
-    raw = json.loads(args.input_file.read_text(encoding="utf-8"))
-
-    utterances = raw.get("utterances", [])
+    utterances = load_utterances(args.input_file)
     if not utterances:
         raise ValueError("No utterances found in the input file.")
 
@@ -128,14 +351,6 @@ def main() -> None:
     window_duration_ms = args.window_duration * 1000
     overlap_ms = args.overlap * 1000
 
-    windows = build_windows(
-        utterances,
-        window_duration_ms=window_duration_ms,
-        overlap_ms=overlap_ms,
-    )
-
-    print(f"Created {len(windows)} windows.")
-
     # Determine output path
     if args.output:
         output_path = args.output
@@ -143,23 +358,31 @@ def main() -> None:
         output_path = Path("data") / f"window_segments_{args.input_file.stem}.json"
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(
-        json.dumps(windows, ensure_ascii=False, indent=2),
-        encoding="utf-8",
+    columns = utterance_columns(utterances)
+    window_count, first_window, last_window = write_windows(
+        output_path,
+        iter_windows(
+            columns,
+            window_duration_ms=window_duration_ms,
+            overlap_ms=overlap_ms,
+            compact=args.compact,
+        ),
+        utterances=utterance_records(columns) if args.compact else None,
     )
 
+    print(f"Created {window_count} windows.")
     print(f"Saved to {output_path}")
 
     # Print summary
-    if windows:
-        total_duration_ms = windows[-1]["end_ms"]
+    if first_window is not None and last_window is not None:
+        total_duration_ms = last_window["end_ms"]
         total_minutes = total_duration_ms / 60_000
         print(f"\nSummary:")
         print(f"  Total duration: {total_minutes:.1f} minutes")
-        print(f"  Windows: {len(windows)}")
+        print(f"  Windows: {window_count}")
         print(f"  Window duration: {args.window_duration}s, overlap: {args.overlap}s")
-        print(f"  First window: {windows[0]['start_timestamp']} - {windows[0]['end_timestamp']}")
-        print(f"  Last window: {windows[-1]['start_timestamp']} - {windows[-1]['end_timestamp']}")
+        print(f"  First window: {first_window['start_timestamp']} - {first_window['end_timestamp']}")
+        print(f"  Last window: {last_window['start_timestamp']} - {last_window['end_timestamp']}")
 
 
 if __name__ == "__main__":
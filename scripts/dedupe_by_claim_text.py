@@ -9,22 +9,54 @@ Keeps the "best" distilled version (longest and most descriptive).
 from collections import defaultdict
 from supabase_client import get_db
 
+CLAIM_COLUMNS = 'id,distilled_claim,claim_text,start_ms,distilled_word_count,paper_title'
+
+def fetch_claims_with_repeated_text(db, podcast_id: str):
+    """Fetch only the claims whose claim_text occurs more than once.
+    
+    The grouping runs in Postgres (find_dup_claim_texts, migration 023); if
+    that function is not deployed, falls back to fetching every claim.
+    """
+    try:
+        groups = db.find_duplicate_claim_texts(podcast_id)
+    except Exception as e:
+        print(f"   ⚠️  find_dup_claim_texts unavailable ({e}); scanning all claims")
+        claims = db.get_claims_for_episode(podcast_id, columns=CLAIM_COLUMNS)
+        print(f"   Total claims: {len(claims)}")
+        return claims
+    
+    claim_ids = [claim_id for group in groups for claim_id in group['claim_ids']]
+    print(f"   Claims sharing a quote: {len(claim_ids)} in {len(groups)} groups")
+    
+    claims = []
+    for i in range(0, len(claim_ids), 500):
+        response = (
+            db.client.table('claims')
+            .select(CLAIM_COLUMNS)
+            .in_('id', claim_ids[i:i+500])
+            .execute()
+        )
+        claims.extend(response.data)
+    # Same order as get_claims_for_episode (start_ms, nulls last)
+    claims.sort(key=lambda c: (c.get('start_ms') is None, c.get('start_ms') or 0))
+    return claims
+
 def find_duplicate_claim_texts(podcast_id: str = 'lex_325'):
     """Find claims with identical claim_text but different distilled versions."""
     db = get_db(use_service_key=True)
     
     print(f"🔍 Analyzing claims for duplicate quote texts in {podcast_id}...")
     
-    claims = db.get_claims_for_episode(podcast_id)
-    print(f"   Total claims: {len(claims)}")
+    claims = fetch_claims_with_repeated_text(db, podcast_id)
     
     # Group by claim_text (the original transcript quote)
     by_text = defaultdict(list)
+    group_for = by_text.__getitem__
     
     for claim in claims:
         text = claim.get('claim_text', '').strip()
         if text:  # Only process non-empty texts
-            by_text[text].append(claim)
+            group_for(text).append(claim)
     
     # Find groups with multiple claims
     duplicates = {text: claims for text, claims in by_text.items() if len(claims) > 1}
@@ -63,7 +95,7 @@ def find_duplicate_claim_texts(podcast_id: str = 'lex_325'):
 
 def select_best_distilled_claim(claims):
     """Select the best claim from a group with same claim_text."""
-    # Sort by quality
+    # Score by quality
     def quality_score(claim):
         score = 0
         
@@ -81,8 +113,8 @@ def select_best_distilled_claim(claims):
         
         return score
     
-    sorted_claims = sorted(claims, key=quality_score, reverse=True)
-    return sorted_claims[0]
+    # max() keeps the first of equally scored claims, like the stable sort did
+    return max(claims, key=quality_score)
 
 def main(podcast_id: str = 'lex_325', dry_run: bool = True):
     """Main deduplication by claim_text."""
@@ -115,15 +147,26 @@ def main(podcast_id: str = 'lex_325', dry_run: bool = True):
         
         db = get_db(use_service_key=True)
         
-        for claim_id in claims_to_delete:
+        # One DELETE ... WHERE id IN (...) per batch instead of one per claim
+        batch_size = 500
+        deleted = 0
+        for i in range(0, len(claims_to_delete), batch_size):
+            batch = claims_to_delete[i:i+batch_size]
             try:
-                db.client.table('claims').delete().eq('id', claim_id).execute()
-                print(f"   ✓ Deleted claim {claim_id}")
+                db.client.table('claims').delete().in_('id', batch).execute()
+                deleted += len(batch)
+                print(f"   ✓ Deleted {len(batch)} claims")
             except Exception as e:
-                print(f"   ❌ Error deleting claim {claim_id}: {e}")
+                print(f"   ⚠️  Batch delete failed ({e}); retrying {len(batch)} claims one by one")
+                for claim_id in batch:
+                    try:
+                        db.client.table('claims').delete().eq('id', claim_id).execute()
+                        deleted += 1
+                    except Exception as e:
+                        print(f"   ❌ Error deleting claim {claim_id}: {e}")
         
         print(f"\n✅ Deduplication complete!")
-        print(f"   Removed {len(claims_to_delete)} duplicate claims")
+        print(f"   Removed {deleted} duplicate claims")
 
 if __name__ == "__main__":
     import sys
@@ -10,12 +10,25 @@ Removes duplicate claims that have:
 Keeps the "best" version:
 - Prioritize claims with distilled_claim
 - If both/neither have distilled, keep the one with longer claim_text
+
+After an executed run the surviving claims are checkpointed to
+.dedupe_cache/{podcast_id}.json, so the next run only downloads claims
+updated since then (use --full to ignore the checkpoint).
 """
 
+import json
 from collections import defaultdict
-from typing import List, Dict, Any
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Any, Optional
 from supabase_client import get_db
 
+CHECKPOINT_DIR = Path(__file__).resolve().parent.parent / ".dedupe_cache"
+
+# Fields find_duplicates / select_best_claim read; all a cached survivor keeps
+CHECKPOINT_FIELDS = ('id', 'start_ms', 'claim_text', 'distilled_claim', 'distilled_word_count')
+
+@lru_cache(maxsize=8192)
 def normalize_text(text: str) -> str:
     """Normalize text for comparison."""
     if not text:
@@ -27,41 +40,35 @@ def find_duplicates(claims: List[Dict[str, Any]]) -> Dict[int, List[Dict[str, An
     Group duplicate claims together.
     Returns dict mapping to list of duplicate claims.
     """
-    # Group by time window (round to nearest 2 seconds)
-    time_groups = defaultdict(list)
-    
-    for claim in claims:
-        start_ms = claim.get('start_ms')
-        if start_ms is None or start_ms == 0:
-            continue
-        
-        # Round to nearest 2 second window
-        time_bucket = (int(start_ms) // 2000) * 2000
-        time_groups[time_bucket].append(claim)
+    # One pass, keyed by (2-second time bucket, normalized text)
+    groups = defaultdict(list)
+    group_for = groups.__getitem__
+    bucket_order = {}
+    first_seen = bucket_order.setdefault
     
-    # Within each time bucket, find text duplicates
-    duplicate_groups = {}
-    group_id = 0
+    # Claims without a timestamp (None or 0) are never grouped; drop them
+    # up front so the loop below needs no per-claim check
+    timed = [claim for claim in claims if claim.get('start_ms')]
     
-    for time_bucket, bucket_claims in time_groups.items():
-        if len(bucket_claims) <= 1:
-            continue
+    for claim in timed:
+        get = claim.get
         
-        # Group by similar text
-        text_groups = defaultdict(list)
-        for claim in bucket_claims:
-            # Get display text
-            text = claim.get('distilled_claim') or claim.get('claim_text', '')
-            normalized = normalize_text(text)
-            text_groups[normalized].append(claim)
+        # Round to nearest 2 second window
+        time_bucket = (int(get('start_ms')) // 2000) * 2000
+        first_seen(time_bucket, len(bucket_order))
         
-        # Only keep groups with actual duplicates
-        for normalized_text, group_claims in text_groups.items():
-            if len(group_claims) > 1:
-                duplicate_groups[group_id] = group_claims
-                group_id += 1
+        # Get display text
+        text = get('distilled_claim') or get('claim_text', '')
+        group_for((time_bucket, normalize_text(text))).append(claim)
     
-    return duplicate_groups
+    # Only keep groups with actual duplicates, numbered bucket by bucket (the
+    # sort is stable, so groups within a bucket keep first-seen order)
+    duplicates = [
+        group_claims
+        for key, group_claims in sorted(groups.items(), key=lambda item: bucket_order[item[0][0]])
+        if len(group_claims) > 1
+    ]
+    return dict(enumerate(duplicates))
 
 def select_best_claim(claims: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
@@ -71,7 +78,7 @@ def select_best_claim(claims: List[Dict[str, Any]]) -> Dict[str, Any]:
     2. Has longer claim_text
     3. First one (by ID)
     """
-    # Sort by quality
+    # Score by quality
     def quality_score(claim):
         score = 0
         if claim.get('distilled_claim'):
@@ -80,30 +87,102 @@ def select_best_claim(claims: List[Dict[str, Any]]) -> Dict[str, Any]:
         score += len(claim.get('claim_text', '')) // 10
         return score
     
-    sorted_claims = sorted(claims, key=quality_score, reverse=True)
-    return sorted_claims[0]
+    # max() keeps the first of equally scored claims, like the stable sort did
+    return max(claims, key=quality_score)
+
+def load_checkpoint(podcast_id: str) -> Optional[Dict[str, Any]]:
+    """Load the last run's survivors and max(updated_at), if any."""
+    path = CHECKPOINT_DIR / f"{podcast_id}.json"
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"   ⚠️  Ignoring unreadable checkpoint {path}: {e}")
+        return None
+    if not checkpoint.get('last_updated_at'):
+        return None
+    return checkpoint
+
+def save_checkpoint(podcast_id: str, claims: List[Dict[str, Any]], last_updated_at: Optional[str]):
+    """Persist the surviving claims so the next run can skip re-fetching them."""
+    if not last_updated_at:
+        return
+    CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+    path = CHECKPOINT_DIR / f"{podcast_id}.json"
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            'podcast_id': podcast_id,
+            'last_updated_at': last_updated_at,
+            'claims': [{field: c.get(field) for field in CHECKPOINT_FIELDS} for c in claims],
+        }, f)
+    tmp_path.replace(path)
 
-def main(podcast_id: str = 'lex_325', dry_run: bool = True):
+def max_updated_at(claims: List[Dict[str, Any]], since: Optional[str] = None) -> Optional[str]:
+    """Latest updated_at among claims (and the previous checkpoint)."""
+    # PostgREST returns one ISO format for the column, so strings sort by time
+    stamps = [c['updated_at'] for c in claims if c.get('updated_at')]
+    if since:
+        stamps.append(since)
+    return max(stamps) if stamps else None
+
+def fetch_claims(db, podcast_id: str, checkpoint: Optional[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Get the claims to deduplicate.
+
+    Without a checkpoint this is every active claim of the episode. With one,
+    only claims updated since the last run are downloaded and merged with the
+    cached survivors (dropping any deleted since); returns None when nothing
+    has changed.
+    """
+    if checkpoint is None:
+        return db.get_claims_for_episode(podcast_id)
+
+    last = checkpoint['last_updated_at']
+    changed = db.get_claims_updated_since(podcast_id, last)
+    cached = checkpoint.get('claims', [])
+    # The boundary claim(s) at exactly last_updated_at come back every time
+    cached_ids = {c['id'] for c in cached}
+    if all(c['id'] in cached_ids and c.get('updated_at') == last for c in changed):
+        return None
+
+    live_ids = {c['id'] for c in db.get_claims_for_episode(podcast_id, columns='id')}
+    merged = {c['id']: c for c in cached if c['id'] in live_ids}
+    merged.update((c['id'], c) for c in changed)
+    return sorted(merged.values(), key=lambda c: c.get('start_ms') or 0)
+
+def main(podcast_id: str = 'lex_325', dry_run: bool = True, full: bool = False):
     """
     Main deduplication function.
     
     Args:
         podcast_id: Episode to deduplicate
         dry_run: If True, only report duplicates without deleting
+        full: If True, ignore the checkpoint and re-fetch every claim
     """
     db = get_db(use_service_key=True)
     
     print(f"📊 Analyzing claims for {podcast_id}...")
     
-    # Get all claims
-    claims = db.get_claims_for_episode(podcast_id)
+    checkpoint = None if full else load_checkpoint(podcast_id)
+    if checkpoint is not None:
+        print(f"   Resuming from checkpoint (claims updated since {checkpoint['last_updated_at']})")
+    
+    claims = fetch_claims(db, podcast_id, checkpoint)
+    if claims is None:
+        print("✅ No claims changed since the last run - nothing to do")
+        return
     print(f"   Found {len(claims)} total claims")
+    last_updated_at = max_updated_at(claims, checkpoint and checkpoint['last_updated_at'])
     
     # Find duplicates
     duplicate_groups = find_duplicates(claims)
     
     if not duplicate_groups:
         print("✅ No duplicates found!")
+        save_checkpoint(podcast_id, claims, last_updated_at)
         return
     
     print(f"\n🔍 Found {len(duplicate_groups)} duplicate groups:")
@@ -150,29 +229,39 @@ def main(podcast_id: str = 'lex_325', dry_run: bool = True):
     else:
         print(f"\n🗑️  Deleting {total_duplicates} duplicate claims...")
         
-        # Delete in batches
-        batch_size = 50
+        # Delete in batches: one DELETE ... WHERE id IN (...) per batch
+        batch_size = 500
+        failed = set()
         for i in range(0, len(claims_to_delete), batch_size):
             batch = claims_to_delete[i:i+batch_size]
             
-            # Delete from database
-            for claim_id in batch:
-                try:
-                    db.client.table('claims').delete().eq('id', claim_id).execute()
-                except Exception as e:
-                    print(f"   ❌ Error deleting claim {claim_id}: {e}")
+            try:
+                db.client.table('claims').delete().in_('id', batch).execute()
+            except Exception as e:
+                print(f"   ⚠️  Batch delete failed ({e}); retrying {len(batch)} claims one by one")
+                for claim_id in batch:
+                    try:
+                        db.client.table('claims').delete().eq('id', claim_id).execute()
+                    except Exception as e:
+                        print(f"   ❌ Error deleting claim {claim_id}: {e}")
+                        failed.add(claim_id)
             
             print(f"   Deleted {min(i+batch_size, len(claims_to_delete))}/{len(claims_to_delete)} duplicates...")
         
         print(f"\n✅ Deduplication complete!")
         print(f"   Removed {total_duplicates} duplicate claims")
         print(f"   {len(claims) - total_duplicates} claims remaining")
+        
+        # Claims whose delete failed stay in the checkpoint for the next run
+        deleted = set(claims_to_delete) - failed
+        save_checkpoint(podcast_id, [c for c in claims if c['id'] not in deleted], last_updated_at)
 
 if __name__ == "__main__":
     import sys
     
     # Parse arguments
     dry_run = '--execute' not in sys.argv
+    full = '--full' in sys.argv
     podcast_id = 'lex_325'
     
     # Check for custom podcast_id
@@ -193,5 +282,5 @@ if __name__ == "__main__":
             sys.exit(0)
         print()
     
-    main(podcast_id=podcast_id, dry_run=dry_run)
+    main(podcast_id=podcast_id, dry_run=dry_run, full=full)
 
@@ -5,10 +5,28 @@ Delete specific claims by their distilled_claim or claim_text.
 
 from supabase_client import get_db
 
+def _quote(value: str) -> str:
+    """Quote a value for a PostgREST filter string (handles commas, dots, parens)."""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def _like_prefix(text: str) -> str:
+    """LIKE pattern matching values that start with `text` literally."""
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"{escaped}*"
+
+def claim_match_filter(texts: list[str]) -> str:
+    """PostgREST `or` filter: distilled_claim equals, or claim_text starts with, any text."""
+    exact = ','.join(_quote(text) for text in texts)
+    prefixes = ','.join(f"claim_text.like.{_quote(_like_prefix(text))}" for text in texts)
+    return f"distilled_claim.in.({exact}),{prefixes}"
+
 def delete_claims_by_text(texts_to_delete: list[str], podcast_id: str = 'lex_325', dry_run: bool = True):
     """
     Delete claims that match the given texts.
     
+    Matching happens in the database: only the matching rows are fetched for
+    the preview, and they are deleted by id in a single request.
+    
     Args:
         texts_to_delete: List of exact distilled_claim texts to delete
         podcast_id: Episode to search in
@@ -18,21 +36,27 @@ def delete_claims_by_text(texts_to_delete: list[str], podcast_id: str = 'lex_325
     
     print(f"🔍 Searching for claims to delete in {podcast_id}...")
     
-    # Get all claims
-    all_claims = db.get_claims_for_episode(podcast_id)
+    # Find matching claims (same scope as get_claims_for_episode: no duplicates)
+    response = (
+        db.client.table('claims')
+        .select('id,distilled_claim,claim_text,start_ms')
+        .eq('podcast_id', podcast_id)
+        .is_('duplicate_of', 'null')
+        .or_(claim_match_filter(texts_to_delete))
+        .order('start_ms')
+        .execute()
+    )
     
-    # Find matching claims
-    claims_to_delete = []
-    
-    for claim in all_claims:
-        distilled = claim.get('distilled_claim', '')
-        claim_text = claim.get('claim_text', '')
-        
-        # Check if this claim matches any of our delete targets
-        for target_text in texts_to_delete:
-            if distilled == target_text or claim_text.startswith(target_text):
-                claims_to_delete.append(claim)
-                break
+    # Re-check the rows against the original matching rules before anything is
+    # deleted, in case the filter string matched more than intended. One set
+    # lookup plus one tuple startswith per claim, no loop over the targets.
+    exact = frozenset(texts_to_delete)
+    prefixes = tuple(texts_to_delete)
+    claims_to_delete = [
+        claim for claim in response.data
+        if claim.get('distilled_claim') in exact
+        or (claim.get('claim_text') or '').startswith(prefixes)
+    ]
     
     if not claims_to_delete:
         print("❌ No matching claims found!")
@@ -59,13 +83,12 @@ def delete_claims_by_text(texts_to_delete: list[str], podcast_id: str = 'lex_325
     else:
         print(f"🗑️  Deleting {len(claims_to_delete)} claims...")
         
-        for claim in claims_to_delete:
-            claim_id = claim['id']
-            try:
-                db.client.table('claims').delete().eq('id', claim_id).execute()
-                print(f"   ✓ Deleted claim {claim_id}")
-            except Exception as e:
-                print(f"   ❌ Error deleting claim {claim_id}: {e}")
+        claim_ids = [claim['id'] for claim in claims_to_delete]
+        try:
+            db.client.table('claims').delete().in_('id', claim_ids).execute()
+        except Exception as e:
+            print(f"   ❌ Error deleting claims {claim_ids}: {e}")
+            return
         
         print(f"\n✅ Deleted {len(claims_to_delete)} claims!")
 
@@ -13,15 +13,27 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import importlib.util
 import json
 import logging
 from collections import Counter
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import quote
 
 import httpx
 
+try:
+    import ijson  # type: ignore[import]
+except ImportError:  # pragma: no cover - falls back to loading the whole file
+    ijson = None
+
+try:
+    import orjson  # type: ignore[import]
+except ImportError:  # pragma: no cover - stdlib json is the fallback codec
+    orjson = None
+
 # Adjust these paths to match your project structure
 ROOT_DIR = Path(__file__).resolve().parent
 DEFAULT_SCRAPE_FILE = ROOT_DIR / "data" / "scraped" / "levin_publications_raw.json"
@@ -29,54 +41,142 @@ DEFAULT_SCRAPE_FILE = ROOT_DIR / "data" / "scraped" / "levin_publications_raw.js
 API_BASE = "https://api.semanticscholar.org/graph/v1"
 HEADERS = {"Accept": "application/json"}
 FIELDS = "paperId,title,authors,year,openAccessPdf,externalIds"
+S2_BATCH_SIZE = 500  # /paper/batch accepts at most 500 ids per request
+S2_MAX_CONNECTIONS = 20
+PROGRESS_EVERY = 25  # entries between progress lines
 
 logger = logging.getLogger("corpus_diagnostics")
 
 
+class RequestLimiter:
+    """Start API requests at least ``interval`` seconds apart across all tasks."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    async def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+                now = self._next_at
+            self._next_at = now + self.interval
+
+
+class LookupCache:
+    """Memoize Semantic Scholar lookups by kind and normalized key.
+
+    Repeated DOIs/titles share one request (concurrent callers await the same
+    task). Only matches are remembered; a rate-limited lookup also returns
+    None, so a miss is retried if the same key comes up again.
+    """
+
+    def __init__(self):
+        self.saved: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def key(kind: str, value: str) -> str:
+        return f"{kind}:{value.strip().lower()}"
+
+    def remember(self, kind: str, value: str, paper: Optional[Dict[str, Any]]) -> None:
+        if paper is not None:
+            self.saved[self.key(kind, value)] = paper
+
+    async def get(
+        self,
+        kind: str,
+        value: str,
+        fetch: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    ) -> Optional[Dict[str, Any]]:
+        key = self.key(kind, value)
+        if key in self.saved:
+            return self.saved[key]
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(fetch())
+        paper = await task
+        self.remember(kind, value, paper)
+        return paper
+
+
 class DiagnosticResults:
+    __slots__ = ("counts", "_failed", "_no_pdf")
+
+    COUNT_KEYS = (
+        "total_entries",
+        "has_doi",
+        "has_title_only",
+        "doi_found",
+        "doi_not_found",
+        "title_found",
+        "title_not_found",
+        "has_pdf",
+        "no_pdf",
+    )
+
     def __init__(self):
-        self.total_entries = 0
-        self.has_doi = 0
-        self.has_title_only = 0
-        self.doi_found = 0
-        self.doi_not_found = 0
-        self.title_found = 0
-        self.title_not_found = 0
-        self.has_pdf = 0
-        self.no_pdf = 0
-        self.failed_entries: List[Dict[str, Any]] = []
-        self.no_pdf_entries: List[Dict[str, Any]] = []
+        # One Counter instead of nine attributes, so per-worker results can be
+        # merged with `+=` if diagnosis is ever split across processes.
+        self.counts: Counter[str] = Counter()
+        # Entries finish in completion order; keep each one's input position
+        # so the summary and report list them in scrape order.
+        self._failed: List[Tuple[int, Dict[str, Any]]] = []
+        self._no_pdf: List[Tuple[int, Dict[str, Any]]] = []
+
+    def add_failed(self, index: int, entry: Dict[str, Any]) -> None:
+        self._failed.append((index, entry))
+
+    def add_no_pdf(self, index: int, entry: Dict[str, Any]) -> None:
+        self._no_pdf.append((index, entry))
+
+    @staticmethod
+    def _in_input_order(pairs: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        return [entry for _, entry in sorted(pairs, key=lambda pair: pair[0])]
+
+    @property
+    def failed_entries(self) -> List[Dict[str, Any]]:
+        return self._in_input_order(self._failed)
+
+    @property
+    def no_pdf_entries(self) -> List[Dict[str, Any]]:
+        return self._in_input_order(self._no_pdf)
         
     def print_summary(self):
+        c = self.counts
         print("\n" + "="*80)
         print("CORPUS GAP DIAGNOSTIC SUMMARY")
         print("="*80)
         
         print(f"\n📊 SCRAPED DATA:")
-        print(f"  Total entries: {self.total_entries}")
-        print(f"  With DOI: {self.has_doi} ({self.has_doi/self.total_entries*100:.1f}%)")
-        print(f"  Title only: {self.has_title_only} ({self.has_title_only/self.total_entries*100:.1f}%)")
+        print(f"  Total entries: {c['total_entries']}")
+        print(f"  With DOI: {c['has_doi']} ({c['has_doi']/c['total_entries']*100:.1f}%)")
+        print(f"  Title only: {c['has_title_only']} ({c['has_title_only']/c['total_entries']*100:.1f}%)")
         
         print(f"\n🔍 SEMANTIC SCHOLAR LOOKUP:")
-        print(f"  DOI lookups successful: {self.doi_found}/{self.has_doi}")
-        print(f"  DOI lookups failed: {self.doi_not_found}/{self.has_doi}")
-        print(f"  Title searches successful: {self.title_found}/{self.has_title_only}")
-        print(f"  Title searches failed: {self.title_not_found}/{self.has_title_only}")
+        print(f"  DOI lookups successful: {c['doi_found']}/{c['has_doi']}")
+        print(f"  DOI lookups failed: {c['doi_not_found']}/{c['has_doi']}")
+        print(f"  Title searches successful: {c['title_found']}/{c['has_title_only']}")
+        print(f"  Title searches failed: {c['title_not_found']}/{c['has_title_only']}")
         
-        total_found = self.doi_found + self.title_found
-        total_not_found = self.doi_not_found + self.title_not_found
+        total_found = c['doi_found'] + c['title_found']
+        total_not_found = c['doi_not_found'] + c['title_not_found']
         
         print(f"\n📄 PDF AVAILABILITY:")
-        print(f"  Papers with open access PDF: {self.has_pdf}/{total_found}")
-        print(f"  Papers WITHOUT PDF: {self.no_pdf}/{total_found}")
+        print(f"  Papers with open access PDF: {c['has_pdf']}/{total_found}")
+        print(f"  Papers WITHOUT PDF: {c['no_pdf']}/{total_found}")
         
         print(f"\n🎯 SUCCESS RATE:")
-        print(f"  Total matched in Semantic Scholar: {total_found}/{self.total_entries} ({total_found/self.total_entries*100:.1f}%)")
-        print(f"  Total with downloadable PDFs: {self.has_pdf}/{self.total_entries} ({self.has_pdf/self.total_entries*100:.1f}%)")
+        print(f"  Total matched in Semantic Scholar: {total_found}/{c['total_entries']} ({total_found/c['total_entries']*100:.1f}%)")
+        print(f"  Total with downloadable PDFs: {c['has_pdf']}/{c['total_entries']} ({c['has_pdf']/c['total_entries']*100:.1f}%)")
         
         print(f"\n❌ FAILURES:")
         print(f"  Could not find in Semantic Scholar: {total_not_found}")
-        print(f"  Found but no PDF available: {self.no_pdf}")
+        print(f"  Found but no PDF available: {c['no_pdf']}")
         
         if self.failed_entries:
             print(f"\n📋 Sample failed lookups (first 5):")
@@ -94,20 +194,31 @@ class DiagnosticResults:
         print("\n" + "="*80)
 
 
-def load_scraped_entries(path: Path) -> List[Dict[str, Any]]:
-    with open(path, "r") as f:
-        payload = json.load(f)
-    return payload.get("publications", [])
+def iter_scraped_entries(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield scraped publications one at a time (streamed when ijson is installed)."""
+    if ijson is not None:
+        with open(path, "rb") as f:
+            yield from ijson.items(f, "publications.item", use_float=True)
+        return
+    data = path.read_bytes()
+    payload = orjson.loads(data) if orjson is not None else json.loads(data)
+    yield from payload.get("publications", [])
+
+
+def load_scraped_entries(path: Path, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Load scraped publications; with ``limit`` parsing stops after that many."""
+    return list(islice(iter_scraped_entries(path), limit))
 
 
 async def check_doi_lookup(
     client: httpx.AsyncClient,
     doi: str,
-    delay: float,
+    limiter: RequestLimiter,
 ) -> Optional[Dict[str, Any]]:
     """Check if a DOI resolves in Semantic Scholar."""
     encoded = quote(doi, safe="")
     try:
+        await limiter.wait()
         response = await client.get(
             f"{API_BASE}/paper/{encoded}",
             params={"fields": FIELDS},
@@ -117,23 +228,59 @@ async def check_doi_lookup(
         if response.status_code == 404:
             return None
         response.raise_for_status()
-        await asyncio.sleep(delay)
         return response.json()
     except httpx.HTTPStatusError as exc:
         if exc.response.status_code == 429:
             logger.warning("Rate limited, sleeping longer...")
-            await asyncio.sleep(delay * 10)
+            await asyncio.sleep(limiter.interval * 10)
             return None
         raise
 
 
+async def fetch_papers_by_dois(
+    client: httpx.AsyncClient,
+    dois: List[str],
+    limiter: RequestLimiter,
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Resolve DOIs through /paper/batch, S2_BATCH_SIZE ids per request.
+
+    Returns DOI -> metadata (None when Semantic Scholar has no match). DOIs
+    whose chunk failed are left out so they get a per-entry lookup instead.
+    """
+    resolved: Dict[str, Optional[Dict[str, Any]]] = {}
+    unique = list(dict.fromkeys(dois))
+    for offset in range(0, len(unique), S2_BATCH_SIZE):
+        chunk = unique[offset : offset + S2_BATCH_SIZE]
+        await limiter.wait()
+        try:
+            response = await client.post(
+                f"{API_BASE}/paper/batch",
+                params={"fields": FIELDS},
+                json={"ids": [f"DOI:{doi}" for doi in chunk]},
+                headers=HEADERS,
+                timeout=60.0,
+            )
+            response.raise_for_status()
+            results = response.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            logger.warning("Batch DOI lookup failed for %d DOIs: %s", len(chunk), exc)
+            continue
+        if not isinstance(results, list) or len(results) != len(chunk):
+            logger.warning("Unexpected /paper/batch response shape; using single lookups")
+            continue
+        for doi, paper in zip(chunk, results):
+            resolved[doi] = paper if isinstance(paper, dict) else None
+    return resolved
+
+
 async def check_title_search(
     client: httpx.AsyncClient,
     title: str,
-    delay: float,
+    limiter: RequestLimiter,
 ) -> Optional[Dict[str, Any]]:
     """Search for a paper by title in Semantic Scholar."""
     try:
+        await limiter.wait()
         response = await client.get(
             f"{API_BASE}/paper/search",
             params={"query": title, "limit": 1, "fields": FIELDS},
@@ -142,12 +289,11 @@ async def check_title_search(
         )
         response.raise_for_status()
         data = response.json().get("data", [])
-        await asyncio.sleep(delay)
         return data[0] if data else None
     except httpx.HTTPStatusError as exc:
         if exc.response.status_code == 429:
             logger.warning("Rate limited, sleeping longer...")
-            await asyncio.sleep(delay * 10)
+            await asyncio.sleep(limiter.interval * 10)
             return None
         raise
 
@@ -156,10 +302,21 @@ async def diagnose_entry(
     client: httpx.AsyncClient,
     entry: Dict[str, Any],
     results: DiagnosticResults,
-    delay: float,
+    limiter: RequestLimiter,
+    prefetched: Optional[Dict[str, Optional[Dict[str, Any]]]] = None,
+    cache: Optional[LookupCache] = None,
+    index: int = 0,
 ) -> None:
-    """Diagnose a single scraped entry."""
-    results.total_entries += 1
+    """Diagnose a single scraped entry.
+
+    ``prefetched`` holds batch-resolved DOIs; only DOIs missing from it are
+    looked up individually, through ``cache`` so duplicates are fetched once.
+    ``index`` is the entry's position in the input, used to order the
+    failed/no-PDF lists.
+    """
+    if cache is None:
+        cache = LookupCache()
+    results.counts["total_entries"] += 1
     
     title = entry.get("title")
     if not title:
@@ -173,44 +330,51 @@ async def diagnose_entry(
     
     # Try DOI lookup first
     if doi:
-        results.has_doi += 1
-        logger.info("Checking DOI: %s", doi)
-        paper_metadata = await check_doi_lookup(client, doi, delay)
+        results.counts["has_doi"] += 1
+        if prefetched is not None and doi in prefetched:
+            paper_metadata = prefetched[doi]
+        else:
+            logger.debug("Checking DOI: %s", doi)
+            paper_metadata = await cache.get(
+                "doi", doi, lambda: check_doi_lookup(client, doi, limiter)
+            )
         
         if paper_metadata:
-            results.doi_found += 1
+            results.counts["doi_found"] += 1
         else:
-            results.doi_not_found += 1
-            logger.warning("DOI not found: %s - %s", doi, title[:60])
+            results.counts["doi_not_found"] += 1
+            logger.debug("DOI not found: %s - %s", doi, title[:60])
     
     # Fall back to title search
     if not paper_metadata:
         if not doi:
-            results.has_title_only += 1
+            results.counts["has_title_only"] += 1
         
-        logger.info("Searching by title: %s", title[:60])
-        paper_metadata = await check_title_search(client, title, delay)
+        logger.debug("Searching by title: %s", title[:60])
+        paper_metadata = await cache.get(
+            "title", title, lambda: check_title_search(client, title, limiter)
+        )
         
         if paper_metadata:
-            results.title_found += 1
+            results.counts["title_found"] += 1
         else:
-            results.title_not_found += 1
-            results.failed_entries.append(entry)
-            logger.warning("Title search failed: %s", title[:60])
+            results.counts["title_not_found"] += 1
+            results.add_failed(index, entry)
+            logger.debug("Title search failed: %s", title[:60])
             return
     
     # Check for PDF availability
     open_access = paper_metadata.get("openAccessPdf")
     if open_access and open_access.get("url"):
-        results.has_pdf += 1
+        results.counts["has_pdf"] += 1
     else:
-        results.no_pdf += 1
-        results.no_pdf_entries.append({
+        results.counts["no_pdf"] += 1
+        results.add_no_pdf(index, {
             "title": title,
             "year": paper_metadata.get("year"),
             "paperId": paper_metadata.get("paperId"),
         })
-        logger.info("No PDF available: %s", title[:60])
+        logger.debug("No PDF available: %s", title[:60])
 
 
 async def main():
@@ -233,7 +397,13 @@ async def main():
         "--delay",
         type=float,
         default=1.0,
-        help="Delay between API calls (seconds)",
+        help="Minimum spacing between API calls across all workers (seconds)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=5,
+        help="Entries diagnosed at once (default: 5)",
     )
     parser.add_argument(
         "--save-report",
@@ -241,54 +411,105 @@ async def main():
         default=None,
         help="Save detailed report to JSON file",
     )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Log every lookup (debug logging)",
+    )
     
     args = parser.parse_args()
     
     logging.basicConfig(
-        level=logging.INFO,
+        level=logging.DEBUG if args.verbose else logging.INFO,
         format="%(asctime)s %(levelname)s %(message)s",
     )
+    if not args.verbose:
+        # httpx logs every request at INFO; that is per-lookup noise too
+        logging.getLogger("httpx").setLevel(logging.WARNING)
     
     if not args.input.exists():
         raise SystemExit(f"Scraped file not found: {args.input}")
     
-    entries = load_scraped_entries(args.input)
-    if args.limit:
-        entries = entries[:args.limit]
+    entries = load_scraped_entries(args.input, args.limit or None)
     
     logger.info("Loaded %d entries from %s", len(entries), args.input)
     
     results = DiagnosticResults()
     
-    async with httpx.AsyncClient() as client:
-        for idx, entry in enumerate(entries, 1):
-            logger.info("\n[%d/%d] Processing: %s", idx, len(entries), entry.get("title", "")[:60])
+    limiter = RequestLimiter(args.delay)
+    cache = LookupCache()
+    semaphore = asyncio.Semaphore(max(1, args.concurrency))
+    errors: List[str] = []
+    
+    async def guarded(
+        client: httpx.AsyncClient,
+        idx: int,
+        entry: Dict[str, Any],
+        prefetched: Dict[str, Optional[Dict[str, Any]]],
+    ) -> None:
+        async with semaphore:
+            logger.debug("[%d/%d] Processing: %s", idx, len(entries), entry.get("title", "")[:60])
             try:
-                await diagnose_entry(client, entry, results, args.delay)
-            except Exception:
-                logger.exception("Error processing entry")
+                await diagnose_entry(client, entry, results, limiter, prefetched, cache, idx)
+            except Exception as exc:
+                logger.debug("Error processing entry %d", idx, exc_info=True)
+                errors.append(f"{entry.get('title', '')[:60]}: {exc!r}")
+    
+    # One pooled client for the run; HTTP/2 multiplexes the concurrent
+    # lookups over a single connection when h2 is installed.
+    async with httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_connections=S2_MAX_CONNECTIONS,
+            max_keepalive_connections=S2_MAX_CONNECTIONS,
+        ),
+        timeout=30.0,
+    ) as client:
+        dois = [
+            entry.get("identifiers", {}).get("DOI") for entry in entries if entry.get("title")
+        ]
+        dois = [doi for doi in dois if doi]
+        prefetched = await fetch_papers_by_dois(client, dois, limiter) if dois else {}
+        logger.info(
+            "Resolved %d/%d DOIs via /paper/batch",
+            sum(1 for paper in prefetched.values() if paper),
+            len(set(dois)),
+        )
+        for doi, paper in prefetched.items():
+            cache.remember("doi", doi, paper)
+        # Per-entry detail is at DEBUG; report progress in batched lines
+        # instead of several log calls per lookup from every task.
+        tasks = [
+            guarded(client, idx, entry, prefetched)
+            for idx, entry in enumerate(entries, 1)
+        ]
+        for done, task in enumerate(asyncio.as_completed(tasks), 1):
+            await task
+            if done % PROGRESS_EVERY == 0 or done == len(tasks):
+                logger.info("Diagnosed %d/%d entries", done, len(tasks))
+    
+    if errors:
+        logger.warning(
+            "%d entries failed with errors (rerun with --verbose for tracebacks):\n  %s",
+            len(errors),
+            "\n  ".join(errors),
+        )
     
     results.print_summary()
     
     if args.save_report:
         report = {
-            "summary": {
-                "total_entries": results.total_entries,
-                "has_doi": results.has_doi,
-                "has_title_only": results.has_title_only,
-                "doi_found": results.doi_found,
-                "doi_not_found": results.doi_not_found,
-                "title_found": results.title_found,
-                "title_not_found": results.title_not_found,
-                "has_pdf": results.has_pdf,
-                "no_pdf": results.no_pdf,
-            },
+            "summary": {key: results.counts[key] for key in DiagnosticResults.COUNT_KEYS},
             "failed_entries": results.failed_entries,
             "no_pdf_entries": results.no_pdf_entries,
         }
         
-        with open(args.save_report, "w") as f:
-            json.dump(report, f, indent=2)
+        if orjson is not None:
+            args.save_report.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        else:
+            with open(args.save_report, "w") as f:
+                json.dump(report, f, indent=2)
         
         logger.info("Detailed report saved to %s", args.save_report)
 
@@ -9,10 +9,13 @@ This script:
 """
 
 import json
+import mmap
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional, Tuple
 
 # Load .env file for API keys
 REPO_ROOT = Path(__file__).resolve().parent.parent
@@ -29,12 +32,95 @@ sys.path.insert(0, str(REPO_ROOT))
 
 from scripts.claim_distiller import ClaimDistiller, create_distillation_input_from_claim
 
+try:
+    import ijson  # type: ignore[import]
+except ImportError:  # pragma: no cover - falls back to loading the whole file
+    ijson = None
+
+try:
+    import orjson  # type: ignore[import]
+except ImportError:  # pragma: no cover - stdlib json is the fallback codec
+    orjson = None
+
+# Gemini calls in flight at once; distillation is network-bound, so threads suffice
+DEFAULT_CONCURRENCY = 8
+
+# Write the enriched cache to disk after this many newly distilled claims
+CHECKPOINT_EVERY = 25
+
+# Claims whose distillation failed this many times are skipped unless --retry-failed
+MAX_DISTILL_ATTEMPTS = 3
+
+# Caches larger than this are parsed straight from a read-only memory map
+MMAP_THRESHOLD_BYTES = 100 * 1024 * 1024
+
+
+def load_cache(cache_path: Path) -> Dict[str, Any]:
+    """Load a claims cache, with orjson when available."""
+    if orjson is not None:
+        try:
+            if cache_path.stat().st_size > MMAP_THRESHOLD_BYTES:
+                with open(cache_path, "rb") as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                        memoryview(mapped) as view:
+                    return orjson.loads(view)
+            return orjson.loads(cache_path.read_bytes())
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN literals; let stdlib json have a go
+    return json.loads(cache_path.read_text())
+
+
+def iter_segments(cache_path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (segment_id, segment) pairs, streamed from disk when ijson is installed."""
+    if ijson is not None:
+        with open(cache_path, "rb") as f:
+            yield from ijson.kvitems(f, "segments", use_float=True)
+        return
+    yield from load_cache(cache_path).get("segments", {}).items()
+
+
+def claims_key_for(segment: Dict[str, Any]) -> Optional[str]:
+    """
+    Name of the claims list in a segment, or None if it has neither.
+    
+    Context card registries use "rag_results", timing caches use "claims";
+    a cache file uses one schema throughout.
+    """
+    if "rag_results" in segment:
+        return "rag_results"
+    if "claims" in segment:
+        return "claims"
+    return None
+
+
+def pick_claims_key(segments: Dict[str, Dict[str, Any]]) -> str:
+    """Detect the cache schema once from the first segment that has claims."""
+    for segment in segments.values():
+        key = claims_key_for(segment)
+        if key:
+            return key
+    return "claims"
+
+
+def write_cache(cache_data: Dict[str, Any], output: Path) -> None:
+    """Atomically write the cache (temp file + rename) so a crash never truncates it."""
+    tmp = output.with_suffix(output.suffix + ".tmp")
+    if orjson is not None:
+        tmp.write_bytes(orjson.dumps(cache_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        tmp.write_text(json.dumps(cache_data, indent=2, ensure_ascii=False))
+    os.replace(tmp, output)
+
 
 def enrich_claims_in_cache(
     cache_path: Path,
     papers_dir: Path,
     output_path: Optional[Path] = None,
     force_regenerate: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rpm: Optional[int] = None,
+    use_cache: bool = True,
+    retry_failed: bool = False,
 ) -> None:
     """
     Enrich all claims in a cache file with distilled summaries.
@@ -43,75 +129,108 @@ def enrich_claims_in_cache(
         cache_path: Path to claims cache JSON file
         papers_dir: Path to cleaned_papers directory
         output_path: Optional output path (defaults to overwriting cache_path)
-        force_regenerate: If True, regenerate even if distilled_claim already exists
+        force_regenerate: If True, regenerate even if distilled_claim already exists,
+            bypassing the on-disk response cache (new results are still cached)
+        concurrency: Number of distillation requests to run in parallel
+        rpm: Cap on Gemini requests per minute (shared by all workers)
+        use_cache: Reuse distillations from the on-disk response cache
+        retry_failed: Retry claims that already failed MAX_DISTILL_ATTEMPTS times
     """
     print(f"Loading claims from: {cache_path}")
-    cache_data = json.loads(cache_path.read_text())
+    cache_data = load_cache(cache_path)
     
     # Initialize distiller
     print("Initializing ClaimDistiller with Gemini...")
-    distiller = ClaimDistiller()
+    distiller = ClaimDistiller(rpm=rpm, use_cache=use_cache)
     
     # Process each segment
     segments = cache_data.get("segments", {})
-    total_claims = 0
+    claims_key = pick_claims_key(segments)
     processed_claims = 0
     skipped_claims = 0
     failed_claims = 0
     
-    # Count total claims
-    for segment_id, segment in segments.items():
-        # Try both "rag_results" (context_card_registry) and "claims" (timing cache)
-        claims = segment.get("rag_results", segment.get("claims", []))
-        total_claims += len(claims)
+    # One flat walk over every segment's claims (the dicts are updated in place)
+    all_claims = list(chain.from_iterable(
+        segment.get(claims_key, ()) for segment in segments.values()
+    ))
+    total_claims = len(all_claims)
     
     print(f"\nFound {total_claims} claims across {len(segments)} segments")
     print("=" * 80)
     
-    # Process each claim
-    current_claim = 0
-    for segment_id, segment in segments.items():
-        # Try both "rag_results" (context_card_registry) and "claims" (timing cache)
-        claims = segment.get("rag_results", segment.get("claims", []))
+    output = output_path or cache_path
+    processed_since_checkpoint = 0
+    
+    # Collect the claims that need distilling
+    tasks = []
+    for current_claim, claim in enumerate(all_claims, 1):
+        # Skip if already has distilled_claim and not forcing regeneration
+        if not force_regenerate and "distilled_claim" in claim:
+            skipped_claims += 1
+            continue
         
-        for claim in claims:
-            current_claim += 1
-            
-            # Skip if already has distilled_claim and not forcing regeneration
-            if not force_regenerate and "distilled_claim" in claim:
-                skipped_claims += 1
-                continue
-            
-            # Create distillation input
-            distill_input = create_distillation_input_from_claim(claim, papers_dir)
-            
-            if not distill_input:
-                print(f"[{current_claim}/{total_claims}] ⊘ Missing required fields")
-                failed_claims += 1
-                continue
-            
-            # Generate distilled claim
-            print(f"\n[{current_claim}/{total_claims}] Processing claim...")
-            print(f"  Original: {claim.get('claim_text', '')[:80]}...")
-            
-            result = distiller.distill(distill_input)
-            
-            if result.success:
-                claim["distilled_claim"] = result.distilled_claim
-                claim["distilled_word_count"] = result.word_count
-                processed_claims += 1
-                print(f"  ✓ Distilled: {result.distilled_claim}")
-                print(f"    ({result.word_count} words)")
-            else:
-                failed_claims += 1
-                print(f"  ✗ Failed: {result.error}")
+        # Skip claims that keep failing (recorded by earlier runs)
+        attempts = claim.get("distilled_error", {}).get("attempts", 0)
+        if attempts >= MAX_DISTILL_ATTEMPTS and not retry_failed:
+            skipped_claims += 1
+            continue
+        
+        # Create distillation input
+        distill_input = create_distillation_input_from_claim(claim, papers_dir)
+        
+        if not distill_input:
+            print(f"[{current_claim}/{total_claims}] ⊘ Missing required fields")
+            failed_claims += 1
+            continue
+        
+        tasks.append((current_claim, claim, distill_input))
     
-    # Save enriched cache
-    output = output_path or cache_path
-    print("\n" + "=" * 80)
-    print(f"Saving enriched cache to: {output}")
+    # Generate distilled claims concurrently; results are applied here, on
+    # the main thread, as each request finishes, and the cache is
+    # checkpointed periodically and on interruption
+    print(f"\nDistilling {len(tasks)} claims ({concurrency} at a time)...")
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {
+            executor.submit(distiller.distill, distill_input, force_regenerate): (current_claim, claim)
+            for current_claim, claim, distill_input in tasks
+        }
+        try:
+            for future in as_completed(futures):
+                current_claim, claim = futures[future]
+                result = future.result()
+                
+                print(f"\n[{current_claim}/{total_claims}] Processed claim")
+                print(f"  Original: {claim.get('claim_text', '')[:80]}...")
+                
+                if result.success:
+                    claim["distilled_claim"] = result.distilled_claim
+                    claim["distilled_word_count"] = result.word_count
+                    claim.pop("distilled_error", None)
+                    processed_claims += 1
+                    processed_since_checkpoint += 1
+                    print(f"  ✓ Distilled: {result.distilled_claim}")
+                    print(f"    ({result.word_count} words)")
+                    
+                    if processed_since_checkpoint >= CHECKPOINT_EVERY:
+                        write_cache(cache_data, output)
+                        processed_since_checkpoint = 0
+                else:
+                    failed_claims += 1
+                    attempts = claim.get("distilled_error", {}).get("attempts", 0)
+                    claim["distilled_error"] = {
+                        "msg": (result.error or "").split("\n", 1)[0],
+                        "attempts": attempts + 1,
+                    }
+                    print(f"  ✗ Failed: {result.error}")
+        finally:
+            # On interruption, don't start the requests still queued
+            for future in futures:
+                future.cancel()
+            write_cache(cache_data, output)
     
-    output.write_text(json.dumps(cache_data, indent=2, ensure_ascii=False))
+    print("\n" + "=" * 80)
+    print(f"Saved enriched cache to: {output}")
     
     # Summary
     print("\n" + "=" * 80)
@@ -129,26 +248,27 @@ def preview_distillations(
     cache_path: Path,
     papers_dir: Path,
     num_samples: int = 5,
+    use_cache: bool = True,
 ) -> None:
     """
     Preview distillations for a few claims without saving.
     
     Useful for testing the prompt and seeing examples.
     """
-    print(f"Loading claims from: {cache_path}")
-    cache_data = json.loads(cache_path.read_text())
-    
     # Initialize distiller
     print("Initializing ClaimDistiller with Gemini...")
-    distiller = ClaimDistiller()
+    distiller = ClaimDistiller(use_cache=use_cache)
     
-    # Collect sample claims
-    segments = cache_data.get("segments", {})
+    # Collect sample claims, reading only as much of the cache as needed
+    print(f"Loading claims from: {cache_path}")
     sample_claims = []
+    claims_key = None
     
-    for segment_id, segment in segments.items():
-        # Try both "rag_results" (context_card_registry) and "claims" (timing cache)
-        claims = segment.get("rag_results", segment.get("claims", []))
+    for segment_id, segment in iter_segments(cache_path):
+        # Segments are streamed, so detect the schema on the first one with claims
+        if claims_key is None:
+            claims_key = claims_key_for(segment)
+        claims = segment.get(claims_key, ()) if claims_key else ()
         for claim in claims:
             if len(sample_claims) >= num_samples:
                 break
@@ -216,7 +336,29 @@ def main():
     parser.add_argument(
         "--force",
         action="store_true",
-        help="Regenerate distilled claims even if they already exist",
+        help="Regenerate distilled claims even if they already exist (bypasses the response cache)",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help=f"Retry claims whose distillation already failed {MAX_DISTILL_ATTEMPTS} times",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Distillation requests to run in parallel (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--rpm",
+        type=int,
+        default=None,
+        help="Pace Gemini requests to at most this many per minute (default: unthrottled)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call Gemini instead of reusing cached distillations",
     )
     parser.add_argument(
         "--preview",
@@ -243,13 +385,22 @@ def main():
     
     # Preview mode or full enrichment
     if args.preview:
-        preview_distillations(cache_path, papers_dir, num_samples=args.preview)
+        preview_distillations(
+            cache_path,
+            papers_dir,
+            num_samples=args.preview,
+            use_cache=not args.no_cache,
+        )
     else:
         enrich_claims_in_cache(
             cache_path,
             papers_dir,
             output_path,
             force_regenerate=args.force,
+            concurrency=args.concurrency,
+            rpm=args.rpm,
+            use_cache=not args.no_cache,
+            retry_failed=args.retry_failed,
         )
 
 
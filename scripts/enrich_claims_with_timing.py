@@ -10,89 +10,201 @@ This script:
 """
 
 import json
+import mmap
+import os
 import re
+from collections import defaultdict
+from itertools import accumulate
 from pathlib import Path
-from typing import List, Dict, Any, Tuple, Optional
+from typing import Callable, List, Dict, Any, NamedTuple, Tuple, Optional, Union
 from difflib import SequenceMatcher
+from multiprocessing import Pool
+
+try:
+    from rapidfuzz import fuzz  # type: ignore[import]
+except ImportError:  # pragma: no cover - difflib bounds prune windows instead
+    fuzz = None
+
+try:
+    import orjson  # type: ignore[import]
+except ImportError:  # pragma: no cover - stdlib json is the fallback codec
+    orjson = None
+
+# Files larger than this are parsed straight from a read-only memory map
+MMAP_THRESHOLD_BYTES = 100 * 1024 * 1024
 
 
 def load_json(filepath: Path) -> Any:
     """Load JSON file."""
+    if orjson is not None:
+        try:
+            if filepath.stat().st_size > MMAP_THRESHOLD_BYTES:
+                with open(filepath, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                        memoryview(mapped) as view:
+                    return orjson.loads(view)
+            return orjson.loads(filepath.read_bytes())
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN literals; let stdlib json have a go
     with open(filepath, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
 def save_json(data: Any, filepath: Path):
     """Save JSON file."""
+    if orjson is not None:
+        filepath.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_WS_RE = re.compile(r'\s+')
+
+# ASCII characters _PUNCT_RE would replace, as a str.translate table
+_PUNCT_TABLE = str.maketrans({c: ' ' for c in map(chr, range(128)) if _PUNCT_RE.match(c)})
+
+
 def normalize_text(text: str) -> str:
     """Normalize text for matching (lowercase, remove punctuation)."""
+    text = text.lower()
+    if text.isascii():
+        # Fast path: one C-level pass instead of two regex substitutions
+        return ' '.join(text.translate(_PUNCT_TABLE).split())
     # Remove punctuation and extra whitespace
-    text = re.sub(r'[^\w\s]', ' ', text.lower())
-    text = re.sub(r'\s+', ' ', text)
+    text = _PUNCT_RE.sub(' ', text)
+    text = _WS_RE.sub(' ', text)
     return text.strip()
 
 
-def timestamp_to_ms(timestamp: str) -> int:
-    """Convert timestamp string (HH:MM:SS.mmm) to milliseconds."""
-    try:
-        # Remove any prefix like "lex_325|"
-        if '|' in timestamp:
-            timestamp = timestamp.split('|')[1]
-        
-        # Parse HH:MM:SS.mmm
-        parts = timestamp.split(':')
-        hours = int(parts[0])
-        minutes = int(parts[1])
-        seconds_parts = parts[2].split('.')
-        seconds = int(seconds_parts[0])
-        milliseconds = int(seconds_parts[1]) if len(seconds_parts) > 1 else 0
-        
-        total_ms = (hours * 3600 + minutes * 60 + seconds) * 1000 + milliseconds
-        return total_ms
-    except:
-        return 0
+def make_ratio_scorer(fixed: str) -> Callable[[str, float], float]:
+    """Return score(other, score_cutoff) giving SequenceMatcher(None, fixed, other).ratio().
+    
+    Scores at or below score_cutoff may come back as 0.0, so hopeless
+    windows are rejected before the expensive difflib alignment runs.
+    
+    rapidfuzz's Indel ratio is 2*LCS/T, while difflib's ratio counts the
+    Ratcliff-Obershelp matching blocks, which form a common subsequence; so
+    the rapidfuzz score is an upper bound on the difflib one, not the same
+    number. When rapidfuzz is installed its bit-parallel LCS does the
+    rejecting; otherwise difflib's quick_ratio bounds do, from one
+    SequenceMatcher that keeps fixed as its indexed side. Windows that
+    survive are always scored by difflib, so matches and match_confidence
+    do not depend on whether rapidfuzz is installed.
+    """
+    bounds = SequenceMatcher(None, autojunk=False)
+    bounds.set_seq2(fixed)
+    
+    def score(other: str, score_cutoff: float = 0.0) -> float:
+        if score_cutoff >= 1.0:
+            return 0.0
+        if fuzz is not None:
+            # The small slack keeps float rounding from rejecting a window
+            # whose difflib score is just above the cutoff
+            if not fuzz.ratio(fixed, other, score_cutoff=max(0.0, score_cutoff * 100 - 1e-6)):
+                return 0.0
+        else:
+            bounds.set_seq1(other)
+            if bounds.real_quick_ratio() <= score_cutoff or bounds.quick_ratio() <= score_cutoff:
+                return 0.0
+        return SequenceMatcher(None, fixed, other).ratio()
+    return score
+
+
+class TranscriptColumns(NamedTuple):
+    """Transcript words as parallel columns (structure of arrays).
+    
+    normalized holds normalize_text() of each word, which is all the
+    matching loops read; the other columns are only sliced for output.
+    """
+    texts: List[str]
+    starts: List[Any]
+    ends: List[Any]
+    confidences: List[Any]
+    speakers: List[Any]
+    normalized: List[str]
+
+
+def transcript_columns(
+    transcript_words: List[Dict],
+    normalized_tokens: Optional[List[str]] = None
+) -> TranscriptColumns:
+    """Split transcript word dicts into columns, normalizing unless given the tokens."""
+    texts = [w['text'] for w in transcript_words]
+    return TranscriptColumns(
+        texts,
+        [w['start'] for w in transcript_words],
+        [w['end'] for w in transcript_words],
+        [w.get('confidence', 1.0) for w in transcript_words],
+        [w.get('speaker', '') for w in transcript_words],
+        normalized_tokens if normalized_tokens is not None else [normalize_text(t) for t in texts],
+    )
+
+
+def build_ngram_index(
+    normalized_tokens: List[str],
+    n: int = 3
+) -> Dict[Tuple[str, ...], List[int]]:
+    """
+    Map each word n-gram of the transcript to the (sorted) token indices where it starts.
+    
+    Tokens that normalize to several words ("don't" -> "don t") are split so
+    n-grams line up with normalize_text(segment_text).split().
+    """
+    words = []
+    positions = []
+    for i, token in enumerate(normalized_tokens):
+        for word in token.split():
+            words.append(word)
+            positions.append(i)
+    
+    index = defaultdict(list)
+    for k in range(len(words) - n + 1):
+        index[tuple(words[k:k + n])].append(positions[k])
+    return index
+
+
+# HH:MM:SS with optional .mmm
+_TS_RE = re.compile(r'(\d+):(\d+):(\d+)(?:\.(\d+))?')
 
 
 def timestamp_to_ms(timestamp: str) -> int:
-    """Convert timestamp string (HH:MM:SS.mmm) to milliseconds."""
-    try:
-        # Remove any 'lex_325|' prefix if present
-        if '|' in timestamp:
-            timestamp = timestamp.split('|')[1] if len(timestamp.split('|')) > 1 else timestamp
-        
-        # Parse HH:MM:SS.mmm format
-        parts = timestamp.split(':')
-        if len(parts) == 3:
-            hours = int(parts[0])
-            minutes = int(parts[1])
-            seconds_parts = parts[2].split('.')
-            seconds = int(seconds_parts[0])
-            milliseconds = int(seconds_parts[1]) if len(seconds_parts) > 1 else 0
-            
-            total_ms = (hours * 3600 + minutes * 60 + seconds) * 1000 + milliseconds
-            return total_ms
-    except:
-        pass
+    """Convert timestamp string (HH:MM:SS.mmm) to milliseconds (0 if unparseable).
     
-    return 0
+    Segment keys such as "lex_325|00:01:02.160|1" are accepted: the time is
+    the field after the first '|'.
+    """
+    if not timestamp:
+        return 0
+    if '|' in timestamp:
+        timestamp = timestamp.split('|', 2)[1]
+    match = _TS_RE.fullmatch(timestamp.strip())
+    if not match:
+        return 0
+    hours, minutes, seconds, milliseconds = match.groups(default='0')
+    return (int(hours) * 3600 + int(minutes) * 60 + int(seconds)) * 1000 + int(milliseconds)
+
+
+# Once a window scores above this, only the next few start positions are
+# checked (a near-perfect hit is at most a few words off the best alignment)
+NEAR_PERFECT_RATIO = 0.95
 
 
 def find_word_sequence_in_transcript(
     claim_words: List[str],
-    transcript_words: List[Dict],
+    normalized_tokens: List[str],
     min_match_ratio: float = 0.6  # Lowered from 0.7
 ) -> Optional[Tuple[int, int, float]]:
     """
     Find a sequence of words in the transcript using sliding window + fuzzy matching.
     
+    normalized_tokens holds normalize_text() of each transcript word.
+    
     Returns: (start_index, end_index, match_score) or None
     """
     claim_len = len(claim_words)
-    transcript_len = len(transcript_words)
+    transcript_len = len(normalized_tokens)
     
     if claim_len == 0 or transcript_len == 0:
         return None
@@ -110,27 +222,43 @@ def find_word_sequence_in_transcript(
         int(claim_len * 0.7),  # 30% smaller (for summaries)
     ]
     
+    # Also try matching just the beginning of the claim (first 20 words)
+    claim_prefix = ' '.join(claim_words[:20]) if claim_len > 20 else None
+    
+    claim_score = make_ratio_scorer(claim_text)
+    prefix_score = make_ratio_scorer(claim_prefix) if claim_prefix else None
+    
+    # Join the tokens once; a window is then a slice of this string.
+    # char_offsets[j] is where token j starts (one past a trailing space for j == len)
+    joined = ' '.join(normalized_tokens)
+    char_offsets = [0, *accumulate(len(token) + 1 for token in normalized_tokens)]
+    
     # Slide window through transcript
+    stop_after = None
     for i in range(transcript_len - min(claim_len, 5) + 1):
+        if stop_after is not None and i > stop_after:
+            break
         for window_size in window_sizes:
             end_idx = min(i + window_size, transcript_len)
-            window_words = [normalize_text(transcript_words[j]['text']) 
-                           for j in range(i, end_idx)]
-            window_text = ' '.join(window_words)
+            if end_idx <= i:
+                continue  # empty window (one-word claim at 0.7x) can't score
+            window_text = joined[char_offsets[i]:char_offsets[end_idx] - 1]
             
-            # Use SequenceMatcher for fuzzy matching
-            ratio = SequenceMatcher(None, claim_text, window_text).ratio()
+            # Fuzzy match; only scores above the current best matter
+            ratio = claim_score(window_text, best_score)
             
-            # Also try matching just the beginning of the claim (first 20 words)
-            if len(claim_words) > 20:
-                claim_prefix = ' '.join(claim_words[:20])
-                prefix_ratio = SequenceMatcher(None, claim_prefix, window_text[:len(claim_prefix)*2]).ratio()
+            if prefix_score:
+                prefix_ratio = prefix_score(window_text[:len(claim_prefix)*2], best_score / 0.9)
                 # Use the better score
                 ratio = max(ratio, prefix_ratio * 0.9)  # Slight penalty for prefix-only match
             
             if ratio > best_score:
                 best_score = ratio
                 best_match = (i, end_idx, ratio)
+                if ratio >= 1.0:
+                    return best_match
+                if ratio > NEAR_PERFECT_RATIO and stop_after is None:
+                    stop_after = i + max(1, claim_len // 10)
     
     if best_match and best_match[2] >= min_match_ratio:
         return best_match
@@ -140,12 +268,19 @@ def find_word_sequence_in_transcript(
 
 def enrich_claim_with_timing(
     claim: Dict[str, Any],
-    transcript_words: List[Dict],
+    transcript_words: Union[List[Dict], TranscriptColumns],
     segment_timestamp: str,
-    segment_text: str = ""
+    segment_text: str = "",
+    normalized_tokens: Optional[List[str]] = None,
+    ngram_index: Optional[Dict[Tuple[str, ...], List[int]]] = None
 ) -> Dict[str, Any]:
     """
     Enrich a single claim with word-level timing.
+    
+    When enriching many claims against the same transcript, pass it as
+    TranscriptColumns (or pass normalized_tokens, normalize_text of each
+    word) and ngram_index (build_ngram_index of those tokens) so they are
+    computed once.
     """
     # Handle malformed claims (strings instead of dicts)
     if not isinstance(claim, dict):
@@ -160,28 +295,37 @@ def enrich_claim_with_timing(
     normalized_claim = normalize_text(claim_text)
     claim_words = normalized_claim.split()
     
+    if isinstance(transcript_words, TranscriptColumns):
+        columns = transcript_words
+    else:
+        columns = transcript_columns(transcript_words, normalized_tokens)
+    normalized_tokens = columns.normalized
+    
     # Optional: narrow search to segment region if we have segment text
-    search_words = transcript_words
+    search_tokens = normalized_tokens
     search_offset = 0
     
     if segment_text:
-        # Try to find rough segment location
+        if ngram_index is None:
+            ngram_index = build_ngram_index(normalized_tokens)
+        
+        # Try to find rough segment location from the first segment 3-gram
+        # that occurs in the transcript
         segment_normalized = normalize_text(segment_text[:200])  # First 200 chars
         segment_start_words = segment_normalized.split()[:20]
         
-        # Find where this segment starts in transcript
-        for i in range(len(transcript_words) - 20):
-            window = [normalize_text(transcript_words[j]['text']) 
-                     for j in range(i, min(i + 20, len(transcript_words)))]
-            if any(w in ' '.join(window) for w in segment_start_words[:5]):
+        for k in range(len(segment_start_words) - 2):
+            positions = ngram_index.get(tuple(segment_start_words[k:k + 3]))
+            if positions:
+                i = max(0, positions[0] - k)
                 # Search in a window around this location (±1000 words)
                 search_offset = max(0, i - 100)
-                end = min(len(transcript_words), i + 1000)
-                search_words = transcript_words[search_offset:end]
+                end = min(len(normalized_tokens), i + 1000)
+                search_tokens = normalized_tokens[search_offset:end]
                 break
     
     # Find matching sequence in transcript
-    match = find_word_sequence_in_transcript(claim_words, search_words)
+    match = find_word_sequence_in_transcript(claim_words, search_tokens)
     
     if match:
         start_idx, end_idx, score = match
@@ -191,24 +335,29 @@ def enrich_claim_with_timing(
         actual_end = end_idx + search_offset
         
         # Extract matched words with timing
-        matched_words = transcript_words[actual_start:actual_end]
+        span = slice(actual_start, actual_end)
+        texts = columns.texts[span]
+        starts = columns.starts[span]
+        ends = columns.ends[span]
         
         # Add timing information to claim
         enriched_claim = claim.copy()
         enriched_claim['timing'] = {
-            'start_ms': matched_words[0]['start'] if matched_words else 0,
-            'end_ms': matched_words[-1]['end'] if matched_words else 0,
+            'start_ms': starts[0] if texts else 0,
+            'end_ms': ends[-1] if texts else 0,
             'match_confidence': round(score, 3),
-            'word_count': len(matched_words),
+            'word_count': len(texts),
             'words': [
                 {
-                    'text': w['text'],
-                    'start_ms': w['start'],
-                    'end_ms': w['end'],
-                    'confidence': w.get('confidence', 1.0),
-                    'speaker': w.get('speaker', '')
+                    'text': text,
+                    'start_ms': start,
+                    'end_ms': end,
+                    'confidence': confidence,
+                    'speaker': speaker
                 }
-                for w in matched_words
+                for text, start, end, confidence, speaker in zip(
+                    texts, starts, ends, columns.confidences[span], columns.speakers[span]
+                )
             ]
         }
         
@@ -232,13 +381,51 @@ def enrich_claim_with_timing(
         return fallback_claim
 
 
+# Read-only transcript data for _enrich_job, set once per worker process
+_WORKER_TRANSCRIPT: Dict[str, Any] = {}
+
+
+def _init_worker(
+    columns: TranscriptColumns,
+    ngram_index: Dict[Tuple[str, ...], List[int]]
+):
+    """Pool initializer: stash the transcript so jobs only carry the claim."""
+    _WORKER_TRANSCRIPT['columns'] = columns
+    _WORKER_TRANSCRIPT['ngram_index'] = ngram_index
+
+
+def _enrich_job(job: Tuple[int, Any, str, str]) -> Tuple[int, Dict[str, Any]]:
+    """Enrich one (index, claim, segment_timestamp, segment_text) job; never raises.
+    
+    Returns (index, enriched_claim) so results can arrive in any order.
+    """
+    index, claim, segment_timestamp, segment_text = job
+    try:
+        return index, enrich_claim_with_timing(
+            claim,
+            _WORKER_TRANSCRIPT['columns'],
+            segment_timestamp,
+            segment_text,
+            ngram_index=_WORKER_TRANSCRIPT['ngram_index']
+        )
+    except Exception as e:
+        print(f"⚠ Error processing claim: {e}")
+        print(f"  Claim data: {str(claim)[:100]}")
+        # Add the claim anyway with error flag
+        return index, claim if isinstance(claim, dict) else {'error': str(e)}
+
+
 def enrich_claims_with_timing(
     claims_path: Path,
     transcript_path: Path,
-    output_path: Path
+    output_path: Path,
+    workers: Optional[int] = None
 ):
     """
     Main function to enrich all claims with timing data.
+    
+    Claims are matched in parallel across `workers` processes (default: one
+    per CPU); workers=1 runs everything in this process.
     """
     print(f"Loading claims from: {claims_path}")
     claims_data = load_json(claims_path)
@@ -249,6 +436,10 @@ def enrich_claims_with_timing(
     
     print(f"\nFound {len(transcript_words)} words in transcript")
     
+    # Split and normalize the transcript once; every claim is matched against it
+    columns = transcript_columns(transcript_words)
+    ngram_index = build_ngram_index(columns.normalized)
+    
     # Process each segment
     segments = claims_data.get('segments', {})
     total_claims = 0
@@ -257,6 +448,7 @@ def enrich_claims_with_timing(
     
     print(f"\nProcessing {len(segments)} segments...\n")
     
+    jobs = []
     for segment_id, segment in segments.items():
         segment_claims = segment.get('claims', [])
         total_claims += len(segment_claims)
@@ -265,32 +457,36 @@ def enrich_claims_with_timing(
         print(f"Timestamp: {segment.get('timestamp')}")
         print(f"Claims: {len(segment_claims)}")
         
-        # Enrich each claim
-        enriched_claims = []
+        segment_timestamp = segment.get('timestamp', '')
         segment_text = segment.get('transcript_text', '')
         for claim in segment_claims:
-            try:
-                enriched = enrich_claim_with_timing(
-                    claim, 
-                    transcript_words,
-                    segment.get('timestamp', ''),
-                    segment_text
-                )
-                enriched_claims.append(enriched)
-                
-                if 'timing' in enriched:
-                    if enriched['timing'].get('fallback', False):
-                        fallback_matches += 1
-                    else:
-                        exact_matches += 1
-            except Exception as e:
-                print(f"⚠ Error processing claim: {e}")
-                print(f"  Claim data: {str(claim)[:100]}")
-                # Add the claim anyway with error flag
-                enriched_claims.append(claim if isinstance(claim, dict) else {'error': str(e)})
-        
-        # Update segment with enriched claims
-        segment['claims'] = enriched_claims
+            jobs.append((len(jobs), claim, segment_timestamp, segment_text))
+    
+    # Enrich every claim; claims are independent given the read-only transcript
+    workers = workers or os.cpu_count() or 1
+    transcript = (columns, ngram_index)
+    results = [None] * len(jobs)
+    if workers > 1 and len(jobs) > 1:
+        with Pool(min(workers, len(jobs)), initializer=_init_worker, initargs=transcript) as pool:
+            # Unordered, so a slow claim doesn't hold up collecting the rest
+            for index, enriched in pool.imap_unordered(_enrich_job, jobs, chunksize=16):
+                results[index] = enriched
+    else:
+        _init_worker(*transcript)
+        for index, enriched in map(_enrich_job, jobs):
+            results[index] = enriched
+    
+    # Update segments with enriched claims (results are indexed in job order)
+    results_iter = iter(results)
+    for segment in segments.values():
+        segment['claims'] = [next(results_iter) for _ in segment.get('claims', [])]
+    
+    for enriched in results:
+        if 'timing' in enriched:
+            if enriched['timing'].get('fallback', False):
+                fallback_matches += 1
+            else:
+                exact_matches += 1
     
     # Save enriched data
     print(f"\n{'='*60}")
@@ -17,6 +17,45 @@ sys.path.insert(0, str(Path(__file__).parent))
 from supabase_client import get_db
 from claim_distiller import ClaimDistiller, DistillationInput
 
+# Distillations are written to Supabase in batches of this size
+WRITE_BATCH_SIZE = 100
+
+
+def save_distilled_claims(db, rows: list) -> list:
+    """
+    Write a batch of distillations, one row at a time if the bulk RPC fails.
+    
+    Args:
+        db: NoeronDB instance
+        rows: Dicts with id, distilled_claim and distilled_word_count
+        
+    Returns:
+        Ids of the rows that could not be saved
+    """
+    if not rows:
+        return []
+    failed_ids = []
+    try:
+        db.add_distilled_claims_batch(rows)
+    except Exception as e:
+        print(f"  ⚠️  Bulk update failed ({str(e)[:100]}), saving one by one")
+        for row in rows:
+            try:
+                db.add_distilled_claim(row["id"], row["distilled_claim"], row["distilled_word_count"])
+            except Exception as row_error:
+                print(f"    ✗ Could not save claim {row['id']}: {str(row_error)[:100]}")
+                failed_ids.append(row["id"])
+    print(f"    ✓ Saved {len(rows) - len(failed_ids)} claims to database")
+    return failed_ids
+
+
+def flush_distilled_claims(db, pending: list, unsaved_ids: list) -> None:
+    """Save and empty ``pending``, adding the ids that could not be written to ``unsaved_ids``."""
+    try:
+        unsaved_ids.extend(save_distilled_claims(db, pending))
+    finally:
+        pending.clear()
+
 
 def create_distillation_input_from_db_claim(claim: dict) -> Optional[DistillationInput]:
     """
@@ -56,7 +95,9 @@ def enrich_claims_for_episode(
     podcast_id: Optional[str] = None,
     limit: int = 100,
     dry_run: bool = False,
-    resume: bool = True
+    resume: bool = True,
+    rpm: Optional[int] = None,
+    use_cache: bool = True,
 ) -> dict:
     """
     Enrich claims with distilled summaries.
@@ -65,12 +106,14 @@ def enrich_claims_for_episode(
         podcast_id: If provided, only process claims from this episode
         limit: Maximum number of claims to process
         dry_run: If True, generate distillations but don't save to database
+        rpm: Cap on Gemini requests per minute
+        use_cache: Reuse distillations from the on-disk response cache
         
     Returns:
         Statistics about the enrichment process
     """
     db = get_db(use_service_key=True)
-    distiller = ClaimDistiller()
+    distiller = ClaimDistiller(rpm=rpm, use_cache=use_cache)
     
     # Get claims that need distillation
     print(f"Fetching claims that need distillation (limit: {limit})...")
@@ -111,53 +154,66 @@ def enrich_claims_for_episode(
     print(f"DISTILLING {len(claims)} CLAIMS")
     print("=" * 80)
     
-    for i, claim in enumerate(claims, 1):
-        claim_id = claim["id"]
-        claim_text = claim.get("claim_text", "")[:80]
-        
-        print(f"\n[{i}/{len(claims)}] Processing claim {claim_id}")
-        print(f"  Original: {claim_text}...")
-        
-        try:
-            # Create distillation input
-            distill_input = create_distillation_input_from_db_claim(claim)
+    pending = []
+    unsaved_ids = []
+    try:
+        for i, claim in enumerate(claims, 1):
+            claim_id = claim["id"]
+            claim_text = claim.get("claim_text", "")[:80]
             
-            if not distill_input:
-                print(f"  ⊘ Skipped - missing required fields")
-                stats["skipped"] += 1
-                continue
+            print(f"\n[{i}/{len(claims)}] Processing claim {claim_id}")
+            print(f"  Original: {claim_text}...")
             
-            # Generate distilled claim
-            result = distiller.distill(distill_input)
-            
-            if result.success:
-                print(f"  ✓ Distilled: {result.distilled_claim}")
-                print(f"    ({result.word_count} words)")
+            try:
+                # Create distillation input
+                distill_input = create_distillation_input_from_db_claim(claim)
+                
+                if not distill_input:
+                    print(f"  ⊘ Skipped - missing required fields")
+                    stats["skipped"] += 1
+                    continue
                 
-                # Update in database (unless dry run)
-                if not dry_run:
-                    db.add_distilled_claim(claim_id, result.distilled_claim, result.word_count)
-                    print(f"    ✓ Saved to database")
+                # Generate distilled claim
+                result = distiller.distill(distill_input)
+                
+                if result.success:
+                    print(f"  ✓ Distilled: {result.distilled_claim}")
+                    print(f"    ({result.word_count} words)")
+                    
+                    # Queue for the next batched database write (unless dry run)
+                    if not dry_run:
+                        pending.append({
+                            "id": claim_id,
+                            "distilled_claim": result.distilled_claim,
+                            "distilled_word_count": result.word_count,
+                        })
+                        if len(pending) >= WRITE_BATCH_SIZE:
+                            flush_distilled_claims(db, pending, unsaved_ids)
+                    else:
+                        print(f"    (Dry run - not saved)")
+                    
+                    stats["success"] += 1
                 else:
-                    print(f"    (Dry run - not saved)")
+                    print(f"  ✗ Failed: {result.error[:100]}...")
+                    stats["failed"] += 1
                 
-                stats["success"] += 1
-            else:
-                print(f"  ✗ Failed: {result.error[:100]}...")
-                stats["failed"] += 1
+                stats["processed"] += 1
             
-            stats["processed"] += 1
-            
-        except KeyboardInterrupt:
-            print("\n\n⚠️  Interrupted by user")
-            print(f"Progress saved: {stats['success']} claims distilled")
-            print("Run the script again to resume from where you left off")
-            raise
-        except Exception as e:
-            print(f"  ✗ Unexpected error: {str(e)[:100]}...")
-            stats["failed"] += 1
-            stats["processed"] += 1
-            # Continue with next claim instead of crashing
+            except KeyboardInterrupt:
+                print("\n\n⚠️  Interrupted by user")
+                print(f"Progress saved: {stats['success']} claims distilled")
+                print("Run the script again to resume from where you left off")
+                raise
+            except Exception as e:
+                print(f"  ✗ Unexpected error: {str(e)[:100]}...")
+                stats["failed"] += 1
+                stats["processed"] += 1
+                # Continue with next claim instead of crashing
+    finally:
+        # Flush on normal exit and on interruption so progress isn't lost
+        flush_distilled_claims(db, pending, unsaved_ids)
+    
+    stats["unsaved"] = len(unsaved_ids)
     
     # Print summary
     print("\n" + "=" * 80)
@@ -167,6 +223,9 @@ def enrich_claims_for_episode(
     print(f"Success:   {stats['success']}")
     print(f"Failed:    {stats['failed']}")
     print(f"Skipped:   {stats['skipped']}")
+    if unsaved_ids:
+        print(f"Not saved: {len(unsaved_ids)} (distilled but the database write failed)")
+        print(f"  Claim ids: {', '.join(str(claim_id) for claim_id in unsaved_ids)}")
     if stats['processed'] > 0:
         success_rate = (stats['success'] / stats['processed']) * 100
         print(f"Success rate: {success_rate:.1f}%")
@@ -203,6 +262,17 @@ def main():
         action="store_true",
         help="Generate distillations but don't save to database",
     )
+    parser.add_argument(
+        "--rpm",
+        type=int,
+        default=None,
+        help="Pace Gemini requests to at most this many per minute (default: unthrottled)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call Gemini instead of reusing cached distillations",
+    )
     
     args = parser.parse_args()
     
@@ -219,7 +289,9 @@ def main():
     stats = enrich_claims_for_episode(
         podcast_id=args.episode,
         limit=limit,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        rpm=args.rpm,
+        use_cache=not args.no_cache,
     )
     
     if stats["processed"] == 0:
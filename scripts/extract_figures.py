@@ -3,7 +3,7 @@
 Extract figure images from PDFs using GROBID coordinates.
 
 Reads GROBID JSON files, parses TEI XML to extract figure metadata,
-and uses pdf2image to crop figure regions from the source PDFs.
+and uses PyMuPDF to render figure regions from the source PDFs.
 
 Optionally uploads to Supabase storage for production use.
 """
@@ -16,14 +16,14 @@ import logging
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from xml.etree import ElementTree as ET
 
-from pdf2image import convert_from_path
-from PIL import Image
+import pymupdf
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT_DIR / "src"))
@@ -203,7 +203,7 @@ def extract_figures_from_tei(tei_xml: str, paper_id: str) -> List[FigureMetadata
 
 
 def extract_figure_image(
-    pdf_path: Path,
+    doc: pymupdf.Document,
     coords: FigureCoords,
     output_path: Path,
     dpi: int = 150,
@@ -213,7 +213,7 @@ def extract_figure_image(
     Extract a figure region from a PDF page and save as PNG.
 
     Args:
-        pdf_path: Path to the source PDF
+        doc: Open source PDF, shared across all figures of a paper
         coords: Figure coordinates (page, x, y, width, height in 72 DPI points)
         output_path: Where to save the extracted image
         dpi: Output resolution (default 150)
@@ -224,56 +224,49 @@ def extract_figure_image(
     """
     # Scale factor from 72 DPI points to target DPI pixels
     scale = dpi / 72.0
+    # Padding is given in output pixels; the clip rectangle is in points
+    pad = padding / scale
 
     try:
-        # Convert just the page we need (1-indexed in GROBID, 0-indexed in pdf2image)
-        pages = convert_from_path(
-            pdf_path,
-            dpi=dpi,
-            first_page=coords.page,
-            last_page=coords.page,
-        )
-
-        if not pages:
-            logger.warning("No pages extracted from %s page %d", pdf_path, coords.page)
-            return False
-
-        page_image = pages[0]
-
-        # Calculate crop box in pixels at target DPI
-        # GROBID uses top-left origin, PIL uses top-left origin too
-        x1 = int(coords.x * scale) - padding
-        y1 = int(coords.y * scale) - padding
-        x2 = int((coords.x + coords.width) * scale) + padding
-        y2 = int((coords.y + coords.height) * scale) + padding
-
-        # Clamp to image bounds
-        x1 = max(0, x1)
-        y1 = max(0, y1)
-        x2 = min(page_image.width, x2)
-        y2 = min(page_image.height, y2)
+        # GROBID pages are 1-indexed, PyMuPDF pages 0-indexed
+        page = doc.load_page(coords.page - 1)
+
+        # Clip rectangle in points; GROBID and PyMuPDF both use a
+        # top-left origin. Clamp to the page like the old pixel crop did.
+        clip = pymupdf.Rect(
+            coords.x - pad,
+            coords.y - pad,
+            coords.x + coords.width + pad,
+            coords.y + coords.height + pad,
+        ) & page.rect
 
         # Validate crop region
-        if x2 <= x1 or y2 <= y1:
+        if clip.is_empty:
             logger.warning(
-                "Invalid crop region for %s: (%d,%d,%d,%d)",
-                output_path.name, x1, y1, x2, y2
+                "Invalid crop region for %s: %s",
+                output_path.name, tuple(clip)
             )
             return False
 
-        # Crop and save
-        cropped = page_image.crop((x1, y1, x2, y2))
+        # Render only the clipped region, not the whole page
+        pix = page.get_pixmap(
+            matrix=pymupdf.Matrix(scale, scale),
+            clip=clip,
+            alpha=False,
+        )
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        cropped.save(output_path, "PNG")
+        pix.save(output_path)
 
         logger.debug(
             "Extracted figure to %s (size: %dx%d)",
-            output_path.name, cropped.width, cropped.height
+            output_path.name, pix.width, pix.height
         )
         return True
 
     except Exception as e:
-        logger.error("Failed to extract figure from %s: %s", pdf_path.name, e)
+        logger.error(
+            "Failed to extract figure from %s: %s", Path(doc.name).name, e
+        )
         return False
 
 
@@ -318,47 +311,104 @@ def process_paper(
     paper_output_dir = output_dir / paper_id
     extracted_figures: List[FigureMetadata] = []
 
-    for fig in figures:
-        if fig.coords is None:
-            logger.debug("Skipping %s/%s - no coordinates", paper_id, fig.figure_id)
-            # Still include in metadata but without image
-            extracted_figures.append(fig)
-            continue
+    # Parse the PDF once per paper and share it across all of its figures.
+    # Opened lazily so papers whose images are all on disk never touch it.
+    doc: Optional[pymupdf.Document] = None
+
+    try:
+        for fig in figures:
+            if fig.coords is None:
+                logger.debug("Skipping %s/%s - no coordinates", paper_id, fig.figure_id)
+                # Still include in metadata but without image
+                extracted_figures.append(fig)
+                continue
+
+            output_path = paper_output_dir / f"{fig.figure_id}.png"
+
+            if output_path.exists() and not force:
+                logger.debug("Skipping %s - already exists", output_path)
+                fig.image_path = str(output_path.relative_to(ROOT_DIR))
+                # Upload existing file if requested
+                if upload:
+                    url = upload_to_supabase(output_path, paper_id, fig.figure_id)
+                    if url:
+                        fig.image_url = url
+                        logger.debug("Uploaded %s to Supabase", fig.figure_id)
+                extracted_figures.append(fig)
+                continue
+
+            if doc is None:
+                try:
+                    doc = pymupdf.open(pdf_path)
+                except Exception as e:
+                    logger.error("Failed to open %s: %s", pdf_path.name, e)
+                    extracted_figures.append(fig)
+                    continue
+
+            success = extract_figure_image(
+                doc=doc,
+                coords=fig.coords,
+                output_path=output_path,
+                dpi=dpi,
+                padding=padding,
+            )
+
+            if success:
+                fig.image_path = str(output_path.relative_to(ROOT_DIR))
+                # Upload newly extracted file if requested
+                if upload:
+                    url = upload_to_supabase(output_path, paper_id, fig.figure_id)
+                    if url:
+                        fig.image_url = url
+                        logger.debug("Uploaded %s to Supabase", fig.figure_id)
 
-        output_path = paper_output_dir / f"{fig.figure_id}.png"
-
-        if output_path.exists() and not force:
-            logger.debug("Skipping %s - already exists", output_path)
-            fig.image_path = str(output_path.relative_to(ROOT_DIR))
-            # Upload existing file if requested
-            if upload:
-                url = upload_to_supabase(output_path, paper_id, fig.figure_id)
-                if url:
-                    fig.image_url = url
-                    logger.debug("Uploaded %s to Supabase", fig.figure_id)
             extracted_figures.append(fig)
-            continue
+    finally:
+        if doc is not None:
+            doc.close()
+
+    return extracted_figures
 
-        success = extract_figure_image(
-            pdf_path=pdf_path,
-            coords=fig.coords,
-            output_path=output_path,
-            dpi=dpi,
-            padding=padding,
-        )
 
-        if success:
-            fig.image_path = str(output_path.relative_to(ROOT_DIR))
-            # Upload newly extracted file if requested
-            if upload:
-                url = upload_to_supabase(output_path, paper_id, fig.figure_id)
-                if url:
-                    fig.image_url = url
-                    logger.debug("Uploaded %s to Supabase", fig.figure_id)
+def figure_to_dict(fig: FigureMetadata) -> Dict:
+    """Serialize figure metadata for the figures_metadata.json index."""
+    return {
+        "figure_id": fig.figure_id,
+        "paper_id": fig.paper_id,
+        "label": fig.label,
+        "title": fig.title,
+        "caption": fig.caption,
+        "coords": {
+            "page": fig.coords.page,
+            "x": fig.coords.x,
+            "y": fig.coords.y,
+            "width": fig.coords.width,
+            "height": fig.coords.height,
+        } if fig.coords else None,
+        "image_path": fig.image_path,
+        "image_url": fig.image_url,
+    }
 
-        extracted_figures.append(fig)
 
-    return extracted_figures
+def _process_one(
+    job: Tuple[Path, Path, int, int, bool, bool],
+) -> Tuple[str, List[Dict]]:
+    """
+    Pool worker: extract one paper's figures.
+
+    Returns (paper_id, figure dicts) so only plain data crosses the process
+    boundary; the metadata merge stays in the parent.
+    """
+    grobid_path, output_dir, dpi, padding, force, upload = job
+    figures = process_paper(
+        grobid_json_path=grobid_path,
+        output_dir=output_dir,
+        dpi=dpi,
+        padding=padding,
+        force=force,
+        upload=upload,
+    )
+    return grobid_path.stem, [figure_to_dict(f) for f in figures]
 
 
 def main():
@@ -405,6 +455,12 @@ def main():
         action="store_true",
         help="Upload figures to Supabase storage after extraction",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Papers to process in parallel (default: one per CPU; 1 disables the pool)",
+    )
     args = parser.parse_args()
 
     logging.basicConfig(
@@ -440,40 +496,25 @@ def main():
     total_figures = 0
     total_extracted = 0
 
-    for grobid_path in grobid_files:
-        paper_id = grobid_path.stem
-
-        figures = process_paper(
-            grobid_json_path=grobid_path,
-            output_dir=FIGURE_OUTPUT_DIR,
-            dpi=args.dpi,
-            padding=args.padding,
-            force=args.force,
-            upload=args.upload,
-        )
+    jobs = [
+        (grobid_path, FIGURE_OUTPUT_DIR, args.dpi, args.padding, args.force, args.upload)
+        for grobid_path in grobid_files
+    ]
+    workers = min(args.workers or os.cpu_count() or 1, len(jobs))
+
+    # Papers are independent (separate PDF, separate output dir), so render
+    # them across processes and merge the results here in order.
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_process_one, jobs))
+    else:
+        results = [_process_one(job) for job in jobs]
 
+    for paper_id, figures in results:
         if figures:
-            all_figures[paper_id] = [
-                {
-                    "figure_id": f.figure_id,
-                    "paper_id": f.paper_id,
-                    "label": f.label,
-                    "title": f.title,
-                    "caption": f.caption,
-                    "coords": {
-                        "page": f.coords.page,
-                        "x": f.coords.x,
-                        "y": f.coords.y,
-                        "width": f.coords.width,
-                        "height": f.coords.height,
-                    } if f.coords else None,
-                    "image_path": f.image_path,
-                    "image_url": f.image_url,
-                }
-                for f in figures
-            ]
+            all_figures[paper_id] = figures
             total_figures += len(figures)
-            total_extracted += sum(1 for f in figures if f.image_path)
+            total_extracted += sum(1 for f in figures if f["image_path"])
 
     # Save metadata index
     metadata = {
@@ -1,6 +1,7 @@
 """Library modules for episode ingestion pipeline."""
 
 from .checkpoint import Checkpoint, CheckpointManager
+from .response_cache import ResponseCache, make_cache_key
 
 # Optional imports - may not be available if dependencies aren't installed
 try:
@@ -18,4 +19,6 @@ __all__ = [
     "CheckpointManager",
     "AssemblyAIClient",
     "MetadataExtractor",
+    "ResponseCache",
+    "make_cache_key",
 ]
@@ -14,11 +14,6 @@ from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
 
-try:
-    from google import genai
-except ImportError:
-    genai = None
-
 
 # Load environment variables
 load_dotenv()
@@ -95,10 +90,13 @@ class MetadataExtractor:
             api_key: Gemini API key. Defaults to GEMINI_API_KEY env var.
             model_name: Gemini model to use.
         """
-        if genai is None:
+        # Imported here so importing scripts.lib does not load the SDK.
+        try:
+            from google import genai
+        except ImportError:
             raise ImportError(
                 "google-genai package required. Install with: pip install google-genai"
-            )
+            ) from None
 
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         if not self.api_key:
@@ -106,6 +104,7 @@ class MetadataExtractor:
 
         self.model_name = model_name
         self.client = genai.Client(api_key=self.api_key)
+        self._types = genai.types
 
     def extract_from_transcript(
         self,
@@ -132,7 +131,7 @@ class MetadataExtractor:
             response = self.client.models.generate_content(
                 model=self.model_name,
                 contents=prompt,
-                config=genai.types.GenerateContentConfig(
+                config=self._types.GenerateContentConfig(
                     temperature=0.1,  # Low temperature for consistent extraction
                     max_output_tokens=1024,
                 ),
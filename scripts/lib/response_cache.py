@@ -0,0 +1,136 @@
+"""On-disk cache for LLM and retrieval responses.
+
+Entries live in a single SQLite table keyed by a SHA-256 of the canonicalized
+request, with zlib-compressed JSON values and a per-entry expiry. Reruns of
+the pipeline (including ``--redo`` passes) can then skip network calls whose
+inputs have not changed. Async callers use the ``a*`` variants, which run
+the SQLite work on a worker thread instead of the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CACHE_PATH = REPO_ROOT / "data" / ".llm_cache.db"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Hash the JSON form of ``parts`` into a stable cache key."""
+    canonical = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe key/value store with expiry, backed by SQLite."""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for ``key``, or ``default`` if missing/expired."""
+        return self.get_many([key], default)[0]
+
+    def get_many(self, keys: Sequence[str], default: Any = None) -> List[Any]:
+        """Look up several keys under one lock acquisition, in order."""
+        with self._lock:
+            conn = self._connection()
+            rows = [
+                conn.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+                for key in keys
+            ]
+        now = time.time()
+        return [self._decode(row, now, default) for row in rows]
+
+    @staticmethod
+    def _decode(row: Optional[Tuple[bytes, float]], now: float, default: Any) -> Any:
+        if row is None:
+            return default
+        value, expires = row
+        if expires < now:
+            return default
+        try:
+            return json.loads(zlib.decompress(value).decode("utf-8"))
+        except (zlib.error, ValueError):
+            return default
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a JSON-serializable ``value`` under ``key``."""
+        self.set_many([(key, value)], ttl_seconds)
+
+    def set_many(
+        self, items: Iterable[Tuple[str, Any]], ttl_seconds: Optional[float] = None
+    ) -> None:
+        """Store several ``(key, value)`` pairs with a single commit."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        rows = [
+            (key, zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8")))
+            for key, value in items
+        ]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            expires = time.time() + ttl
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                [(key, blob, expires) for key, blob in rows],
+            )
+            conn.commit()
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        return await asyncio.to_thread(self.get, key, default)
+
+    async def aget_many(self, keys: Sequence[str], default: Any = None) -> List[Any]:
+        return await asyncio.to_thread(self.get_many, keys, default)
+
+    async def aset(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        await asyncio.to_thread(self.set, key, value, ttl_seconds)
+
+    async def aset_many(
+        self, items: Iterable[Tuple[str, Any]], ttl_seconds: Optional[float] = None
+    ) -> None:
+        await asyncio.to_thread(self.set_many, list(items), ttl_seconds)
+
+    def purge_expired(self) -> int:
+        """Delete expired rows; returns how many were removed."""
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+            conn.commit()
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
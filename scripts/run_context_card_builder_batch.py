@@ -84,19 +84,49 @@ def _run_builder(
         json.dump(payload, tmp, ensure_ascii=False, indent=2)
         tmp.flush()
         command.append(tmp.name)
-        command.extend(["--podcast-id", podcast_id, "--episode-title", episode_title])
-        if use_gemini:
-            command.append("--use-gemini")
-        if redo:
-            command.append("--redo")
-        if note:
-            command.extend(["--note", note])
+        command.extend(_builder_flags(use_gemini, redo, podcast_id, episode_title, note))
         # Always clean up the temporary file after the subprocess completes
         result = subprocess.run(command)
     Path(tmp.name).unlink(missing_ok=True)
     return result.returncode
 
 
+def _builder_flags(
+    use_gemini: bool,
+    redo: bool,
+    podcast_id: str,
+    episode_title: str,
+    note: str | None,
+) -> list[str]:
+    flags = ["--podcast-id", podcast_id, "--episode-title", episode_title]
+    if use_gemini:
+        flags.append("--use-gemini")
+    if redo:
+        flags.append("--redo")
+    if note:
+        flags.extend(["--note", note])
+    return flags
+
+
+def _run_builder_stream(payloads: Iterable[dict], flags: Sequence[str]) -> int:
+    """Feed every payload to a single --stdin-jsonl builder process."""
+    command = [
+        sys.executable,
+        "scripts/context_card_builder.py",
+        "--stdin-jsonl",
+        *flags,
+    ]
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, text=True, encoding="utf-8")
+    assert process.stdin is not None
+    try:
+        for payload in payloads:
+            process.stdin.write(json.dumps(payload, ensure_ascii=False) + "\n")
+            process.stdin.flush()
+    finally:
+        process.stdin.close()
+    return process.wait()
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Run context_card_builder.py on every window segment.")
     parser.add_argument(
@@ -153,6 +183,14 @@ def main() -> None:
         default=5.0,
         help="Skip the last N%% of the episode (default: 5%% to avoid promo/outro).",
     )
+    parser.add_argument(
+        "--single-process",
+        action="store_true",
+        help=(
+            "Stream every window into one context_card_builder.py --stdin-jsonl "
+            "process instead of starting one process per window."
+        ),
+    )
 
     args = parser.parse_args()
 
@@ -175,6 +213,7 @@ def main() -> None:
 
     processed = 0
     skipped_outro = 0
+    queued: list[dict] = []
 
     for idx, window in enumerate(windows):
         if idx < args.start_index:
@@ -196,6 +235,10 @@ def main() -> None:
             print(f"[{idx+1}/{total}] Window {payload['heading']} has no text; skipping.")
             continue
         print(f"[{idx+1}/{total}] Processing window_id={payload['heading']} timestamp={payload['timestamp']}")
+        if args.single_process:
+            queued.append(payload)
+            processed += 1
+            continue
         status = _run_builder(
             payload,
             use_gemini=args.use_gemini,
@@ -210,6 +253,16 @@ def main() -> None:
                 sys.exit(status)
         processed += 1
 
+    if queued:
+        flags = _builder_flags(
+            args.use_gemini, args.redo, args.podcast_id, args.episode_title, args.note or None
+        )
+        status = _run_builder_stream(queued, flags)
+        if status != 0:
+            print(f"  context_card_builder.py exited with {status}")
+            if args.abort_on_error:
+                sys.exit(status)
+
     print(f"Done. Processed {processed} window(s).")
     if skipped_outro > 0:
         print(f"Skipped {skipped_outro} outro window(s) (last {args.skip_outro_percent}% of episode).")
@@ -36,10 +36,12 @@ DEFAULT_MAX_PAGES = 10
 
 logger = logging.getLogger("scrape_levin_papers")
 
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
 
 def slugify(text: str) -> str:
     """Create a filesystem-safe identifier."""
-    slug = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+    slug = _SLUG_RE.sub("-", text.lower()).strip("-")
     return slug or "publication"
 
 
@@ -112,7 +112,8 @@ class NoeronDB:
         self,
         podcast_id: str,
         order_by: str = "start_ms",
-        include_duplicates: bool = False
+        include_duplicates: bool = False,
+        columns: str = "*",
     ) -> List[Dict[str, Any]]:
         """Get all claims for an episode, ordered by timestamp.
 
@@ -120,10 +121,13 @@ class NoeronDB:
             podcast_id: Episode ID (e.g., 'lex_325')
             order_by: Column to order by (default: 'start_ms')
             include_duplicates: If False (default), excludes claims marked as duplicates
+            columns: Comma-separated columns to fetch (default: all). Narrow this
+                     when only a few fields are needed to avoid transferring the
+                     long text columns.
         """
         query = (
             self.client.table("claims")
-            .select("*")
+            .select(columns)
             .eq("podcast_id", podcast_id)
         )
 
@@ -133,6 +137,41 @@ class NoeronDB:
         response = query.order(order_by).execute()
         return response.data
     
+    def get_claims_updated_since(
+        self,
+        podcast_id: str,
+        since: str,
+        columns: str = "*",
+    ) -> List[Dict[str, Any]]:
+        """Get an episode's active claims with updated_at at or after `since`.
+
+        Args:
+            podcast_id: Episode ID (e.g., 'lex_325')
+            since: ISO timestamp, usually the max(updated_at) seen on a previous run
+            columns: Comma-separated columns to fetch (default: all)
+        """
+        response = (
+            self.client.table("claims")
+            .select(columns)
+            .eq("podcast_id", podcast_id)
+            .is_("duplicate_of", "null")
+            .gte("updated_at", since)
+            .order("start_ms")
+            .execute()
+        )
+        return response.data
+    
+    def find_duplicate_claim_texts(self, podcast_id: str) -> List[Dict[str, Any]]:
+        """Get groups of active claims sharing the same claim_text via RPC function.
+
+        Each row has claim_text, claim_ids and claim_count.
+        """
+        response = self.client.rpc(
+            "find_dup_claim_texts",
+            {"p_podcast_id": podcast_id}
+        ).execute()
+        return response.data
+    
     def get_claims_needing_distillation(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get claims that need distilled summaries."""
         response = (
@@ -167,6 +206,21 @@ class NoeronDB:
             "distilled_word_count": word_count
         })
     
+    def add_distilled_claims_batch(self, rows: List[Dict[str, Any]]) -> int:
+        """Write many distilled claims in one request via RPC function.
+
+        Args:
+            rows: Dicts with id, distilled_claim and distilled_word_count
+
+        Returns:
+            Number of claims updated
+        """
+        response = self.client.rpc(
+            "set_distilled_claims",
+            {"p_rows": rows}
+        ).execute()
+        return response.data
+    
     # =========================================================================
     # Papers
     # =========================================================================
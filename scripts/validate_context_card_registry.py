@@ -11,6 +11,10 @@ from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from src.bioelectricity_research.context_card_registry import replay_registry_journal  # noqa: E402
+
 DEFAULT_REGISTRY = REPO_ROOT / "data" / "context_card_registry.json"
 TIMESTAMP_RE = re.compile(r"^\d{2}:\d{2}:\d{2}(?:\.\d+)?$")
 
@@ -18,7 +22,11 @@ TIMESTAMP_RE = re.compile(r"^\d{2}:\d{2}:\d{2}(?:\.\d+)?$")
 def _load_registry(path: Path) -> Dict[str, Any]:
     if not path.exists():
         raise FileNotFoundError(f"Registry not found: {path}")
-    return json.loads(path.read_text(encoding="utf-8"))
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(payload, dict) and isinstance(payload.get("segments"), dict):
+        # Segments recorded since the last snapshot rewrite live in the journal.
+        replay_registry_journal(path, payload)
+    return payload
 
 
 def _timestamp_valid(value: str) -> bool:
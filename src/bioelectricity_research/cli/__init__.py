@@ -0,0 +1 @@
+"""Command-line entry points installed with the package."""
@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+"""
+Enrich Levin publication metadata with Semantic Scholar and save papers.
+
+Loads the raw JSON produced by `scripts/scrape_levin_papers.py`, looks up each paper
+via Semantic Scholar (prefer DOI when available, otherwise search by title),
+and stores the enriched paper using the same flow as `bioelectricity_research.storage.fetch_and_store_paper`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import logging
+import random
+import re
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AbstractSet, Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, TypeVar
+from urllib.parse import quote
+
+import httpx
+
+try:
+    import orjson  # type: ignore[import]
+except ImportError:  # pragma: no cover - stdlib json is the fallback codec
+    orjson = None
+
+from bioelectricity_research.server import API_BASE, HEADERS
+from bioelectricity_research.storage import STORAGE_DIR, PaperStorage, fetch_and_store_paper
+
+DEFAULT_SCRAPE_FILE = STORAGE_DIR / "scraped" / "levin_publications_raw.json"
+FIELDS = "paperId,title,abstract,authors,year,citationCount,venue,journal,openAccessPdf,externalIds"
+
+RATE_LIMIT_ATTEMPTS = 3
+S2_BATCH_SIZE = 500  # /paper/batch accepts at most 500 ids per request
+
+S2_MAX_CONNECTIONS = 20
+
+logger = logging.getLogger("corpus_builder")
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+T = TypeVar("T")
+
+
+class CrossRefEnricher:
+    """Enrich metadata via CrossRef when Semantic Scholar misses."""
+
+    def __init__(self, email: str):
+        self.base_url = "https://api.crossref.org/works"
+        self.user_agent = f"BioelectricityCorpus/1.0 (mailto:{email})"
+
+    async def get_metadata_by_doi(
+        self,
+        doi: str,
+        client: httpx.AsyncClient,
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            url = f"{self.base_url}/{quote(doi, safe='')}"
+            headers = {"User-Agent": self.user_agent}
+            response = await client.get(url, headers=headers, timeout=10.0)
+            if response.status_code == 404:
+                logger.warning("DOI not found in CrossRef: %s", doi)
+                return None
+            response.raise_for_status()
+            message = _response_json(response).get("message", {})
+            return self._normalize(message, doi)
+        except httpx.HTTPError as exc:
+            logger.error("CrossRef lookup failed for %s: %s", doi, exc)
+            return None
+
+    def _normalize(self, data: Dict[str, Any], doi: str) -> Dict[str, Any]:
+        authors = []
+        for author in data.get("author", []):
+            name = " ".join(filter(None, [author.get("given"), author.get("family")])).strip()
+            if name:
+                authors.append({"name": name})
+
+        published = data.get("published-print") or data.get("published-online") or {}
+        year = None
+        parts = published.get("date-parts") or []
+        if parts and parts[0]:
+            year = parts[0][0]
+
+        titles = data.get("title", [])
+        title = titles[0] if titles else "Untitled"
+
+        pdf_url = None
+        for link in data.get("link", []):
+            if link.get("content-type") == "application/pdf":
+                pdf_url = link.get("URL")
+                break
+
+        return {
+            "paperId": f"crossref:{doi}",
+            "title": title,
+            "abstract": data.get("abstract"),
+            "authors": authors,
+            "year": year,
+            "venue": data.get("container-title", [""])[0] if data.get("container-title") else None,
+            "journal": {},
+            "openAccessPdf": {"url": pdf_url} if pdf_url else None,
+            "externalIds": {"DOI": doi},
+            "citationCount": None,
+            "source": "crossref",
+        }
+
+
+class RequestLimiter:
+    """Space Semantic Scholar requests at least ``interval`` seconds apart.
+
+    Shared by every concurrent lookup, so the ``--delay`` budget holds for the
+    whole run rather than per coroutine.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    async def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+                now = self._next_at
+            self._next_at = now + self.interval
+
+
+def build_client() -> httpx.AsyncClient:
+    """One pooled client for a whole run: keep-alive, and HTTP/2 when h2 is installed."""
+    return httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_connections=S2_MAX_CONNECTIONS,
+            max_keepalive_connections=S2_MAX_CONNECTIONS,
+        ),
+        headers=HEADERS,
+        timeout=httpx.Timeout(30.0, connect=5.0),
+    )
+
+
+async def run_workers(workers: Iterable[Awaitable[Any]]) -> None:
+    """Run worker coroutines as one unit; if one fails, the others are cancelled.
+
+    Uses ``asyncio.TaskGroup`` on 3.11+, with an equivalent gather-and-cancel
+    fallback for 3.10.
+    """
+    if hasattr(asyncio, "TaskGroup"):
+        async with asyncio.TaskGroup() as group:
+            for worker in workers:
+                group.create_task(worker)
+        return
+    tasks = [asyncio.ensure_future(worker) for worker in workers]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _retry_after_seconds(response: httpx.Response, default: float) -> float:
+    """Seconds the server asked us to wait, from Retry-After (delta or HTTP date)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+async def retry_on_429(
+    request: Callable[[], Awaitable[T]],
+    backoff: float,
+    attempts: int = RATE_LIMIT_ATTEMPTS,
+) -> T:
+    """Await ``request()``, retrying on 429 after the server's Retry-After delay.
+
+    Without the header the wait doubles from ``backoff`` each attempt, with a
+    little jitter so concurrent workers do not retry in lockstep. The final
+    429 is re-raised.
+    """
+    for attempt in range(attempts):
+        try:
+            return await request()
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code != 429 or attempt == attempts - 1:
+                raise
+            delay = _retry_after_seconds(exc.response, backoff * 2**attempt)
+            delay += random.uniform(0, min(1.0, delay / 10 + 0.1))
+            logger.warning(
+                "Rate limited by %s; retrying in %.1fs (attempt %d/%d)",
+                exc.request.url.host,
+                delay,
+                attempt + 2,
+                attempts,
+            )
+            await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def _loads_json(data: bytes) -> Any:
+    """Decode with orjson when available, retrying stdlib json on what it rejects
+    (NaN/Infinity literals, non-UTF-8 payloads)."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _response_json(response: httpx.Response) -> Any:
+    return _loads_json(response.content)
+
+
+def slugify(text: str) -> str:
+    slug = _SLUG_RE.sub("-", text.lower()).strip("-")
+    return slug or "publication"
+
+
+def load_scraped_entries(path: Path) -> List[Dict[str, Any]]:
+    payload = _loads_json(path.read_bytes())
+    return payload.get("publications", [])
+
+
+async def fetch_paper_by_identifier(
+    client: httpx.AsyncClient,
+    identifier: str,
+    limiter: Optional[RequestLimiter] = None,
+) -> Optional[Dict[str, Any]]:
+    encoded = quote(identifier, safe="")
+    if limiter:
+        await limiter.wait()
+    response = await client.get(
+        f"{API_BASE}/paper/{encoded}",
+        params={"fields": FIELDS},
+    )
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return _response_json(response)
+
+
+async def fetch_papers_by_dois(
+    client: httpx.AsyncClient,
+    dois: List[str],
+    limiter: Optional[RequestLimiter] = None,
+    rate_limit_backoff: float = 10.0,
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Resolve DOIs through /paper/batch, S2_BATCH_SIZE ids per request.
+
+    Returns DOI -> metadata (None when Semantic Scholar has no match). DOIs
+    whose chunk failed are left out so callers fall back to per-entry lookups.
+    """
+    resolved: Dict[str, Optional[Dict[str, Any]]] = {}
+    unique = list(dict.fromkeys(dois))
+    for offset in range(0, len(unique), S2_BATCH_SIZE):
+        chunk = unique[offset : offset + S2_BATCH_SIZE]
+
+        async def post_chunk(chunk: List[str] = chunk) -> httpx.Response:
+            if limiter:
+                await limiter.wait()
+            response = await client.post(
+                f"{API_BASE}/paper/batch",
+                params={"fields": FIELDS},
+                json={"ids": [f"DOI:{doi}" for doi in chunk]},
+                timeout=60.0,
+            )
+            response.raise_for_status()
+            return response
+
+        try:
+            response = await retry_on_429(post_chunk, rate_limit_backoff)
+        except httpx.HTTPError as exc:
+            logger.error("Semantic Scholar batch lookup failed for %d DOIs: %s", len(chunk), exc)
+            continue
+        results = _response_json(response)
+        if not isinstance(results, list) or len(results) != len(chunk):
+            logger.error("Unexpected /paper/batch response shape; falling back to single lookups")
+            continue
+        for doi, paper in zip(chunk, results):
+            resolved[doi] = paper if isinstance(paper, dict) else None
+    return resolved
+
+
+async def search_paper(
+    client: httpx.AsyncClient,
+    query: str,
+    limiter: Optional[RequestLimiter] = None,
+) -> Optional[Dict[str, Any]]:
+    if limiter:
+        await limiter.wait()
+    response = await client.get(
+        f"{API_BASE}/paper/search",
+        params={"query": query, "limit": 1, "fields": FIELDS},
+    )
+    response.raise_for_status()
+    data = _response_json(response).get("data", [])
+    return data[0] if data else None
+
+
+async def resolve_paper_metadata(
+    client: httpx.AsyncClient,
+    entry: Dict[str, Any],
+    rate_limit_backoff: float,
+    crossref_enricher: Optional[CrossRefEnricher] = None,
+    limiter: Optional[RequestLimiter] = None,
+    prefetched: Optional[Mapping[str, Optional[Dict[str, Any]]]] = None,
+) -> Optional[Dict[str, Any]]:
+    """Find metadata (with a ``paperId``) for a scraped entry, or None."""
+    title = entry.get("title")
+    if not title:
+        logger.warning("Skipping entry with no title: %s", entry)
+        return None
+
+    identifiers = entry.get("identifiers", {})
+    doi = identifiers.get("DOI")
+    paper_metadata: Optional[Dict[str, Any]] = None
+
+    if doi and prefetched is not None and doi in prefetched:
+        paper_metadata = prefetched[doi]
+    elif doi:
+        logger.info("Searching Semantic Scholar by DOI: %s", doi)
+        try:
+            paper_metadata = await retry_on_429(
+                lambda: fetch_paper_by_identifier(client, doi, limiter),
+                rate_limit_backoff,
+            )
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code == 429:
+                logger.warning("Still rate limited while fetching DOI %s; giving up", doi)
+                return None
+            raise
+
+    if not paper_metadata:
+        search_query = doi or title
+        logger.info("Searching Semantic Scholar by title/identifier: %s", search_query)
+        try:
+            paper_metadata = await retry_on_429(
+                lambda: search_paper(client, search_query, limiter),
+                rate_limit_backoff,
+            )
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code == 429:
+                logger.warning("Still rate limited while searching '%s'; giving up", search_query)
+                return None
+            raise
+
+    if not paper_metadata and doi and crossref_enricher:
+        logger.info("Trying CrossRef for DOI %s", doi)
+        paper_metadata = await crossref_enricher.get_metadata_by_doi(doi, client)
+
+    if not paper_metadata:
+        logger.warning("No Semantic Scholar match for '%s'", title)
+        return None
+
+    if not paper_metadata.get("paperId"):
+        logger.warning("Matched paper had no ID: %s", paper_metadata)
+        return None
+    return paper_metadata
+
+
+async def store_paper(
+    storage: PaperStorage,
+    paper_metadata: Dict[str, Any],
+    force: bool,
+    known_ids: Optional[AbstractSet[str]] = None,
+) -> str:
+    """Download and save a resolved paper unless it is already in the collection.
+
+    ``known_ids`` is a prefetched view of the collection's paper ids; when given
+    it replaces the per-paper ``paper_exists`` check, which rereads the file.
+    """
+    paper_id = paper_metadata["paperId"]
+    if force:
+        already_saved = False
+    elif known_ids is not None:
+        already_saved = paper_id in known_ids
+    else:
+        already_saved = await asyncio.to_thread(storage.paper_exists, paper_id)
+    if already_saved:
+        logger.info("Paper %s already saved, skipping", paper_id)
+        return paper_id
+
+    stored = await fetch_and_store_paper(paper_id, paper_metadata, storage)
+    logger.info(
+        "Stored '%s' (%s): %s chars full-text",
+        stored["metadata"]["title"],
+        paper_id,
+        len(stored["content"]["full_text"]),
+    )
+    return paper_id
+
+
+async def enrich_entry(
+    client: httpx.AsyncClient,
+    storage: PaperStorage,
+    entry: Dict[str, Any],
+    force: bool,
+    rate_limit_backoff: float,
+    crossref_enricher: Optional[CrossRefEnricher] = None,
+    limiter: Optional[RequestLimiter] = None,
+    prefetched: Optional[Mapping[str, Optional[Dict[str, Any]]]] = None,
+    known_ids: Optional[AbstractSet[str]] = None,
+) -> Optional[str]:
+    paper_metadata = await resolve_paper_metadata(
+        client,
+        entry,
+        rate_limit_backoff,
+        crossref_enricher=crossref_enricher,
+        limiter=limiter,
+        prefetched=prefetched,
+    )
+    if not paper_metadata:
+        return None
+    return await store_paper(storage, paper_metadata, force, known_ids=known_ids)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Build corpus from Levin scraped publications")
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=DEFAULT_SCRAPE_FILE,
+        help="Path to the raw scraped JSON file",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Maximum number of entries to process (default: all)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Force re-download of papers even if they already exist",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Suppress info logs",
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=1.0,
+        help="Minimum seconds between Semantic Scholar requests across all workers (default: 1.0)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=10,
+        help="Workers resolving metadata at once (default: 10)",
+    )
+    parser.add_argument(
+        "--storage-workers",
+        type=int,
+        default=4,
+        help="Workers downloading and saving resolved papers (default: 4)",
+    )
+    parser.add_argument(
+        "--backoff",
+        type=float,
+        default=10.0,
+        help="Seconds to wait after a 429 without Retry-After, doubling per retry (default: 10.0)",
+    )
+    parser.add_argument(
+        "--crossref-email",
+        type=str,
+        default="your.email@example.com",
+        help="Email to identify CrossRef API requests",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+
+    if not args.input.exists():
+        raise SystemExit(f"No scraped file found at {args.input}")
+
+    entries = load_scraped_entries(args.input)
+    if not entries:
+        raise SystemExit("No publications in the scraped payload")
+
+    if args.limit:
+        entries = entries[: args.limit]
+
+    storage = PaperStorage()
+    crossref_enricher = CrossRefEnricher(args.crossref_email)
+    limiter = RequestLimiter(args.delay)
+
+    # Two-stage pipeline: metadata workers resolve entries (rate-limited S2
+    # calls) and hand papers to storage workers (PDF download + save), so one
+    # paper's download overlaps the next entry's lookup.
+    entry_queue: asyncio.Queue = asyncio.Queue()
+    for item in enumerate(entries, 1):
+        entry_queue.put_nowait(item)
+    storage_workers = max(1, args.storage_workers)
+    store_queue: asyncio.Queue = asyncio.Queue(maxsize=storage_workers * 2)
+
+    async def metadata_worker(
+        client: httpx.AsyncClient,
+        prefetched: Mapping[str, Optional[Dict[str, Any]]],
+    ) -> None:
+        while not entry_queue.empty():
+            idx, entry = entry_queue.get_nowait()
+            logger.info("Processing [%d/%d]: %s", idx, len(entries), entry.get("title"))
+            try:
+                paper_metadata = await resolve_paper_metadata(
+                    client,
+                    entry,
+                    args.backoff,
+                    crossref_enricher=crossref_enricher,
+                    limiter=limiter,
+                    prefetched=prefetched,
+                )
+            except httpx.HTTPStatusError as exc:
+                logger.error("Semantic Scholar error for '%s': %s", entry.get("title"), exc)
+                continue
+            except Exception:
+                logger.exception("Unexpected error while processing '%s'", entry.get("title"))
+                continue
+            if paper_metadata:
+                await store_queue.put(paper_metadata)
+
+    async def storage_worker() -> None:
+        while (paper_metadata := await store_queue.get()) is not None:
+            try:
+                await store_paper(storage, paper_metadata, args.force)
+            except Exception:
+                logger.exception("Unexpected error while storing '%s'", paper_metadata.get("title"))
+
+    async with build_client() as client:
+        dois = [
+            entry.get("identifiers", {}).get("DOI") for entry in entries if entry.get("title")
+        ]
+        dois = [doi for doi in dois if doi]
+        prefetched = await fetch_papers_by_dois(client, dois, limiter, args.backoff) if dois else {}
+        logger.info(
+            "Resolved %d/%d DOIs via /paper/batch",
+            sum(1 for paper in prefetched.values() if paper),
+            len(set(dois)),
+        )
+
+        async def metadata_stage() -> None:
+            await run_workers(
+                metadata_worker(client, prefetched) for _ in range(max(1, args.concurrency))
+            )
+            for _ in range(storage_workers):
+                await store_queue.put(None)
+
+        await run_workers(
+            [metadata_stage(), *(storage_worker() for _ in range(storage_workers))]
+        )
+
+
+def run():
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    run()
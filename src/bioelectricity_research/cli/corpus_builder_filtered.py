@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Filters the DOI list from a scraped source before feeding it into the corpus builder.
+
+This script loads the scraped publication list (default: Levin publications), compares
+each DOI/title against `data/papers_collection.json`, and only runs Semantic Scholar lookups
+for the missing entries. It reuses the corpus builder's lookup and storage steps so rate
+limiting and storage behaviors remain consistent. The normalized DOI/title/id sets are
+cached in `data/saved_index.json` between runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from bioelectricity_research.cli.corpus_builder import (
+    RequestLimiter,
+    build_client,
+    load_scraped_entries,
+    resolve_paper_metadata,
+    run_workers,
+    store_paper,
+)
+from bioelectricity_research.storage import STORAGE_DIR, STORAGE_FILE, PaperStorage
+
+DEFAULT_SCRAPED = STORAGE_DIR / "scraped" / "levin_publications_raw.json"
+DEFAULT_BACKOFF = 10.0
+DEFAULT_DELAY = 1.0
+DEFAULT_CONCURRENCY = 4
+SAVED_INDEX_FILE = STORAGE_FILE.with_name("saved_index.json")
+
+SavedIndex = tuple[frozenset[str], frozenset[str], frozenset[str]]
+
+
+def _normalize_key(value: object) -> str:
+    return value.strip().casefold() if isinstance(value, str) else ""
+
+
+def _collection_stamp() -> Optional[List[int]]:
+    try:
+        stat = STORAGE_FILE.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _read_saved_index(path: Path) -> Optional[SavedIndex]:
+    try:
+        payload = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    stamp = _collection_stamp()
+    if stamp is None or payload.get("collection") != stamp:
+        return None
+    sets = []
+    for field in ("dois", "titles", "ids"):
+        values = payload.get(field)
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            return None
+        sets.append(frozenset(values))
+    dois, titles, ids = sets
+    return dois, titles, ids
+
+
+def write_saved_index(index: SavedIndex, path: Path = SAVED_INDEX_FILE) -> None:
+    """Persist the normalized DOI/title/id sets, stamped with the collection file's
+    mtime and size so a later run can tell whether they are still current."""
+    dois, titles, ids = index
+    payload = {
+        "collection": _collection_stamp(),
+        "dois": sorted(dois),
+        "titles": sorted(titles),
+        "ids": sorted(ids),
+    }
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def load_existing_metadata(
+    storage: PaperStorage,
+    index_path: Optional[Path] = SAVED_INDEX_FILE,
+) -> SavedIndex:
+    """Return saved DOIs and titles (case-insensitive) plus paper ids from the collection.
+
+    Served from the sidecar index at ``index_path`` while it matches the
+    collection file; otherwise rebuilt from the collection and rewritten.
+    """
+    if index_path is not None and (cached := _read_saved_index(index_path)) is not None:
+        return cached
+    saved = storage.load().get("papers", {})
+    metadata = [paper.get("metadata", {}) for paper in saved.values()]
+    dois = frozenset(filter(None, (_normalize_key(item.get("doi")) for item in metadata)))
+    titles = frozenset(filter(None, (_normalize_key(item.get("title")) for item in metadata)))
+    index = (dois, titles, frozenset(saved))
+    if index_path is not None:
+        write_saved_index(index, index_path)
+    return index
+
+
+def filter_entries(
+    entries: List[Dict[str, any]],
+    saved_dois: frozenset[str],
+    saved_titles: frozenset[str],
+) -> List[Dict[str, any]]:
+    filtered: List[Dict[str, any]] = []
+    for entry in entries:
+        doi = _normalize_key(entry.get("identifiers", {}).get("DOI"))
+        if doi and doi in saved_dois:
+            continue
+        title = _normalize_key(entry.get("title"))
+        if title and title in saved_titles:
+            continue
+        filtered.append(entry)
+    return filtered
+
+
+async def enrich_batch(
+    entries: Iterable[Dict[str, any]],
+    storage: PaperStorage,
+    rate_limit_delay: float,
+    rate_limit_backoff: float,
+    known_ids: frozenset[str] = frozenset(),
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> List[Dict[str, Any]]:
+    """Resolve and store ``entries``; returns the metadata of every paper stored
+    so callers can extend the saved index."""
+    limiter = RequestLimiter(rate_limit_delay)
+    # Grows as papers are claimed, so a paper saved earlier in this run is not
+    # downloaded again when another entry resolves to it.
+    known = set(known_ids)
+    stored: List[Dict[str, Any]] = []
+    pending = iter(entries)
+
+    async def worker(client) -> None:
+        # Workers share one iterator; the limiter still paces the API calls.
+        for entry in pending:
+            try:
+                paper_metadata = await resolve_paper_metadata(
+                    client,
+                    entry,
+                    rate_limit_backoff,
+                    limiter=limiter,
+                )
+            except Exception:
+                logging.exception("Failed to resolve '%s'", entry.get("title"))
+                continue
+            if not paper_metadata:
+                continue
+            paper_id = paper_metadata["paperId"]
+            if paper_id in known:
+                logging.info("Paper %s already saved, skipping", paper_id)
+                continue
+            # Claim before awaiting so a concurrent worker resolving the same
+            # paper skips it; the check above replaces store_paper's own.
+            known.add(paper_id)
+            try:
+                await store_paper(storage, paper_metadata, force=True)
+            except Exception:
+                known.discard(paper_id)
+                logging.exception("Failed to store '%s'", paper_metadata.get("title"))
+                continue
+            stored.append(paper_metadata)
+
+    async with build_client() as client:
+        await run_workers(worker(client) for _ in range(max(1, concurrency)))
+    return stored
+
+
+def extend_saved_index(index: SavedIndex, stored: Iterable[Dict[str, Any]]) -> SavedIndex:
+    """Add freshly stored papers to ``index`` the way fetch_and_store_paper records them."""
+    dois, titles, ids = set(index[0]), set(index[1]), set(index[2])
+    for paper in stored:
+        ids.add(paper["paperId"])
+        if doi := _normalize_key((paper.get("externalIds") or {}).get("DOI")):
+            dois.add(doi)
+        if title := _normalize_key(paper.get("title")):
+            titles.add(title)
+    return frozenset(dois), frozenset(titles), frozenset(ids)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run the corpus builder only on DOIs not already saved."
+    )
+    parser.add_argument(
+        "--source",
+        type=Path,
+        default=DEFAULT_SCRAPED,
+        help="Scraped JSON file with publication metadata",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Process only the first N filtered entries",
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=DEFAULT_DELAY,
+        help="Seconds to wait between Semantic Scholar requests",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Entries enriched at once (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--backoff",
+        type=float,
+        default=DEFAULT_BACKOFF,
+        help="Seconds to wait after a 429 response",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Suppress informational logging",
+    )
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+
+    if not args.source.exists():
+        raise SystemExit(f"No scraped file found at {args.source}")
+
+    entries = load_scraped_entries(args.source)
+    if not entries:
+        raise SystemExit("No publications in the scraped payload")
+
+    storage = PaperStorage()
+    index = load_existing_metadata(storage)
+    saved_dois, saved_titles, saved_ids = index
+    filtered = filter_entries(entries, saved_dois, saved_titles)
+
+    if args.limit:
+        filtered = filtered[: args.limit]
+
+    logging.info("Filtered down to %d entries to fetch", len(filtered))
+    if not filtered:
+        logging.info("Nothing new to do.")
+        return
+
+    stored = await enrich_batch(
+        filtered,
+        storage,
+        rate_limit_delay=args.delay,
+        rate_limit_backoff=args.backoff,
+        known_ids=saved_ids,
+        concurrency=args.concurrency,
+    )
+    if stored:
+        # Incremental update instead of rescanning the collection next run.
+        write_saved_index(extend_saved_index(index, stored))
+
+
+def run() -> None:
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    run()
+
@@ -21,6 +21,8 @@ from typing import Optional, Any
 from dataclasses import dataclass, field
 from datetime import timedelta
 
+from .context_card_registry import load_context_card_registry as _load_registry_with_journal
+
 # ============================================================================
 # Configuration
 # ============================================================================
@@ -215,11 +217,7 @@ def load_window_segments_from_json(episode_id: str) -> list[dict]:
 
 def load_context_card_registry_from_json() -> dict:
     """Load the context card registry with all evidence cards from JSON."""
-    if not CONTEXT_CARD_REGISTRY_FILE.exists():
-        return {"segments": {}}
-
-    with CONTEXT_CARD_REGISTRY_FILE.open() as f:
-        return json.load(f)
+    return _load_registry_with_journal(CONTEXT_CARD_REGISTRY_FILE)
 
 
 # ============================================================================
@@ -0,0 +1,105 @@
+"""
+Reader for the context card registry written by `scripts/context_card_builder.py`.
+
+The registry is a JSON snapshot (`context_card_registry.json`) plus an
+append-only journal (`context_card_registry.jsonl`) holding segments recorded
+since the snapshot was last rewritten. Every reader must replay the journal
+on top of the snapshot, so they all go through `load_context_card_registry`.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson  # type: ignore[import]
+except ImportError:  # pragma: no cover - stdlib json is the fallback codec
+    orjson = None
+
+CONTEXT_CARD_REGISTRY_FILE = Path(__file__).parent.parent.parent / "data" / "context_card_registry.json"
+
+_REGISTRY_METADATA_KEYS = ("podcast_id", "episode_title", "processed_date")
+
+logger = logging.getLogger(__name__)
+
+
+def _loads_json(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def default_registry() -> dict[str, Any]:
+    return {
+        "podcast_id": "",
+        "episode_title": "",
+        "processed_date": "",
+        "segments": {},
+    }
+
+
+def registry_journal_path(path: Path) -> Path:
+    return path.with_suffix(".jsonl")
+
+
+def load_registry_snapshot(path: Path) -> dict[str, Any]:
+    """Load and normalize the snapshot alone, without the journal."""
+    if not path.exists():
+        return default_registry()
+    try:
+        raw = _loads_json(path.read_bytes())
+    except ValueError:
+        logger.warning("Registry file corrupted. Recreating a clean one.")
+        return default_registry()
+
+    if not isinstance(raw, dict):
+        logger.warning("Registry data invalid; resetting to empty registry.")
+        return default_registry()
+
+    normalized = default_registry()
+    for key in _REGISTRY_METADATA_KEYS:
+        value = raw.get(key)
+        if isinstance(value, str):
+            normalized[key] = value
+
+    segments = raw.get("segments")
+    if isinstance(segments, dict):
+        normalized["segments"] = segments
+    return normalized
+
+
+def replay_registry_journal(path: Path, registry: dict[str, Any]) -> int:
+    """Apply the journal next to `path` onto `registry`; returns the entries replayed."""
+    journal_path = registry_journal_path(path)
+    if not journal_path.exists():
+        return 0
+    replayed = 0
+    with journal_path.open("rb") as handle:
+        for line in handle:
+            try:
+                entry = _loads_json(line)
+            except ValueError:
+                # A crash mid-append leaves at most one partial trailing line.
+                logger.warning("Skipping unreadable registry journal line.")
+                continue
+            if not isinstance(entry, dict):
+                continue
+            segment_key = entry.get("segment_key")
+            segment = entry.get("segment")
+            if not isinstance(segment_key, str) or not isinstance(segment, dict):
+                continue
+            for key in _REGISTRY_METADATA_KEYS:
+                value = entry.get(key)
+                if isinstance(value, str):
+                    registry[key] = value
+            registry["segments"][segment_key] = segment
+            replayed += 1
+    return replayed
+
+
+def load_context_card_registry(path: Path = CONTEXT_CARD_REGISTRY_FILE) -> dict[str, Any]:
+    """Load the registry snapshot with any journaled segments applied."""
+    registry = load_registry_snapshot(path)
+    replay_registry_journal(path, registry)
+    return registry
@@ -13,19 +13,24 @@ from typing import Any, Literal, Optional, Sequence
 from pydantic import BaseModel, Field
 from fastmcp import FastMCP
 
+from .context_card_registry import load_context_card_registry
 from .storage import PaperStorage, fetch_and_store_paper
 
-# Gemini imports
-try:
-    from google import genai  # type: ignore[import]
-except ImportError:
-    genai = None
-
 # Gemini configuration
 GEMINI_API_KEY_ENV = "GEMINI_API_KEY"
 GEMINI_MODEL_DEFAULT = os.environ.get("GEMINI_MODEL", "gemini-3-pro-preview")
 _GENAI_CLIENT = None
 
+
+def _load_genai():
+    """Import google.genai on first use so importing the server stays SDK-free."""
+    try:
+        from google import genai  # type: ignore[import]
+    except ImportError:
+        return None
+    return genai
+
+
 # Slide Generation
 SLIDES_BUCKET = "generated-slides"
 NANO_BANANA_MODEL = "gemini-3-pro-image-preview"  # Nano Banana Pro for image generation
@@ -244,6 +249,7 @@ def _ensure_gemini_client_ready() -> None:
         return
     if _request_gemini_key.get() is not None:
         return
+    genai = _load_genai()
     if genai is None:
         return
     api_key = os.environ.get(GEMINI_API_KEY_ENV)
@@ -264,6 +270,7 @@ def _get_genai_client():
             "A Gemini API key is required to use AI features. "
             "Please add your key in Settings."
         )
+    genai = _load_genai()
     if genai is None:
         raise RuntimeError("google.genai is not installed. Run: pip install google-genai")
     return genai.Client(api_key=request_key)
@@ -1455,14 +1462,8 @@ PAPERS_COLLECTION_PATH = Path(__file__).resolve().parent.parent.parent / "data"
 
 
 def _load_context_card_registry() -> dict[str, Any]:
-    """Load the context card registry."""
-    if not CONTEXT_CARD_REGISTRY_PATH.exists():
-        return {}
-    try:
-        with CONTEXT_CARD_REGISTRY_PATH.open() as fh:
-            return json_module.load(fh)
-    except json_module.JSONDecodeError:
-        return {}
+    """Load the context card registry, including journaled segments."""
+    return load_context_card_registry(CONTEXT_CARD_REGISTRY_PATH)
 
 
 def _load_papers_collection() -> dict[str, Any]:
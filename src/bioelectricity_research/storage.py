@@ -9,9 +9,11 @@ Handles:
 - Paper retrieval and querying
 """
 
+import asyncio
 import json
 import os
 import re
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
@@ -29,6 +31,10 @@ PDF_CACHE_DIR = STORAGE_DIR / "pdfs"
 
 class PaperStorage:
     """Manages the paper collection storage."""
+
+    # add_paper may run on worker threads (see fetch_and_store_paper); the
+    # load-modify-save cycle must not interleave across them.
+    _write_lock = threading.Lock()
     
     def __init__(self):
         """Initialize storage, creating directories and file if needed."""
@@ -61,8 +67,11 @@ class PaperStorage:
         data["metadata"]["last_updated"] = datetime.now().isoformat()
         data["metadata"]["total_papers"] = len(data["papers"])
         
-        with open(STORAGE_FILE, 'w') as f:
+        # Write-then-rename so concurrent readers never see a partial file.
+        tmp_path = STORAGE_FILE.with_suffix(".json.tmp")
+        with open(tmp_path, 'w') as f:
             json.dump(data, f, indent=2)
+        os.replace(tmp_path, STORAGE_FILE)
     
     def paper_exists(self, paper_id: str) -> bool:
         """Check if paper is already in collection."""
@@ -76,9 +85,10 @@ class PaperStorage:
     
     def add_paper(self, paper_id: str, paper_data: dict):
         """Add or update a paper in the collection."""
-        data = self.load()
-        data["papers"][paper_id] = paper_data
-        self.save(data)
+        with self._write_lock:
+            data = self.load()
+            data["papers"][paper_id] = paper_data
+            self.save(data)
     
     def list_papers(
         self,
@@ -283,8 +293,11 @@ class ArxivClient:
             if pdf_path.exists():
                 return pdf_path
             
-            paper = next(arxiv.Search(id_list=[arxiv_id]).results())
-            paper.download_pdf(filename=str(pdf_path))
+            # The arxiv client is synchronous; keep it off the event loop.
+            paper = await asyncio.to_thread(
+                lambda: next(arxiv.Search(id_list=[arxiv_id]).results())
+            )
+            await asyncio.to_thread(paper.download_pdf, filename=str(pdf_path))
             
             return pdf_path
         
@@ -348,7 +361,7 @@ async def fetch_and_store_paper(
         if pdf_url:
             pdf_path = await pdf_parser.download_pdf(pdf_url, paper_id)
             if pdf_path:
-                full_text = pdf_parser.extract_text(pdf_path)
+                full_text = await asyncio.to_thread(pdf_parser.extract_text, pdf_path)
                 if full_text:
                     paper_data["content"]["full_text"] = full_text
                     paper_data["content"]["full_text_available"] = True
@@ -361,14 +374,15 @@ async def fetch_and_store_paper(
         if arxiv_id:
             pdf_path = await arxiv_client.download_pdf(arxiv_id, paper_id)
             if pdf_path:
-                full_text = pdf_parser.extract_text(pdf_path)
+                full_text = await asyncio.to_thread(pdf_parser.extract_text, pdf_path)
                 if full_text:
                     paper_data["content"]["full_text"] = full_text
                     paper_data["content"]["full_text_available"] = True
                     paper_data["content"]["source"] = "arxiv"
                     paper_data["sections"] = pdf_parser.detect_sections(full_text)
     
-    # Store the paper
-    storage.add_paper(paper_id, paper_data)
+    # Store the paper (PDF parsing and the collection rewrite run on threads
+    # so concurrent callers keep the event loop free)
+    await asyncio.to_thread(storage.add_paper, paper_id, paper_data)
     
     return paper_data
@@ -0,0 +1,27 @@
+-- Migration: Add duplicate claim_text RPC
+-- Date: 2026-10-17
+--
+-- Returns only the groups of active claims in an episode that share the same
+-- (whitespace-trimmed) claim_text, so scripts/dedupe_by_claim_text.py no longer
+-- has to download every claim of the episode to find them.
+
+CREATE OR REPLACE FUNCTION find_dup_claim_texts(p_podcast_id text)
+RETURNS TABLE (
+    claim_text text,
+    claim_ids bigint[],
+    claim_count integer
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        btrim(c.claim_text, E' \t\n\r\f\v') AS claim_text,
+        array_agg(c.id ORDER BY c.start_ms) AS claim_ids,
+        count(*)::integer AS claim_count
+    FROM claims c
+    WHERE c.podcast_id = p_podcast_id
+    AND c.duplicate_of IS NULL  -- Exclude duplicates
+    AND btrim(c.claim_text, E' \t\n\r\f\v') <> ''
+    GROUP BY btrim(c.claim_text, E' \t\n\r\f\v')
+    HAVING count(*) > 1;
+$$;
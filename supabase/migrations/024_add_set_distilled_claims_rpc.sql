@@ -0,0 +1,32 @@
+-- Migration: Add bulk distilled-claim update RPC
+-- Date: 2026-10-17
+--
+-- Lets scripts/enrich_with_distillation_supabase.py write a batch of
+-- distillations in one request (and one transaction) instead of one PATCH per
+-- claim. A partial-row upsert can't be used here because the INSERT half trips
+-- the NOT NULL columns of claims.
+--
+-- p_rows: [{"id": 123, "distilled_claim": "...", "distilled_word_count": 12}, ...]
+
+CREATE OR REPLACE FUNCTION set_distilled_claims(p_rows jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    updated_count integer;
+BEGIN
+    UPDATE claims c
+    SET
+        distilled_claim = r.distilled_claim,
+        distilled_word_count = r.distilled_word_count
+    FROM jsonb_to_recordset(p_rows) AS r(
+        id bigint,
+        distilled_claim text,
+        distilled_word_count integer
+    )
+    WHERE c.id = r.id;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$;
@@ -0,0 +1,3 @@
+# test_mcp_server.py is a manual smoke script for the removed
+# bioelectricity_research.api module; it has no test functions to collect.
+collect_ignore = ["test_mcp_server.py"]
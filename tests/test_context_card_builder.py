@@ -0,0 +1,302 @@
+import asyncio
+import io
+import json
+import logging
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from scripts import context_card_builder as builder
+
+
+class LazyGenaiImportTests(unittest.TestCase):
+    def test_importing_the_builder_does_not_load_the_sdk(self):
+        # A fresh interpreter: other tests in this process may import the SDK.
+        code = (
+            "import sys\n"
+            "from scripts import context_card_builder\n"
+            "print(any(name.startswith('google.genai') for name in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "False")
+
+
+class BatchQueueTests(unittest.IsolatedAsyncioTestCase):
+    async def test_coalesces_submissions_into_one_batch(self):
+        batches = []
+
+        async def handler(items):
+            batches.append(list(items))
+            return [item * 10 for item in items]
+
+        queue = builder.BatchQueue(handler, max_batch_size=3, max_wait_ms=1000)
+        results = await asyncio.gather(*(queue.submit(i) for i in (1, 2, 3)))
+        self.assertEqual(results, [10, 20, 30])
+        self.assertEqual(batches, [[1, 2, 3]])
+
+    async def test_flushes_partial_batch_after_wait(self):
+        async def handler(items):
+            return items
+
+        queue = builder.BatchQueue(handler, max_batch_size=8, max_wait_ms=10)
+        self.assertEqual(await queue.submit("only"), "only")
+
+    async def test_handler_error_fails_every_item(self):
+        async def handler(items):
+            raise RuntimeError("quota")
+
+        queue = builder.BatchQueue(handler, max_batch_size=2, max_wait_ms=1000)
+        results = await asyncio.gather(queue.submit(1), queue.submit(2), return_exceptions=True)
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+    async def test_exception_result_fails_only_its_item(self):
+        async def handler(items):
+            return [ValueError("bad") if item == 2 else item for item in items]
+
+        queue = builder.BatchQueue(handler, max_batch_size=3, max_wait_ms=1000)
+        results = await asyncio.gather(
+            *(queue.submit(i) for i in (1, 2, 3)), return_exceptions=True
+        )
+        self.assertEqual(results[0], 1)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], 3)
+
+
+class GeminiBatchFallbackTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.object(builder, "_RESPONSE_CACHE", None),
+            mock.patch.object(builder, "_GENAI_CLIENT", object()),
+            mock.patch.object(builder, "_generate_gemini", self._fake_batch_call),
+            mock.patch.object(builder, "_call_gemini_claim_detector", self._fake_single_call),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.batch_reply = ""
+        self.single_calls = []
+
+    async def _fake_batch_call(self, model_name, prompt, send=None):
+        return SimpleNamespace(text=self.batch_reply)
+
+    async def _fake_single_call(self, segment_text, user_note, max_claims, model_name):
+        self.single_calls.append(segment_text)
+        if segment_text == "fails again":
+            raise RuntimeError("single call failed")
+        return [{"claim_text": f"single: {segment_text}"}], {}, {"token_count": None}
+
+    async def _run_batch(self, texts):
+        segments = [{"text": text, "note": None} for text in texts]
+        return await builder._call_gemini_claim_detector_batch(segments, 5, "gemini-test")
+
+    async def test_only_malformed_entries_are_retried(self):
+        self.batch_reply = json.dumps({
+            "segment_0": [{"claim_text": "first claim"}],
+            "segment_1": [{"research_query": "no claim text"}],
+            "segment_2": [],
+            "segment_3": "not a list",
+        })
+        results = await self._run_batch(["one", "two", "three", "four"])
+
+        self.assertEqual(self.single_calls, ["two", "four"])
+        self.assertEqual(results[0][0][0]["claim_text"], "first claim")
+        self.assertEqual(results[0][2]["batch_size"], 4)
+        self.assertEqual(results[1][0], [{"claim_text": "single: two"}])
+        self.assertEqual(results[2][0], [])
+        self.assertEqual(results[3][0], [{"claim_text": "single: four"}])
+
+    async def test_omitted_entry_is_retried(self):
+        self.batch_reply = json.dumps({"segment_0": [{"claim_text": "kept"}]})
+        results = await self._run_batch(["one", "two"])
+        self.assertEqual(self.single_calls, ["two"])
+        self.assertEqual(results[1][0], [{"claim_text": "single: two"}])
+
+    async def test_unusable_reply_retries_every_segment(self):
+        self.batch_reply = "I could not produce JSON for these segments."
+        results = await self._run_batch(["one", "two"])
+        self.assertEqual(self.single_calls, ["one", "two"])
+        self.assertEqual([result[0][0]["claim_text"] for result in results], ["single: one", "single: two"])
+
+    async def test_failed_retry_is_returned_in_place(self):
+        self.batch_reply = json.dumps({"segment_0": [{"claim_text": "kept"}], "segment_1": 42})
+        results = await self._run_batch(["one", "fails again"])
+        self.assertEqual(results[0][0][0]["claim_text"], "kept")
+        self.assertIsInstance(results[1], RuntimeError)
+
+
+class RagQueryTests(unittest.IsolatedAsyncioTestCase):
+    async def test_hits_are_shared_in_flight_but_not_stored(self):
+        calls = []
+
+        async def fake_rag_search(query, n_results, response_format):
+            calls.append(query)
+            await asyncio.sleep(0)
+            return json.dumps({"results": [{"paper_id": f"p{len(calls)}"}]})
+
+        cache = mock.Mock()
+        with mock.patch.object(builder, "rag_search", fake_rag_search), \
+                mock.patch.object(builder, "_RESPONSE_CACHE", cache):
+            first, second = await asyncio.gather(
+                builder.query_rag_for_claim("planaria  voltage"),
+                builder.query_rag_for_claim("planaria voltage"),
+            )
+            self.assertEqual(first, second)
+            # A later run (e.g. --redo after a re-index) searches again.
+            third = await builder.query_rag_for_claim("planaria voltage")
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(third, ([{"paper_id": "p2"}], None))
+        self.assertEqual(cache.method_calls, [])
+
+
+class StreamedReplyTests(unittest.IsolatedAsyncioTestCase):
+    async def test_usage_comes_from_the_final_chunk(self):
+        claim = {
+            "claim_text": "Voltage patterns store the target morphology.",
+            "speaker_stance": "assertion",
+            "research_query": "bioelectric pattern memory planaria",
+            "needs_backing_because": "Strong mechanistic claim.",
+            "confidence_score": 0.9,
+        }
+        reply = json.dumps([claim])
+        chunks = [
+            SimpleNamespace(text=reply[:20]),
+            SimpleNamespace(text=reply[20:]),
+            SimpleNamespace(text="\n", token_count=321),
+        ]
+
+        async def stream():
+            for chunk in chunks:
+                yield chunk
+
+        async def generate_content_stream(model, contents):
+            return stream()
+
+        client = SimpleNamespace(
+            aio=SimpleNamespace(models=SimpleNamespace(generate_content_stream=generate_content_stream))
+        )
+        with mock.patch.object(builder, "_GENAI_CLIENT", client), \
+                mock.patch.object(builder, "_RESPONSE_CACHE", None):
+            claims, _, metadata = await builder.identify_claims_with_gemini(
+                "Planaria remember their shape.", None, model_name="gemini-test"
+            )
+
+        self.assertEqual(metadata["token_count"], 321)
+        self.assertEqual([c["claim_text"] for c in claims], [claim["claim_text"]])
+
+
+class SegmentJobTagTests(unittest.TestCase):
+    def test_blank_metadata_tag_does_not_hide_payload_tag(self):
+        args = builder._build_parser().parse_args(["--stdin-jsonl"])
+        job = builder._build_segment_job(
+            {
+                "text": "Planaria regenerate.",
+                "context_tags": {"organism": "frog", "field": "biology"},
+                "metadata": {"context_tags": {"organism": " ", "field": "bioelectricity"}},
+            },
+            args,
+            {},
+        )
+        self.assertEqual(job.context_tags, {"organism": "frog", "field": "bioelectricity"})
+
+
+class ProcessedAtTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.args = builder._build_parser().parse_args(["--stdin-jsonl"])
+        self.jobs = [
+            builder._build_segment_job({"text": text, "timestamp": stamp}, self.args, {})
+            for text, stamp in (("first", "00:01:00"), ("second", "00:02:00"))
+        ]
+        self.stamps = []
+        clock = iter(["2026-01-01T00:00:00+00:00", "2026-01-01T06:00:00+00:00"])
+        patches = [
+            mock.patch.object(builder, "_process_one", self._record),
+            mock.patch.object(builder, "_utc_timestamp", lambda: next(clock)),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    async def _record(self, job, args, registry, registry_lock, processed_at, gemini_queue=None):
+        self.stamps.append(processed_at)
+
+    async def test_stream_stamps_each_job(self):
+        runner = builder.SegmentRunner(self.args, {}, 1)
+        for job in self.jobs:
+            await runner.run(job)
+        self.assertEqual(self.stamps, ["2026-01-01T00:00:00+00:00", "2026-01-01T06:00:00+00:00"])
+
+    async def test_batch_shares_one_stamp(self):
+        await builder._gather_bounded(self.jobs, self.args, {}, 2)
+        self.assertEqual(self.stamps, ["2026-01-01T00:00:00+00:00"] * 2)
+
+
+class DaemonRequestTests(unittest.IsolatedAsyncioTestCase):
+    async def test_log_records_reach_the_client(self):
+        async def fake_run_jobs(jobs, args):
+            logging.warning("rag_search unavailable for %s", args.podcast_id)
+            print("processed")
+
+        reader = asyncio.StreamReader()
+        reader.feed_data(json.dumps({"argv": ["--podcast-id", "lex_325"], "cwd": "/"}).encode() + b"\n")
+        writer = mock.Mock(drain=mock.AsyncMock(), wait_closed=mock.AsyncMock())
+        with mock.patch.object(builder, "_prepare_jobs", return_value=[]), \
+                mock.patch.object(builder, "_run_jobs", fake_run_jobs), \
+                self.assertLogs(level="WARNING"):
+            await builder._handle_daemon_request(reader, writer, asyncio.Lock())
+
+        response = json.loads(writer.write.call_args.args[0])
+        self.assertEqual(response["status"], 0)
+        self.assertIn("WARNING: rag_search unavailable for lex_325", response["output"])
+        self.assertIn("processed", response["output"])
+
+    async def test_handler_is_removed_after_the_request(self):
+        handlers = list(logging.getLogger().handlers)
+        with builder._log_to(io.StringIO()):
+            self.assertEqual(len(logging.getLogger().handlers), len(handlers) + 1)
+        self.assertEqual(logging.getLogger().handlers, handlers)
+
+
+class ForwardToDaemonTests(unittest.TestCase):
+    def test_no_socket_means_no_daemon(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.assertIsNone(builder._forward_to_daemon(Path(tmp_dir) / "missing.sock", []))
+
+    def test_empty_reply_means_no_daemon(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            socket_path = Path(tmp_dir) / "daemon.sock"
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(str(socket_path))
+            server.listen(1)
+
+            def hang_up():
+                connection, _ = server.accept()
+                connection.recv(4096)
+                connection.close()
+
+            thread = threading.Thread(target=hang_up)
+            thread.start()
+            try:
+                self.assertIsNone(builder._forward_to_daemon(socket_path, ["--text", "x"]))
+            finally:
+                thread.join()
+                server.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.bioelectricity_research.context_card_registry import (
+    load_context_card_registry,
+    registry_journal_path,
+)
+from scripts import context_card_builder as builder
+
+
+class RegistryJournalTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = Path(self.tmp_dir.name) / "context_card_registry.json"
+        self.journal = registry_journal_path(self.path)
+
+    def _write_snapshot(self, segments):
+        self.path.write_text(json.dumps({
+            "podcast_id": "lex_325",
+            "episode_title": "Snapshot title",
+            "processed_date": "2026-01-01T00:00:00Z",
+            "segments": segments,
+        }))
+
+    def _append(self, registry, key, entry):
+        registry["segments"][key] = entry
+        builder.append_registry_segment(self.path, registry, key, entry)
+
+    def test_reader_sees_journaled_segments(self):
+        self._write_snapshot({"lex_325|00:00:00|1": {"card_count": 1}})
+        registry = builder.load_registry(self.path)
+        registry["episode_title"] = "Journal title"
+        self._append(registry, "lex_325|00:03:00|2", {"card_count": 2})
+        self._append(registry, "lex_325|00:00:00|1", {"card_count": 3})
+
+        loaded = load_context_card_registry(self.path)
+        self.assertEqual(loaded["episode_title"], "Journal title")
+        self.assertEqual(loaded["segments"], {
+            "lex_325|00:00:00|1": {"card_count": 3},
+            "lex_325|00:03:00|2": {"card_count": 2},
+        })
+        # The snapshot itself is untouched until compaction.
+        self.assertEqual(json.loads(self.path.read_text())["episode_title"], "Snapshot title")
+
+    def test_replay_skips_partial_and_invalid_lines(self):
+        self._write_snapshot({})
+        with self.journal.open("w") as handle:
+            handle.write(json.dumps({"segment_key": "a", "segment": {"card_count": 1}}) + "\n")
+            handle.write(json.dumps(["not", "an", "entry"]) + "\n")
+            handle.write(json.dumps({"segment_key": "b", "segment": "not a dict"}) + "\n")
+            handle.write('{"segment_key": "c", "seg')
+
+        with self.assertLogs(level="WARNING"):
+            loaded = load_context_card_registry(self.path)
+        self.assertEqual(loaded["segments"], {"a": {"card_count": 1}})
+
+    def test_missing_files_give_empty_registry(self):
+        loaded = load_context_card_registry(self.path)
+        self.assertEqual(loaded["segments"], {})
+        self.assertEqual(loaded["podcast_id"], "")
+
+    def test_compacts_after_threshold(self):
+        self._write_snapshot({})
+        registry = builder.load_registry(self.path)
+        with mock.patch.object(builder, "REGISTRY_COMPACT_EVERY", 3):
+            self._append(registry, "a", {"n": 1})
+            self._append(registry, "b", {"n": 2})
+            self.assertTrue(self.journal.exists())
+            self._append(registry, "c", {"n": 3})
+
+        self.assertFalse(self.journal.exists())
+        snapshot = json.loads(self.path.read_text())
+        self.assertEqual(set(snapshot["segments"]), {"a", "b", "c"})
+        self.assertEqual(load_context_card_registry(self.path)["segments"], snapshot["segments"])
+
+    def test_threshold_counts_entries_left_by_earlier_processes(self):
+        self._write_snapshot({})
+        with mock.patch.object(builder, "REGISTRY_COMPACT_EVERY", 3):
+            for key in ("a", "b"):
+                # One short-lived process per window: load, append one, exit.
+                registry = builder.load_registry(self.path)
+                self._append(registry, key, {"key": key})
+            self.assertEqual(len(self.journal.read_text().splitlines()), 2)
+
+            registry = builder.load_registry(self.path)
+            self._append(registry, "c", {"key": "c"})
+
+        self.assertFalse(self.journal.exists())
+        self.assertEqual(
+            set(json.loads(self.path.read_text())["segments"]), {"a", "b", "c"}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import json
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from convert_assemblyai_to_windows import (
+    build_windows,
+    expand_windows,
+    iter_windows,
+    utterance_columns,
+    utterance_records,
+    write_windows,
+)
+
+
+def reference_build_windows(utterances, window_duration_ms=180_000, overlap_ms=60_000):
+    """The original scan-every-utterance implementation, for parity checks."""
+    def ms_to_timestamp(ms):
+        seconds, millis = divmod(ms, 1000)
+        return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}.{millis:03d}"
+
+    if not utterances:
+        return []
+    max_end_ms = max(u.get("end", 0) for u in utterances)
+    windows = []
+    window_id = 1
+    window_start_ms = 0
+    step_ms = window_duration_ms - overlap_ms
+    while window_start_ms < max_end_ms:
+        window_end_ms = window_start_ms + window_duration_ms
+        members = [
+            {
+                "speaker": u.get("speaker", ""),
+                "start_ms": u.get("start", 0),
+                "end_ms": u.get("end", 0),
+                "text": u.get("text", ""),
+            }
+            for u in utterances
+            if u.get("start", 0) < window_end_ms and u.get("end", 0) > window_start_ms
+        ]
+        if members:
+            actual_start = min(u["start_ms"] for u in members)
+            actual_end = max(u["end_ms"] for u in members)
+            windows.append({
+                "window_id": window_id,
+                "start_timestamp": ms_to_timestamp(actual_start),
+                "end_timestamp": ms_to_timestamp(actual_end),
+                "start_ms": actual_start,
+                "end_ms": actual_end,
+                "text": " ".join(u["text"] for u in members),
+                "utterances": members,
+            })
+            window_id += 1
+        window_start_ms += step_ms
+    return windows
+
+
+def make_utterances(count, seed):
+    rng = random.Random(seed)
+    utterances = []
+    start = 0
+    for i in range(count):
+        # Gaps of silence, overlapping speakers and a few very long turns.
+        start += rng.choice([0, 500, 4_000, 90_000, 400_000])
+        duration = rng.choice([800, 5_000, 30_000, 250_000])
+        utterances.append({
+            "speaker": rng.choice("AB"),
+            "start": start,
+            "end": start + duration,
+            "text": f"utterance {i} ünïcode",
+        })
+    return utterances
+
+
+class WindowParityTests(unittest.TestCase):
+    CONFIGS = [(180_000, 60_000), (60_000, 0), (30_000, 10_000)]
+
+    def test_build_windows_matches_reference(self):
+        for seed in range(5):
+            utterances = make_utterances(60, seed)
+            for duration, overlap in self.CONFIGS:
+                with self.subTest(seed=seed, duration=duration, overlap=overlap):
+                    self.assertEqual(
+                        build_windows(utterances, duration, overlap),
+                        reference_build_windows(utterances, duration, overlap),
+                    )
+
+    def test_iter_windows_accepts_prebuilt_columns(self):
+        utterances = make_utterances(40, 7)
+        columns = utterance_columns(utterances)
+        for duration, overlap in self.CONFIGS:
+            self.assertEqual(
+                list(iter_windows(columns, duration, overlap)),
+                build_windows(utterances, duration, overlap),
+            )
+
+    def test_compact_windows_expand_to_full_windows(self):
+        utterances = make_utterances(40, 11)
+        compact = list(iter_windows(utterances, compact=True))
+        payload = {"utterances": utterance_records(utterances), "windows": compact}
+        self.assertEqual(expand_windows(payload), build_windows(utterances))
+
+    def test_empty_input(self):
+        self.assertEqual(build_windows([]), [])
+
+
+class WriteWindowsTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = Path(self.tmp_dir.name) / "windows.json"
+
+    def test_streamed_file_matches_json_dumps(self):
+        windows = build_windows(make_utterances(30, 3))
+        count, first, last = write_windows(self.path, iter(windows))
+        self.assertEqual(count, len(windows))
+        self.assertEqual(first, windows[0])
+        self.assertEqual(last, windows[-1])
+        self.assertEqual(
+            self.path.read_text(encoding="utf-8"),
+            json.dumps(windows, ensure_ascii=False, indent=2),
+        )
+
+    def test_empty_window_list(self):
+        self.assertEqual(write_windows(self.path, iter([])), (0, None, None))
+        self.assertEqual(json.loads(self.path.read_text()), [])
+
+    def test_compact_layout_round_trips(self):
+        utterances = make_utterances(30, 5)
+        records = utterance_records(utterances)
+        write_windows(self.path, iter_windows(utterances, compact=True), utterances=records)
+        payload = json.loads(self.path.read_text(encoding="utf-8"))
+        self.assertEqual(payload["utterances"], records)
+        self.assertEqual(expand_windows(payload), build_windows(utterances))
+
+
+if __name__ == "__main__":
+    unittest.main()
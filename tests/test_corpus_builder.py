@@ -0,0 +1,146 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from unittest import mock
+
+import httpx
+
+from bioelectricity_research.cli import corpus_builder, corpus_builder_filtered
+
+
+def _response(status_code, headers=None):
+    request = httpx.Request("GET", "https://api.semanticscholar.org/graph/v1/paper/x")
+    return httpx.Response(status_code, headers=headers, request=request)
+
+
+class RetryAfterTests(unittest.TestCase):
+    def test_missing_header_uses_default(self):
+        self.assertEqual(corpus_builder._retry_after_seconds(_response(429), 7.5), 7.5)
+
+    def test_delta_seconds(self):
+        response = _response(429, {"Retry-After": "12"})
+        self.assertEqual(corpus_builder._retry_after_seconds(response, 1.0), 12.0)
+
+    def test_negative_delta_is_clamped(self):
+        response = _response(429, {"Retry-After": "-3"})
+        self.assertEqual(corpus_builder._retry_after_seconds(response, 1.0), 0.0)
+
+    def test_http_date(self):
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        response = _response(429, {"Retry-After": format_datetime(retry_at, usegmt=True)})
+        self.assertAlmostEqual(corpus_builder._retry_after_seconds(response, 1.0), 30.0, delta=2.0)
+
+    def test_past_http_date_is_clamped(self):
+        retry_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+        response = _response(429, {"Retry-After": format_datetime(retry_at, usegmt=True)})
+        self.assertEqual(corpus_builder._retry_after_seconds(response, 1.0), 0.0)
+
+    def test_unparseable_header_uses_default(self):
+        response = _response(429, {"Retry-After": "soon"})
+        self.assertEqual(corpus_builder._retry_after_seconds(response, 4.0), 4.0)
+
+
+class RetryOn429Tests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.sleeps = []
+
+        async def fake_sleep(delay):
+            self.sleeps.append(delay)
+
+        patch = mock.patch.object(corpus_builder.asyncio, "sleep", fake_sleep)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def _requester(self, responses):
+        remaining = list(responses)
+        calls = []
+
+        async def request():
+            calls.append(len(calls))
+            response = remaining.pop(0)
+            response.raise_for_status()
+            return response
+
+        return request, calls
+
+    async def test_retries_after_429_then_succeeds(self):
+        request, calls = self._requester([
+            _response(429, {"Retry-After": "2"}),
+            _response(429),
+            _response(200),
+        ])
+        with self.assertLogs("corpus_builder", level="WARNING"):
+            response = await corpus_builder.retry_on_429(request, backoff=1.0, attempts=3)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(calls), 3)
+        # Retry-After first, then exponential backoff (1.0 * 2**1); jitter adds < 1s.
+        self.assertGreaterEqual(self.sleeps[0], 2.0)
+        self.assertLess(self.sleeps[0], 3.0)
+        self.assertGreaterEqual(self.sleeps[1], 2.0)
+        self.assertLess(self.sleeps[1], 3.0)
+
+    async def test_final_429_is_raised(self):
+        request, calls = self._requester([_response(429), _response(429)])
+        with self.assertLogs("corpus_builder", level="WARNING"):
+            with self.assertRaises(httpx.HTTPStatusError):
+                await corpus_builder.retry_on_429(request, backoff=0.5, attempts=2)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(self.sleeps), 1)
+
+    async def test_other_errors_are_not_retried(self):
+        request, calls = self._requester([_response(500), _response(200)])
+        with self.assertRaises(httpx.HTTPStatusError):
+            await corpus_builder.retry_on_429(request, backoff=1.0)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.sleeps, [])
+
+
+class SavedIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        tmp = Path(self.tmp_dir.name)
+        self.collection = tmp / "papers_collection.json"
+        self.collection.write_text(json.dumps({"papers": {}}))
+        self.index_path = tmp / "saved_index.json"
+        patch = mock.patch.object(corpus_builder_filtered, "STORAGE_FILE", self.collection)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.index = (frozenset({"10.1/a"}), frozenset({"xenobots"}), frozenset({"s2:1"}))
+
+    def test_round_trip(self):
+        corpus_builder_filtered.write_saved_index(self.index, self.index_path)
+        self.assertEqual(corpus_builder_filtered._read_saved_index(self.index_path), self.index)
+
+    def test_stale_when_collection_changes(self):
+        corpus_builder_filtered.write_saved_index(self.index, self.index_path)
+        self.collection.write_text(json.dumps({"papers": {"s2:2": {}}}))
+        self.assertIsNone(corpus_builder_filtered._read_saved_index(self.index_path))
+
+    def test_missing_or_unreadable_file(self):
+        self.assertIsNone(corpus_builder_filtered._read_saved_index(self.index_path))
+        self.index_path.write_text("{not json")
+        self.assertIsNone(corpus_builder_filtered._read_saved_index(self.index_path))
+
+    def test_wrong_shape_is_rebuilt(self):
+        stamp = corpus_builder_filtered._collection_stamp()
+        payloads = [
+            [1, 2, 3],
+            "index",
+            {"collection": stamp},
+            {"collection": stamp, "dois": ["10.1/a"], "titles": ["x"]},
+            {"collection": stamp, "dois": "10.1/a", "titles": [], "ids": []},
+            {"collection": stamp, "dois": [1], "titles": [], "ids": []},
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                self.index_path.write_text(json.dumps(payload))
+                self.assertIsNone(corpus_builder_filtered._read_saved_index(self.index_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import deduplicate_claims
+from deduplicate_claims import fetch_claims, load_checkpoint, max_updated_at, save_checkpoint
+
+T0 = "2026-01-01T00:00:00+00:00"
+T1 = "2026-01-02T00:00:00+00:00"
+T2 = "2026-01-03T00:00:00+00:00"
+
+
+def claim(claim_id, start_ms, updated_at=T0, text=None):
+    return {
+        "id": claim_id,
+        "start_ms": start_ms,
+        "claim_text": text or f"claim {claim_id}",
+        "distilled_claim": None,
+        "distilled_word_count": None,
+        "updated_at": updated_at,
+    }
+
+
+class FakeDB:
+    def __init__(self, claims):
+        self.claims = {c["id"]: c for c in claims}
+        self.calls = []
+
+    def get_claims_for_episode(self, podcast_id, columns="*"):
+        self.calls.append(("episode", columns))
+        rows = sorted(self.claims.values(), key=lambda c: c["start_ms"])
+        if columns == "id":
+            return [{"id": c["id"]} for c in rows]
+        return [dict(c) for c in rows]
+
+    def get_claims_updated_since(self, podcast_id, since, columns="*"):
+        self.calls.append(("since", since))
+        return [dict(c) for c in self.claims.values() if c["updated_at"] >= since]
+
+
+class CheckpointMergeTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        patch = mock.patch.object(deduplicate_claims, "CHECKPOINT_DIR", Path(self.tmp_dir.name))
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def _checkpoint_for(self, claims):
+        save_checkpoint("lex_325", claims, max_updated_at(claims))
+        return load_checkpoint("lex_325")
+
+    def test_without_checkpoint_fetches_everything(self):
+        db = FakeDB([claim(1, 1000), claim(2, 2000)])
+        self.assertEqual([c["id"] for c in fetch_claims(db, "lex_325", None)], [1, 2])
+        self.assertEqual(db.calls, [("episode", "*")])
+
+    def test_checkpoint_keeps_only_dedupe_fields(self):
+        checkpoint = self._checkpoint_for([claim(1, 1000, T1)])
+        self.assertEqual(checkpoint["last_updated_at"], T1)
+        self.assertEqual(
+            set(checkpoint["claims"][0]), set(deduplicate_claims.CHECKPOINT_FIELDS)
+        )
+
+    def test_unchanged_returns_none(self):
+        claims = [claim(1, 1000, T0), claim(2, 2000, T1)]
+        checkpoint = self._checkpoint_for(claims)
+        db = FakeDB(claims)
+        # Claim 2 sits exactly on last_updated_at and comes back every time.
+        self.assertIsNone(fetch_claims(db, "lex_325", checkpoint))
+        self.assertEqual(db.calls, [("since", T1)])
+
+    def test_merges_changed_rows_and_drops_deleted(self):
+        claims = [claim(1, 1000, T0), claim(2, 2000, T0), claim(3, 3000, T1)]
+        checkpoint = self._checkpoint_for(claims)
+
+        db = FakeDB(claims)
+        del db.claims[2]  # deleted since the last run
+        db.claims[3] = claim(3, 3000, T2, text="edited claim 3")
+        db.claims[4] = claim(4, 1500, T2)  # new
+
+        merged = fetch_claims(db, "lex_325", checkpoint)
+        self.assertEqual([c["id"] for c in merged], [1, 4, 3])
+        self.assertEqual(merged[2]["claim_text"], "edited claim 3")
+        self.assertEqual(max_updated_at(merged, checkpoint["last_updated_at"]), T2)
+
+    def test_unreadable_or_empty_checkpoint_is_ignored(self):
+        path = Path(self.tmp_dir.name) / "lex_325.json"
+        path.write_text("{broken")
+        self.assertIsNone(load_checkpoint("lex_325"))
+        path.write_text('{"podcast_id": "lex_325", "last_updated_at": null, "claims": []}')
+        self.assertIsNone(load_checkpoint("lex_325"))
+
+    def test_no_timestamps_writes_no_checkpoint(self):
+        save_checkpoint("lex_325", [claim(1, 1000, None)], max_updated_at([claim(1, 1000, None)]))
+        self.assertFalse((Path(self.tmp_dir.name) / "lex_325.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,255 @@
+import io
+import json
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from difflib import SequenceMatcher
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import enrich_claims_with_timing as timing
+from enrich_claims_with_timing import (
+    build_ngram_index,
+    enrich_claim_with_timing,
+    enrich_claims_with_timing,
+    find_word_sequence_in_transcript,
+    normalize_text,
+    timestamp_to_ms,
+    transcript_columns,
+)
+
+
+def legacy_timestamp_to_ms(timestamp: str) -> int:
+    """The split-based parser timestamp_to_ms replaced."""
+    try:
+        if '|' in timestamp:
+            timestamp = timestamp.split('|')[1] if len(timestamp.split('|')) > 1 else timestamp
+        parts = timestamp.split(':')
+        if len(parts) == 3:
+            hours = int(parts[0])
+            minutes = int(parts[1])
+            seconds_parts = parts[2].split('.')
+            seconds = int(seconds_parts[0])
+            milliseconds = int(seconds_parts[1]) if len(seconds_parts) > 1 else 0
+            return (hours * 3600 + minutes * 60 + seconds) * 1000 + milliseconds
+    except:
+        pass
+    return 0
+
+
+def legacy_find_word_sequence(claim_words, transcript_words, min_match_ratio=0.6):
+    """The original per-window SequenceMatcher scan, for parity checks."""
+    claim_len = len(claim_words)
+    transcript_len = len(transcript_words)
+    if claim_len == 0 or transcript_len == 0:
+        return None
+    best_match = None
+    best_score = 0
+    claim_text = ' '.join(claim_words)
+    window_sizes = [int(claim_len * 1.0), int(claim_len * 1.3), int(claim_len * 1.5), int(claim_len * 0.7)]
+    for i in range(transcript_len - min(claim_len, 5) + 1):
+        for window_size in window_sizes:
+            end_idx = min(i + window_size, transcript_len)
+            window_text = ' '.join(normalize_text(transcript_words[j]['text']) for j in range(i, end_idx))
+            ratio = SequenceMatcher(None, claim_text, window_text).ratio()
+            if len(claim_words) > 20:
+                claim_prefix = ' '.join(claim_words[:20])
+                prefix_ratio = SequenceMatcher(None, claim_prefix, window_text[:len(claim_prefix)*2]).ratio()
+                ratio = max(ratio, prefix_ratio * 0.9)
+            if ratio > best_score:
+                best_score = ratio
+                best_match = (i, end_idx, ratio)
+    if best_match and best_match[2] >= min_match_ratio:
+        return best_match
+    return None
+
+
+TRANSCRIPT = (
+    "So what we found is that bioelectric signals guide regeneration in planaria. "
+    "If you change the voltage pattern, the worm grows two heads, and that state is stable. "
+    "It's remembered across cuts, which is remarkable. Frogs don't regenerate legs, "
+    "but a brief ionophore cocktail triggers leg growth in adult frogs over eighteen months."
+)
+
+CLAIMS = {
+    "exact": "Bioelectric signals guide regeneration in planaria.",
+    "paraphrase": "Changing the voltage pattern makes the worm grow two heads and the state is stable",
+    "long": (
+        "If you change the voltage pattern the worm grows two heads and that state is stable "
+        "and it is remembered across cuts which is really remarkable to us"
+    ),
+    "frogs": "Frogs do not regenerate legs but an ionophore cocktail triggers leg growth",
+    "absent": "Quantum computers will replace classical ones",
+}
+
+# (start_index, end_index, rounded score) of each claim in TRANSCRIPT
+EXPECTED = {
+    "exact": (6, 12, 1.0),
+    "paraphrase": (13, 28, 0.889),
+    "long": (12, 40, 0.865),
+    "frogs": (35, 47, 0.934),
+    "absent": None,
+}
+
+
+def transcript_words():
+    return [
+        {"text": word, "start": i * 350, "end": i * 350 + 300, "speaker": "A"}
+        for i, word in enumerate(TRANSCRIPT.split())
+    ]
+
+
+class RatioScorerTests(unittest.TestCase):
+    PAIRS = [
+        ("bioelectric signals guide regeneration in planaria",
+         "planaria regeneration is guided by bioelectric signaling"),
+        ("the worm grows two heads", "the worm grows two heads"),
+        ("voltage pattern", "an entirely unrelated sentence about frogs " * 10),
+        ("abc", ""),
+    ]
+
+    def test_scores_are_difflib_ratios_with_or_without_rapidfuzz(self):
+        for fuzz in (timing.fuzz, None):
+            with mock.patch.object(timing, "fuzz", fuzz):
+                for fixed, other in self.PAIRS:
+                    with self.subTest(rapidfuzz=fuzz is not None, fixed=fixed):
+                        self.assertEqual(
+                            timing.make_ratio_scorer(fixed)(other),
+                            SequenceMatcher(None, fixed, other).ratio(),
+                        )
+
+    def test_cutoff_only_hides_scores_that_cannot_win(self):
+        fixed, other = self.PAIRS[0]
+        exact = SequenceMatcher(None, fixed, other).ratio()
+        for fuzz in (timing.fuzz, None):
+            with mock.patch.object(timing, "fuzz", fuzz):
+                score = timing.make_ratio_scorer(fixed)
+                self.assertEqual(score(other, exact - 0.01), exact)
+                self.assertLessEqual(score(other, exact), exact)
+                self.assertEqual(score(other, 1.0), 0.0)
+
+
+class FindWordSequenceTests(unittest.TestCase):
+    def setUp(self):
+        self.words = transcript_words()
+        self.tokens = [normalize_text(w["text"]) for w in self.words]
+
+    def _find(self, claim):
+        return find_word_sequence_in_transcript(normalize_text(claim).split(), self.tokens)
+
+    def test_pinned_matches(self):
+        for fuzz in (timing.fuzz, None):
+            with mock.patch.object(timing, "fuzz", fuzz):
+                for name, expected in EXPECTED.items():
+                    with self.subTest(rapidfuzz=fuzz is not None, claim=name):
+                        match = self._find(CLAIMS[name])
+                        if expected is None:
+                            self.assertIsNone(match)
+                        else:
+                            self.assertEqual((*match[:2], round(match[2], 3)), expected)
+
+    def test_matches_legacy_scan(self):
+        for name, claim in CLAIMS.items():
+            with self.subTest(claim=name):
+                claim_words = normalize_text(claim).split()
+                self.assertEqual(
+                    find_word_sequence_in_transcript(claim_words, self.tokens),
+                    legacy_find_word_sequence(claim_words, self.words),
+                )
+
+
+class EnrichClaimTests(unittest.TestCase):
+    def setUp(self):
+        self.columns = transcript_columns(transcript_words())
+        self.index = build_ngram_index(self.columns.normalized)
+
+    def _enrich(self, claim, segment_text=""):
+        with redirect_stdout(io.StringIO()):
+            return enrich_claim_with_timing(
+                {"claim_text": claim}, self.columns, "lex_325|00:01:00.000|1",
+                segment_text, ngram_index=self.index,
+            )["timing"]
+
+    def test_segment_text_narrows_to_the_same_words(self):
+        segment_text = "that state is stable. It's remembered across cuts"
+        for name in ("exact", "frogs"):
+            with self.subTest(claim=name):
+                self.assertEqual(self._enrich(CLAIMS[name], segment_text), self._enrich(CLAIMS[name]))
+
+    def test_matched_timing(self):
+        result = self._enrich(CLAIMS["frogs"], "Frogs don't regenerate legs")
+        self.assertEqual((result["start_ms"], result["end_ms"]), (35 * 350, 46 * 350 + 300))
+        self.assertEqual(result["word_count"], 12)
+        self.assertEqual(result["words"][0]["text"], "Frogs")
+        self.assertEqual(result["match_confidence"], 0.934)
+
+    def test_unmatched_claim_falls_back_to_segment_time(self):
+        result = self._enrich(CLAIMS["absent"])
+        self.assertTrue(result["fallback"])
+        self.assertEqual((result["start_ms"], result["end_ms"]), (60_000, 90_000))
+
+
+class EnrichClaimsPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp = Path(self.tmp_dir.name)
+        self.transcript_path = self.tmp / "transcript.json"
+        self.transcript_path.write_text(json.dumps({"words": transcript_words()}))
+        # More claims than one imap chunk (16) so workers finish out of order
+        claims = list(CLAIMS.values())
+        segments = {
+            f"lex_325|00:0{n}:00.000|{n}": {
+                "timestamp": f"lex_325|00:0{n}:00.000|{n}",
+                "transcript_text": TRANSCRIPT,
+                "claims": [{"claim_text": claims[(n + k) % len(claims)], "k": k} for k in range(12)],
+            }
+            for n in range(3)
+        }
+        self.claims_path = self.tmp / "claims.json"
+        self.claims_path.write_text(json.dumps({"segments": segments}))
+
+    def _run(self, workers):
+        output_path = self.tmp / f"out_{workers}.json"
+        with redirect_stdout(io.StringIO()):
+            enrich_claims_with_timing(self.claims_path, self.transcript_path, output_path, workers)
+        return json.loads(output_path.read_text())
+
+    def test_pool_keeps_claims_in_input_order(self):
+        pooled = self._run(workers=3)
+        for segment in pooled["segments"].values():
+            self.assertEqual([claim["k"] for claim in segment["claims"]], list(range(12)))
+        self.assertEqual(pooled, self._run(workers=1))
+
+
+class TimestampToMsTests(unittest.TestCase):
+    CASES = [
+        "00:01:02.160",
+        "00:01:02",
+        "01:00:00.5",
+        "lex_325|00:01:02.160",
+        "lex_325|00:01:02.160|1",
+        "lex_325|01:02:03|window-2",
+        "00:01:02|1",
+        " 00:01:02.160 ",
+        "",
+        "garbage",
+        "1:2",
+        "1:2:3.",
+        "lex_325|",
+    ]
+
+    def test_matches_legacy_parser(self):
+        for timestamp in self.CASES:
+            with self.subTest(timestamp=timestamp):
+                self.assertEqual(timestamp_to_ms(timestamp), legacy_timestamp_to_ms(timestamp))
+
+    def test_segment_key_with_window_suffix(self):
+        self.assertEqual(timestamp_to_ms("lex_325|00:01:02.160|1"), 62160)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pymupdf
+from PIL import Image, ImageChops, ImageStat
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import extract_figures
+from extract_figures import FigureCoords, extract_figure_image, process_paper
+
+TEI_TEMPLATE = """<TEI xmlns="http://www.tei-c.org/ns/1.0"><text><body>{figures}</body></text></TEI>"""
+FIGURE_TEMPLATE = (
+    '<figure xmlns:xml="http://www.w3.org/XML/1998/namespace" xml:id="{figure_id}">'
+    '<head>Figure</head><graphic coords="{coords}"/></figure>'
+)
+
+
+def make_pdf(path, pages=2):
+    doc = pymupdf.open()
+    for number in range(pages):
+        page = doc.new_page(width=612, height=792)
+        page.draw_rect(pymupdf.Rect(100, 200, 300, 350), color=(1, 0, 0), fill=(0, 0, 1))
+        page.draw_rect(pymupdf.Rect(0, 0, 80, 60), fill=(0, 0.6, 0))
+        page.insert_text((110, 380), f"Figure {number + 1}. Planaria", fontsize=12)
+    doc.save(path)
+    doc.close()
+
+
+def reference_crop(pdf_path, coords, dpi, padding):
+    """The original render-the-whole-page-then-crop-in-pixels approach."""
+    scale = dpi / 72.0
+    with pymupdf.open(pdf_path) as doc:
+        pix = doc.load_page(coords.page - 1).get_pixmap(
+            matrix=pymupdf.Matrix(scale, scale), alpha=False
+        )
+    page_image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    x1 = max(0, int(coords.x * scale) - padding)
+    y1 = max(0, int(coords.y * scale) - padding)
+    x2 = min(page_image.width, int((coords.x + coords.width) * scale) + padding)
+    y2 = min(page_image.height, int((coords.y + coords.height) * scale) + padding)
+    return page_image.crop((x1, y1, x2, y2))
+
+
+class ClipParityTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp = Path(self.tmp_dir.name)
+        self.pdf_path = self.tmp / "paper.pdf"
+        make_pdf(self.pdf_path)
+
+    def _extract(self, coords, dpi, padding):
+        output_path = self.tmp / f"fig_{dpi}_{padding}.png"
+        with pymupdf.open(self.pdf_path) as doc:
+            self.assertTrue(extract_figure_image(doc, coords, output_path, dpi, padding))
+        with Image.open(output_path) as image:
+            return image.convert("RGB")
+
+    def test_matches_full_page_crop(self):
+        cases = [
+            (FigureCoords(1, 100.0, 200.0, 200.0, 150.0), 150, 10),
+            (FigureCoords(2, 95.5, 190.25, 220.0, 200.0), 300, 25),
+            (FigureCoords(1, 100.0, 200.0, 200.0, 150.0), 72, 0),
+            # Padding runs off the top-left corner and gets clamped
+            (FigureCoords(1, 2.0, 3.0, 70.0, 50.0), 150, 20),
+        ]
+        for coords, dpi, padding in cases:
+            with self.subTest(coords=coords, dpi=dpi, padding=padding):
+                image = self._extract(coords, dpi, padding)
+                reference = reference_crop(self.pdf_path, coords, dpi, padding)
+                # Pixel rounding may differ by one row/column at the edges
+                self.assertLessEqual(abs(image.width - reference.width), 1)
+                self.assertLessEqual(abs(image.height - reference.height), 1)
+                size = (min(image.width, reference.width), min(image.height, reference.height))
+                diff = ImageChops.difference(
+                    image.crop((0, 0, *size)), reference.crop((0, 0, *size))
+                )
+                self.assertLess(max(ImageStat.Stat(diff).mean), 8.0)
+
+    def test_region_off_the_page_is_rejected(self):
+        coords = FigureCoords(1, 700.0, 900.0, 50.0, 50.0)
+        with pymupdf.open(self.pdf_path) as doc, self.assertLogs("figure_extractor", "WARNING"):
+            self.assertFalse(extract_figure_image(doc, coords, self.tmp / "off.png"))
+
+
+class PaperTestCase(unittest.TestCase):
+    """Papers with GROBID JSON and a PDF under a temporary ROOT_DIR."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp = Path(self.tmp_dir.name)
+        patch = mock.patch.object(extract_figures, "ROOT_DIR", self.tmp)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.output_dir = self.tmp / "figures"
+
+    def _write_paper(self, paper_id, figure_coords):
+        pdf_path = self.tmp / f"{paper_id}.pdf"
+        make_pdf(pdf_path)
+        figures = "".join(
+            FIGURE_TEMPLATE.format(figure_id=f"fig_{i}", coords=coords)
+            for i, coords in enumerate(figure_coords)
+        )
+        grobid_path = self.tmp / "grobid" / f"{paper_id}.json"
+        grobid_path.parent.mkdir(exist_ok=True)
+        grobid_path.write_text(json.dumps({
+            "paper_id": paper_id,
+            "pdf_path": str(pdf_path),
+            "raw_tei": TEI_TEMPLATE.format(figures=figures),
+        }))
+        return grobid_path
+
+
+class ProcessPaperTests(PaperTestCase):
+    def test_opens_the_pdf_once_per_paper(self):
+        grobid_path = self._write_paper(
+            "paper_a", ["1,100,200,200,150", "2,100,200,200,150", "1,0,0,80,60"]
+        )
+        with mock.patch.object(extract_figures.pymupdf, "open", wraps=pymupdf.open) as opened:
+            figures = process_paper(grobid_path, self.output_dir, 72, 0, force=False)
+        self.assertEqual(opened.call_count, 1)
+        self.assertEqual(
+            [f.image_path for f in figures],
+            [f"figures/paper_a/fig_{i}.png" for i in range(3)],
+        )
+
+        # Every image is on disk now, so a second run never parses the PDF
+        with mock.patch.object(extract_figures.pymupdf, "open", wraps=pymupdf.open) as opened:
+            process_paper(grobid_path, self.output_dir, 72, 0, force=False)
+        self.assertEqual(opened.call_count, 0)
+
+
+class MainTests(PaperTestCase):
+    def setUp(self):
+        super().setUp()
+        self.metadata_path = self.tmp / "figures_metadata.json"
+        for name, value in (
+            ("GROBID_DIR", self.tmp / "grobid"),
+            ("FIGURE_OUTPUT_DIR", self.output_dir),
+            ("METADATA_PATH", self.metadata_path),
+        ):
+            patch = mock.patch.object(extract_figures, name, value)
+            patch.start()
+            self.addCleanup(patch.stop)
+        # Written in reverse so directory order differs from sorted order
+        for paper_id, figure_count in (("paper_c", 1), ("paper_b", 3), ("paper_a", 2)):
+            self._write_paper(paper_id, ["1,100,200,200,150"] * figure_count)
+
+    def _run(self, workers):
+        argv = ["extract_figures.py", "--dpi", "72", "--force", "--workers", str(workers)]
+        with mock.patch.object(sys, "argv", argv):
+            extract_figures.main()
+        metadata = json.loads(self.metadata_path.read_text())
+        del metadata["generated_at"]
+        return metadata
+
+    def test_pool_merges_papers_in_input_order(self):
+        metadata = self._run(workers=3)
+        self.assertEqual(list(metadata["figures_by_paper"]), ["paper_a", "paper_b", "paper_c"])
+        self.assertEqual(metadata["total_figures"], 6)
+        self.assertEqual(metadata["figures_with_images"], 6)
+        self.assertEqual(metadata, self._run(workers=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import asyncio
+import sys
+import tempfile
+import time
+import unittest
+import zlib
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.lib.response_cache import ResponseCache, make_cache_key
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache = ResponseCache(Path(self.tmp_dir.name) / "cache.db", ttl_seconds=60)
+        self.addCleanup(self.cache.close)
+
+    def _insert_raw(self, key, blob):
+        conn = self.cache._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, blob, time.time() + 60),
+        )
+        conn.commit()
+
+    def test_round_trip(self):
+        self.cache.set("k", {"claims": ["a"], "count": 1})
+        self.assertEqual(self.cache.get("k"), {"claims": ["a"], "count": 1})
+        self.assertEqual(self.cache.get("missing", "default"), "default")
+
+    def test_entries_expire_after_ttl(self):
+        now = time.time()
+        with mock.patch("scripts.lib.response_cache.time.time", return_value=now):
+            self.cache.set("default_ttl", 1)
+            self.cache.set("short_ttl", 2, ttl_seconds=5)
+        with mock.patch("scripts.lib.response_cache.time.time", return_value=now + 10):
+            self.assertIsNone(self.cache.get("short_ttl"))
+            self.assertEqual(self.cache.get("default_ttl"), 1)
+            self.assertEqual(self.cache.purge_expired(), 1)
+        with mock.patch("scripts.lib.response_cache.time.time", return_value=now + 61):
+            self.assertIsNone(self.cache.get("default_ttl"))
+
+    def test_corrupt_rows_read_as_missing(self):
+        self._insert_raw("not_zlib", b"plain bytes")
+        self._insert_raw("not_json", zlib.compress(b"{truncated"))
+        self.assertIsNone(self.cache.get("not_zlib"))
+        self.assertEqual(self.cache.get("not_json", "default"), "default")
+
+    def test_many_variants_keep_order(self):
+        self.cache.set_many([("a", 1), ("b", [2])])
+        self._insert_raw("bad", b"plain bytes")
+        self.assertEqual(self.cache.get_many(["b", "missing", "bad", "a"]), [[2], None, None, 1])
+
+    def test_async_variants(self):
+        async def run():
+            await self.cache.aset("a", {"x": 1})
+            await self.cache.aset_many([("b", 2), ("c", 3)])
+            return await self.cache.aget("a"), await self.cache.aget_many(["c", "b"])
+
+        self.assertEqual(asyncio.run(run()), ({"x": 1}, [3, 2]))
+
+    def test_make_cache_key_is_order_insensitive_for_dicts(self):
+        self.assertEqual(
+            make_cache_key("gemini", {"a": 1, "b": 2}),
+            make_cache_key("gemini", {"b": 2, "a": 1}),
+        )
+        self.assertNotEqual(make_cache_key("gemini", 1), make_cache_key("gemini", 2))
+
+
+if __name__ == "__main__":
+    unittest.main()